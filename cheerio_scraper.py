@@ -1,18 +1,12 @@
 # cheerio_scraper.py
-import requests
-import traceback
+from scraper_client import scrape
+from scan_logging import get_scan_logger
 
-PUPPETEER_RENDER_URL = "https://controll-puppeteer.onrender.com/scrape"
+logger = get_scan_logger(__name__)
 
 def run_cheerio_scrape(target_url):
-    try:
-        response = requests.post(PUPPETEER_RENDER_URL, json={"url": target_url}, timeout=20)
-        if response.status_code == 200:
-            return response.text
-        else:
-            print(f"🛑 Puppeteer scrape failed: {response.status_code}")
-            return ""
-    except Exception as e:
-        print(f"❌ Exception in run_cheerio_scrape: {e}")
-        print(traceback.format_exc())
-        return ""
+    """Raw Puppeteer render of a page ('' on failure); see scraper_client for the backends"""
+    page = scrape(target_url, backend="puppeteer", timeout=20, extract_text=False)
+    if not page.ok:
+        logger.warning(f"🛑 Puppeteer scrape failed: {page.error}")
+    return page.text
@@ -0,0 +1,89 @@
+import re
+from typing import Callable, List, NamedTuple, Optional
+
+# One compiled pattern finds every URL, email, phone and @mention in a single left-to-right
+# pass, so a scraped page is read once however many kinds of contact info are wanted.
+# Emails and phones share one token-start check, so inside a word the engine rejects both
+# with a single test; this also keeps the scan linear on long runs such as base64 images.
+_CONTACT_PATTERN = re.compile(
+    r"(?P<url>https?://[^\s<>\"']+[^\s<>\"'.,;:!?)\]])"
+    r"|(?<![A-Za-z0-9._%+-])(?:"
+    r"(?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})"
+    r"|(?P<phone>(?:\+?1[-.\s]?)?\(?[2-9]\d{2}\)?[-.\s]?[2-9]\d{2}[-.\s]?\d{4}(?!\d)))"
+    r"|(?P<mention>@(?<![\w.@]@)[A-Za-z0-9_]{2,})"
+)
+_NON_DIGITS = re.compile(r"\D")
+
+# Things that look like an email but are asset filenames (logo@2x.png) or documentation samples
+ASSET_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "svg", "webp", "ico", "css", "js"}
+PLACEHOLDER_EMAIL_DOMAINS = {"example.com", "example.org", "example.net", "domain.com", "email.com"}
+
+
+class ContactMatch(NamedTuple):
+    kind: str  # 'email', 'phone', 'url' or 'mention'
+    value: str  # normalized: lower-case email, 10-digit phone, URL and @mention as written
+    start: int
+    end: int
+
+
+class Contacts(NamedTuple):
+    emails: List[str]  # unique, in first-seen order
+    phones: List[str]
+    urls: List[str]
+    mentions: List[str]
+    matches: List[ContactMatch]  # every accepted match with its span, in text order
+
+
+def normalize_phone(text):
+    """The 10-digit form of a US phone number, or None"""
+    digits = _NON_DIGITS.sub("", text or "")
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+
+def _normalize(kind, raw):
+    if kind == "email":
+        email = raw.lower().strip(".")
+        domain = email.rsplit("@", 1)[1]
+        if domain.rsplit(".", 1)[-1] in ASSET_EXTENSIONS or domain in PLACEHOLDER_EMAIL_DOMAINS:
+            return None
+        return email
+    if kind == "phone":
+        phone = normalize_phone(raw)
+        # A number of one repeated digit is a placeholder, not a contact
+        return phone if phone and len(set(phone)) > 1 else None
+    return raw
+
+
+def extract_contacts(text, junk: Optional[Callable[..., bool]] = None, kinds=None):
+    """
+    Find emails, phones, URLs and @mentions in text or HTML in one pass. junk, if given,
+    is called as junk(email=...) or junk(phone=...) and drops the values it returns True
+    for. kinds limits the result to some of 'email', 'phone', 'url' and 'mention'.
+    """
+    found = {"email": {}, "phone": {}, "url": {}, "mention": {}}
+    rejected = set()
+    matches = []
+    for match in _CONTACT_PATTERN.finditer(text or ""):
+        kind = match.lastgroup
+        if kinds is not None and kind not in kinds:
+            continue
+        value = _normalize(kind, match.group())
+        if value is None or (kind, value) in rejected:
+            continue
+        if value not in found[kind]:
+            # Each distinct value is judged once, however often the page repeats it
+            if junk is not None and kind in ("email", "phone") and junk(**{kind: value}):
+                rejected.add((kind, value))
+                continue
+            found[kind][value] = None
+        matches.append(ContactMatch(kind, value, match.start(), match.end()))
+
+    return Contacts(
+        emails=list(found["email"]),
+        phones=list(found["phone"]),
+        urls=list(found["url"]),
+        mentions=list(found["mention"]),
+        matches=matches
+    )
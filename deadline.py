@@ -0,0 +1,62 @@
+import random
+import time
+import contextvars
+from contextlib import contextmanager
+
+# Time budgets for scans. A scan opens a deadline with scan_deadline(); every SERPER
+# call made underneath it (directly, through the query broker or asyncio.to_thread)
+# sizes its timeouts and retries from whatever time the scan has left.
+_current = contextvars.ContextVar("controll_deadline", default=None)
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def cap(self, seconds):
+        """The smaller of `seconds` and the time left"""
+        return min(seconds, self.remaining())
+
+
+def current_deadline():
+    """The deadline of the scan running in this context, or None outside a scan"""
+    return _current.get()
+
+
+@contextmanager
+def scan_deadline(seconds):
+    """
+    Run the enclosed block under a deadline. A nested deadline never extends
+    an outer one: the earlier expiry wins.
+    """
+    deadline = Deadline(seconds)
+    outer = _current.get()
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def time_left(seconds):
+    """`seconds`, or less if the current scan's deadline is closer"""
+    deadline = _current.get()
+    return seconds if deadline is None else deadline.cap(seconds)
+
+
+class DeadlineExceeded(Exception):
+    """Raised by work that was not started because the scan ran out of time"""
+
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
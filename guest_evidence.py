@@ -0,0 +1,133 @@
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from guest_storage import load_guest_db, update_guest_db
+
+# Timestamped evidence for guests we have scanned before, kept in their guest_db.json entry.
+# An incremental re-scan answers every query checked within the freshness window from the
+# stored results, so only stale evidence costs SERPER quota, and reports what changed.
+GUEST_EVIDENCE_FRESHNESS = float(os.environ.get("GUEST_EVIDENCE_FRESHNESS", 7 * 24 * 3600))  # seconds
+GUEST_EVIDENCE_MAX_AGE = float(os.environ.get("GUEST_EVIDENCE_MAX_AGE", 90 * 24 * 3600))  # older entries are dropped
+EVIDENCE_KINDS = ("profiles", "emails", "phones", "writing_snippets")
+
+_current = contextvars.ContextVar("controll_prior_evidence", default=None)
+
+
+def guest_id(name):
+    """guest_db.json key for a guest, as guest_storage uses"""
+    return (name or "").strip().replace(" ", "_").lower()
+
+
+def load_guest_evidence(name):
+    """The evidence stored for a guest by earlier scans ({} for a new guest)"""
+    entry = load_guest_db().get(guest_id(name)) or {}
+    return entry.get("evidence") or {}
+
+
+def save_guest_evidence(name, evidence, summary=None):
+    """Store a guest's evidence (and optionally rating fields) in guest_db.json"""
+    key = guest_id(name)
+    with update_guest_db() as guest_db:
+        entry = guest_db.setdefault(key, {"full_name": name})
+        entry.update(summary or {})
+        entry["evidence"] = evidence
+        entry["last_updated"] = time.strftime("%Y-%m-%d")
+
+
+class IncrementalEvidence:
+    """Query results of one incremental scan: reused while fresh, refreshed when stale"""
+
+    def __init__(self, prior, freshness):
+        self.prior = prior
+        self.freshness = freshness
+        self.queries = dict(prior.get("queries") or {})
+        self.reused = 0
+        self.refreshed = 0
+        self._lock = threading.Lock()
+
+    def fresh_rows(self, key):
+        """Stored result rows for a query checked within the freshness window, else None"""
+        entry = self.queries.get(key)
+        if entry is None or time.time() - entry["checked_at"] > self.freshness:
+            return None
+        with self._lock:
+            self.reused += 1
+        return entry["rows"]
+
+    def observe(self, key, query, rows):
+        with self._lock:
+            self.refreshed += 1
+            self.queries[key] = {"query": query, "checked_at": time.time(), "rows": rows}
+
+    def all_rows(self):
+        return [row for entry in self.queries.values() for row in entry["rows"]]
+
+    def snapshot(self, found, rating):
+        """
+        The evidence document to store after the scan: query results plus each found item
+        with first_seen/last_seen. `found` maps each of EVIDENCE_KINDS to the items seen now.
+        """
+        now = time.time()
+        evidence = {
+            "queries": {k: e for k, e in self.queries.items() if now - e["checked_at"] <= GUEST_EVIDENCE_MAX_AGE},
+            "rating": dict(rating, rated_at=now)
+        }
+        for kind in EVIDENCE_KINDS:
+            previous = self.prior.get(kind) or {}
+            evidence[kind] = {
+                item: {"first_seen": previous.get(item, {}).get("first_seen", now), "last_seen": now}
+                for item in dict.fromkeys(found.get(kind) or [])
+                if item
+            }
+        return evidence
+
+
+def current_evidence():
+    """The incremental evidence of the scan running in this context, or None"""
+    return _current.get()
+
+
+@contextmanager
+def incremental_evidence(prior, freshness=None):
+    evidence = IncrementalEvidence(prior, GUEST_EVIDENCE_FRESHNESS if freshness is None else freshness)
+    token = _current.set(evidence)
+    try:
+        yield evidence
+    finally:
+        _current.reset(token)
+
+
+def recall_evidence(key, decode):
+    """Inside an incremental scan, the stored results of a query checked recently enough, else None"""
+    evidence = _current.get()
+    if evidence is None:
+        return None
+    rows = evidence.fresh_rows(key)
+    return None if rows is None else decode(rows)
+
+
+def keep_evidence(key, query, value, encode):
+    """Keep a query's results for the next re-scan, inside an incremental scan"""
+    evidence = _current.get()
+    if evidence is not None:
+        evidence.observe(key, query, encode(value))
+
+
+def diff_evidence(prior, current):
+    """What was added and what disappeared per evidence kind, and how the rating moved"""
+    diff = {}
+    for kind in EVIDENCE_KINDS:
+        before, after = set(prior.get(kind) or {}), set(current.get(kind) or {})
+        diff[kind] = {"added": sorted(after - before), "removed": sorted(before - after)}
+
+    old_rating, new_rating = prior.get("rating") or {}, current.get("rating") or {}
+    diff["rating"] = {
+        field: {"before": old_rating.get(field), "after": new_rating.get(field)}
+        for field in ("star_rating", "risk_score")
+        if old_rating.get(field) != new_rating.get(field)
+    }
+    diff["changed"] = bool(diff["rating"]) or any(diff[k]["added"] or diff[k]["removed"] for k in EVIDENCE_KINDS)
+    diff["previous_scan_at"] = old_rating.get("rated_at")
+    return diff
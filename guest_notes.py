@@ -1,6 +1,9 @@
 import json
 import os
 from datetime import datetime
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
 
 SHARED_FILE = "shared_contributions.json"
 
@@ -49,7 +52,7 @@ def add_global_identity(identity_data):
     with open("shared_contributions.json", "w") as f:
         json.dump(shared_data, f, indent=2)
 
-    print(f"🌐 Global identity logged: {identity_data.get('full_name')} (Risk: {identity_data.get('risk_score')})")
+    logger.info(f"🌐 Global identity logged: {identity_data.get('full_name')} (Risk: {identity_data.get('risk_score')})")
 
 # DO NOT DELETE — Global Alert Lookup
 def check_global_alert_db(name, email=None, phone=None):
@@ -101,7 +104,7 @@ def check_global_alert(name, email=None, phone=None):
         return None
 
     except Exception as e:
-        print(f"Error checking global alerts: {e}")
+        logger.error(f"Error checking global alerts: {e}")
         return None
 
 def update_global_contributions(guest_data):
@@ -180,17 +183,17 @@ def update_global_contributions(guest_data):
             
             # Update the entry
             shared_data["global_identities"][existing_entry] = new_entry
-            print(f"🔄 Updated global identity: {guest_name} (Risk: {new_entry['risk_score']})")
+            logger.info(f"🔄 Updated global identity: {guest_name} (Risk: {new_entry['risk_score']})")
         else:
             # Add new entry
             shared_data["global_identities"].append(new_entry)
-            print(f"🌐 Added new global identity: {guest_name} (Risk: {new_entry['risk_score']})")
+            logger.info(f"🌐 Added new global identity: {guest_name} (Risk: {new_entry['risk_score']})")
 
         # Save updated data
         with open("shared_contributions.json", "w") as f:
             json.dump(shared_data, f, indent=2)
 
-        print(f"✅ Global contributions updated successfully")
+        logger.info(f"✅ Global contributions updated successfully")
 
     except Exception as e:
-        print(f"⚠️ Error updating global contributions: {e}")
+        logger.warning(f"⚠️ Error updating global contributions: {e}")
@@ -1,6 +1,9 @@
 
 import json
 import os
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
 
 def add_to_guest_queue(guest):
     queue_path = "guest_queue.json"
@@ -19,6 +22,6 @@ def add_to_guest_queue(guest):
         with open(queue_path, "w") as f:
             json.dump(queue, f, indent=2)
 
-        print(f"📥 Guest added to queue: {guest['name']}")
+        logger.info(f"📥 Guest added to queue: {guest['name']}")
     else:
-        print(f"⚠️ Guest already in queue: {guest['name']}")
+        logger.warning(f"⚠️ Guest already in queue: {guest['name']}")
@@ -1,11 +1,66 @@
 
 import json
 import os
+import fcntl
+import tempfile
+import threading
+from contextlib import contextmanager
 from shared_guest_alerts import check_shared_guest_alert
+from scan_logging import get_scan_logger
 
-def save_guest_from_review(handle, result):
-    guest_db_path = "guest_db.json"
+logger = get_scan_logger(__name__)
+
+# Every read-modify-write of guest_db.json goes through update_guest_db(). Scans in the
+# web and worker processes both write it, so the thread lock is paired with an flock on a
+# sidecar file: no writer loses another's entries, and os.replace means no torn reads.
+GUEST_DB_PATH = "guest_db.json"
+_db_lock = threading.Lock()
+
+
+@contextmanager
+def _locked():
+    with _db_lock, open(f"{GUEST_DB_PATH}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
+
+def _read_guest_db():
+    try:
+        with open(GUEST_DB_PATH, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_guest_db():
+    """The current guest database ({} if there is none yet)"""
+    with _locked():
+        return _read_guest_db()
+
+
+@contextmanager
+def update_guest_db():
+    """
+    Yield the guest database for editing under the cross-process lock; it is written back
+    atomically (temp file, then os.replace) when the block exits cleanly.
+    """
+    with _locked():
+        guest_db = _read_guest_db()
+        yield guest_db
+        fd, tmp_path = tempfile.mkstemp(prefix=".guest_db.", dir=os.path.dirname(os.path.abspath(GUEST_DB_PATH)))
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(guest_db, f, indent=2)
+            os.replace(tmp_path, GUEST_DB_PATH)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def save_guest_from_review(handle, result):
     try:
         # Use handle if provided, fallback to result handle or Unknown Guest
         name = handle or result.get("handle", "Unknown Guest")
@@ -20,34 +75,22 @@ def save_guest_from_review(handle, result):
             "last_updated": "2024-01-20"
         }
 
-        # Load existing guest DB
-        guest_db = {}
-        if os.path.exists(guest_db_path):
-            with open(guest_db_path, "r") as f:
-                try:
-                    guest_db = json.load(f)
-                except json.JSONDecodeError:
-                    guest_db = {}
-
         # Check for global network alerts before saving
         email = result.get('email')
         phone = result.get('phone')
         if email or phone:
             shared_alert = check_shared_guest_alert(email, phone)
             if shared_alert:
-                print(f"🚨 GLOBAL ALERT: Guest {name} is flagged in ConTROLL network!")
+                logger.warning(f"🚨 GLOBAL ALERT: Guest {name} is flagged in ConTROLL network!")
                 guest_entry['global_alert'] = True
                 guest_entry['shared_details'] = shared_alert
 
         # Use name as key
         guest_id = name.replace(" ", "_").lower()
-        guest_db[guest_id] = guest_entry
-
-        # Save updated DB
-        with open(guest_db_path, "w") as f:
-            json.dump(guest_db, f, indent=2)
+        with update_guest_db() as guest_db:
+            guest_db[guest_id] = guest_entry
 
-        print(f"✅ Guest auto-saved: {name}")
+        logger.info(f"✅ Guest auto-saved: {name}")
 
     except Exception as e:
-        print(f"Error saving guest data: {str(e)}")
+        logger.error(f"Error saving guest data: {str(e)}")
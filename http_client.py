@@ -0,0 +1,180 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import rate_limiter
+import traffic_replay
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Shared outbound transport for SERPER, the Render scrapers and direct page fetches.
+# One keep-alive session per worker process, with a connection pool per host.
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 10))  # hosts kept pooled
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 16))  # connections kept per host
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 30))
+HTTP_RATE_LIMIT_RETRIES = int(os.environ.get("HTTP_RATE_LIMIT_RETRIES", 2))  # retries after a 429
+HTTP_LATENCY_WINDOW = 200  # recent response times kept per upstream
+HTTP_LATENCY_MIN_SAMPLES = 20  # below this a percentile is not trusted
+HTTP_HEDGE_WORKERS = int(os.environ.get("HTTP_HEDGE_WORKERS", 8))
+
+# Failures worth retrying: network errors, timeouts, and giving up on a saturated upstream
+TRANSIENT_ERRORS = (requests.RequestException, rate_limiter.RateLimitTimeout)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+_latencies = {}
+_latency_lock = threading.Lock()
+
+_hedge_pool = None
+_hedge_pool_pid = None
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Calls are stateless; a shared cookie jar would leak state between threads and scans
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide pooled session.
+    A forked gunicorn worker gets its own session instead of sharing the parent's sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def close_session():
+    """Close pooled connections (used on shutdown and in scripts)"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def _send(method, url, timeout, **kwargs):
+    """One wire call, or its recorded stand-in when CONTROLL_TRAFFIC_MODE is set"""
+    if traffic_replay.TRAFFIC_MODE == "replay":
+        return traffic_replay.replay(method, url, **kwargs)
+    response = get_session().request(method, url, timeout=timeout, **kwargs)
+    if traffic_replay.TRAFFIC_MODE == "record":
+        if kwargs.get("stream"):
+            # Reading the content here would skip the scraper's size cap; record what it reads
+            return traffic_replay.record_streamed(method, url, response, **kwargs)
+        traffic_replay.record(method, url, response, **kwargs)
+    return response
+
+
+def request(method, url, timeout=None, upstream=None, max_wait=None, **kwargs):
+    """
+    Send a request over the shared pool, applying the default timeouts if none given.
+    With an upstream name the call is paced by that upstream's shared token bucket:
+    it waits for capacity, and a 429 is retried once the limiter allows it.
+    """
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    if upstream is None:
+        return _send(method, url, timeout, **kwargs)
+
+    for attempt in range(HTTP_RATE_LIMIT_RETRIES + 1):
+        if not rate_limiter.acquire(upstream, max_wait=max_wait):
+            raise rate_limiter.RateLimitTimeout(f"{upstream} is saturated; gave up waiting for capacity")
+
+        started = time.monotonic()
+        response = _send(method, url, timeout, **kwargs)
+        if response.status_code < 500:
+            _observe_latency(upstream, time.monotonic() - started)
+        retry_after = rate_limiter.parse_retry_after(response.headers.get("Retry-After"))
+        rate_limiter.report(upstream, response.status_code, retry_after)
+
+        retryable = response.status_code == 429 or (response.status_code == 503 and retry_after is not None)
+        if not retryable or attempt == HTTP_RATE_LIMIT_RETRIES:
+            return response
+        logger.info(f"🔁 {upstream} asked us to back off ({response.status_code}); retrying when capacity returns")
+        response.close()
+
+
+def _observe_latency(upstream, seconds):
+    with _latency_lock:
+        _latencies.setdefault(upstream, deque(maxlen=HTTP_LATENCY_WINDOW)).append(seconds)
+
+
+def latency_percentile(upstream, percentile=0.95):
+    """Recent response-time percentile for an upstream, or None until enough calls were seen"""
+    with _latency_lock:
+        samples = sorted(_latencies.get(upstream, ()))
+    if len(samples) < HTTP_LATENCY_MIN_SAMPLES:
+        return None
+    return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+
+def _get_hedge_pool():
+    global _hedge_pool, _hedge_pool_pid
+    if _hedge_pool is None or _hedge_pool_pid != os.getpid():
+        with _session_lock:
+            if _hedge_pool is None or _hedge_pool_pid != os.getpid():
+                _hedge_pool = ThreadPoolExecutor(max_workers=HTTP_HEDGE_WORKERS, thread_name_prefix="http-hedge")
+                _hedge_pool_pid = os.getpid()
+    return _hedge_pool
+
+
+def hedged_request(method, url, hedge_after, deadline=None, **kwargs):
+    """
+    Send a request and, if it has not answered within hedge_after seconds, send a
+    duplicate; whichever answers first wins. If one attempt fails the other is awaited.
+    The losing attempt is left to finish in the background.
+    """
+    pool = _get_hedge_pool()
+    first = pool.submit(request, method, url, **kwargs)
+    done, _ = wait([first], timeout=hedge_after)
+    if done:
+        return first.result()
+    if deadline is not None and deadline.expired():
+        raise requests.Timeout(f"Deadline passed waiting for {url}")
+
+    logger.info(f"🏁 No answer from {kwargs.get('upstream') or url} after {hedge_after:.2f}s, sending a hedge request")
+    pending = {first, pool.submit(request, method, url, **kwargs)}
+    error = None
+    while pending:
+        done, pending = wait(pending, timeout=deadline.remaining() if deadline else None, return_when=FIRST_COMPLETED)
+        if not done:
+            raise requests.Timeout(f"Deadline passed waiting for {url}")
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
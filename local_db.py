@@ -0,0 +1,32 @@
+import os
+import sqlite3
+import threading
+
+# Small SQLite files shared by every gunicorn worker on the box (caches, limiters, stats).
+# WAL mode lets readers and one writer work at the same time across processes.
+CONTROLL_DB_DIR = os.environ.get("CONTROLL_DB_DIR", ".")
+SQLITE_BUSY_TIMEOUT = float(os.environ.get("SQLITE_BUSY_TIMEOUT", 10))
+
+_local = threading.local()
+
+
+def get_connection(filename):
+    """
+    Return this thread's connection to a shared SQLite file, opening it on first use.
+    Connections run in autocommit mode; use BEGIN IMMEDIATE for multi-statement updates.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None or getattr(_local, "pid", None) != os.getpid():
+        connections = {}
+        _local.connections = connections
+        _local.pid = os.getpid()
+
+    path = os.path.join(CONTROLL_DB_DIR, filename)
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[path] = conn
+    return conn
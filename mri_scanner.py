@@ -1,15 +1,37 @@
 import os
-import requests
 import json
+import queue
+import asyncio
+import contextvars
+import concurrent.futures
+import threading
 from typing import Dict, List, Any
-from search_utils import query_serper, run_verbose_serper_scan, analyze_serper_results
+from search_utils import (
+    run_verbose_serper_scan, analyze_serper_results,
+    generate_query_variants, merge_variant_response, filter_junk_identity
+)
+from contact_extractor import extract_contacts
+from scraper_client import scrape, scrape_timeout
+from query_broker import PRIORITY_HIGH, submit_query
+from deadline import Deadline, DeadlineExceeded, current_deadline, scan_deadline
+from scan_checkpoints import scan_checkpoint, scan_id_for, checkpointed
+from scrape_pipeline import ScrapePipeline
+from scrape_ranking import scrape_scorer, content_fingerprint, record_scrape_yield
+from url_utils import ClueSet, classify_url, canonicalize_url
+from single_flight import SingleFlight
+from query_scheduler import SharedQueryBudget
+from query_yield import rank_queries, record_query_yield
+from serper_cache import known_empty_queries
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
 
 # Load secrets from secrets.json
 try:
     with open("secrets.json") as f:
         secrets = json.load(f)
 except FileNotFoundError:
-    print("⚠️ secrets.json not found, falling back to environment variables")
+    logger.warning("⚠️ secrets.json not found, falling back to environment variables")
     secrets = {
         "SERPER_API_KEY": os.environ.get('SERPER_API_KEY', '1d67ed1df4aee6acf1491b1bbcbdf82b545473cf'),
         "PUPPETEER_ENDPOINT": "https://controll-puppeteer.onrender.com/scrape",
@@ -53,91 +75,314 @@ def expand_alias_variants(alias: str) -> List[str]:
         f"{alias} reviewer"
     ])
 
-    print(f"🔧 Expanded '{alias}' into {len(variants)} variants")
+    logger.debug("🔧 Expanded '%s' into %s variants", alias, len(variants))
     return list(set(variants))  # Remove duplicates
 
+SOCIAL_DOMAINS = {"facebook.com", "twitter.com", "x.com", "instagram.com", "linkedin.com", "youtube.com"}
+
 def scrape_contact_info(url: str) -> Dict[str, List[str]]:
     """
-    Scrape a URL for contact information using Puppeteer endpoint
+    Scrape a URL for contact information using Puppeteer endpoint.
+    Inside a scan the request is cut to the time the scan has left.
     """
+    if scrape_timeout("puppeteer") < MRI_MIN_SCRAPE_TIME:
+        raise DeadlineExceeded(f"No time left to scrape {url}")
     try:
-        puppeteer_endpoint = secrets.get("PUPPETEER_ENDPOINT", "https://controll-puppeteer.onrender.com/scrape")
-
-        response = requests.post(puppeteer_endpoint, json={
-            "url": url,
-            "waitFor": 2000,
-            "extractText": True
-        }, timeout=10)
-
-        if response.status_code != 200:
+        page = scrape(url, backend="puppeteer")
+        if not page.ok:
             return {"emails": [], "phones": [], "profiles": [], "social_links": []}
 
-        data = response.json()
-        content = data.get("content", "")
-
-        # Extract contact information from scraped content
-        import re
-
-        discovered = {
-            "emails": [],
-            "phones": [],
+        # Extract contact information from scraped content in one pass
+        contacts = extract_contacts(page.text, junk=filter_junk_identity)
+        social_links = [link for link in contacts.urls if classify_url(link).domain in SOCIAL_DOMAINS]
+        return {
+            "emails": contacts.emails,
+            "phones": contacts.phones,
             "profiles": [],
-            "social_links": []
+            "social_links": social_links + contacts.mentions
         }
 
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, content, re.IGNORECASE)
-        discovered["emails"] = list(set([email.lower() for email in emails]))
+    except Exception as e:
+        logger.error(f"    ❌ Scraping failed for {url}: {str(e)}")
+        return {"emails": [], "phones": [], "profiles": [], "social_links": []}
 
-        # Phone extraction
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',
-            r'\b\d{10}\b'
-        ]
+MRI_MAX_SCRAPES = 8  # Limit to prevent timeout
+MRI_SERPER_CONCURRENCY = int(os.environ.get("MRI_SERPER_CONCURRENCY", 8))
+MRI_SCRAPE_CONCURRENCY = int(os.environ.get("MRI_SCRAPE_CONCURRENCY", 4))
+MRI_SCAN_DEADLINE = float(os.environ.get("MRI_SCAN_DEADLINE", 25))  # seconds; below gunicorn's 30s worker timeout
+MRI_QUERY_BUDGET = int(os.environ.get("MRI_QUERY_BUDGET", 16))  # platform queries per scan, best yield first
+MRI_FINALIZE_RESERVE = float(os.environ.get("MRI_FINALIZE_RESERVE", 1.0))  # seconds kept back to assemble a partial result
+MRI_MIN_SCRAPE_TIME = 2.0  # a scrape needs at least this long to be worth starting
+MRI_BATCH_DEADLINE = float(os.environ.get("MRI_BATCH_DEADLINE", 60))  # seconds for a whole batch
+# A batch pays for a smaller share per handle plus a pool the handles split, so a large
+# batch costs well below one full scan per handle; the lowest-yield queries are dropped
+MRI_BATCH_HANDLE_QUERIES = int(os.environ.get("MRI_BATCH_HANDLE_QUERIES", 8))  # queries each handle is sure of
+MRI_BATCH_SHARED_QUERIES = int(os.environ.get("MRI_BATCH_SHARED_QUERIES", 64))  # pool on top of the shares
+MRI_BATCH_MAX_HANDLES = int(os.environ.get("MRI_BATCH_MAX_HANDLES", 40))
+MRI_BUDGET_SKIPPED = "search (budget)"  # skipped phase of a handle the batch budget starved
+MRI_BATCH_SCRAPE_CONCURRENCY = int(os.environ.get("MRI_BATCH_SCRAPE_CONCURRENCY", 8))
+
+
+def batch_query_budget(handles):
+    """SERPER queries a batch of this many handles may pay for, never more than separate scans would"""
+    return min(handles * MRI_QUERY_BUDGET, handles * MRI_BATCH_HANDLE_QUERIES + MRI_BATCH_SHARED_QUERIES)
+
+def _generate_mri_queries(alias, location, query_budget=None):
+    """
+    The scan's queries, best yield first, and whether a shared batch budget starved it:
+    admitted fewer than the MRI_BATCH_HANDLE_QUERIES every handle is due.
+    """
+    logger.debug("📥 Importing search_utils functions...")
+    from search_utils import generate_platform_queries
+    logger.debug("✅ Successfully imported search_utils functions")
+
+    logger.debug("🔧 Generating platform queries for alias='%s', location='%s'", alias, location)
+    queries = generate_platform_queries(alias, location, [])
+    logger.debug("🧠 Generated %s queries", len(queries))
+
+    # Skip queries SERPER recently answered with nothing, then spend the scan's
+    # budget on the sites that have historically returned results
+    known_empty = known_empty_queries(queries)
+    if known_empty:
+        logger.info(f"🕳️ Skipping {len(known_empty)} queries known to return nothing")
+    queries = rank_queries([q for q in queries if q not in known_empty])[:MRI_QUERY_BUDGET]
+    starved = False
+    if query_budget is not None:
+        # Scans run as a batch share one budget; queries another scan already paid for are free
+        admitted = query_budget.admit(queries)
+        refused = len(queries) - len(admitted)
+        starved = len(admitted) < min(len(queries), MRI_BATCH_HANDLE_QUERIES)
+        if starved:
+            logger.warning(f"💸 Batch query budget refused {refused} queries for {alias}")
+        elif refused:
+            logger.info(f"💸 Batch share for {alias}: dropped {refused} lowest-yield queries")
+        queries = admitted
+    logger.info(f"💸 Running {len(queries)} highest-yield queries (budget {MRI_QUERY_BUDGET})")
+
+    if len(queries) == 0:
+        logger.warning(f"⚠️ WARNING: No queries generated! This will cause empty results.")
+    else:
+        logger.debug("📝 First few queries: %s", queries[:3])
+    return queries, starved
 
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, content)
-            for phone in phones:
-                clean_phone = re.sub(r'[^\d]', '', phone)
-                if len(clean_phone) == 10:
-                    discovered["phones"].append(clean_phone)
+def _absorb_query_results(result, query, all_results, discovered_data, clue_queue):
+    """Merge one platform query's results into the scan state"""
+    logger.debug("📡 run_verbose_serper_scan returned: %s, length: %s", type(result), len(result) if result else 0)
 
-        discovered["phones"] = list(set(discovered["phones"]))
+    if result:
+        all_results.extend(result)
+        logger.debug("    ✅ Query returned %s results", len(result))
 
-        # Social media links
-        social_patterns = [
-            r'https?://(?:www\.)?(?:facebook|twitter|instagram|linkedin|youtube)\.com/[^\s<>"\']+',
-            r'@[A-Za-z0-9_]+(?:\s|$)',
-        ]
+        # 🧠 ANALYZE SERPER RESULTS AND EXTRACT CLUES
+        extracted_clues = analyze_serper_results(result, query)
 
-        for pattern in social_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            discovered["social_links"].extend(matches)
+        # Add discovered emails and phones to main discovered_data
+        discovered_data["emails"].extend(extracted_clues.get("emails", []))
+        discovered_data["phones"].extend(extracted_clues.get("phones", []))
 
-        discovered["social_links"] = list(set(discovered["social_links"]))
+        # Add URLs to clue queue for scraping
+        clue_queue.extend(extracted_clues.get("urls", []))
 
-        return discovered
+        record_query_yield(
+            query, result,
+            profiles=sum(1 for r in result if classify_url(r.link).is_profile),
+            emails=len(extracted_clues.get("emails", [])),
+            phones=len(extracted_clues.get("phones", []))
+        )
 
-    except Exception as e:
-        print(f"    ❌ Scraping failed for {url}: {str(e)}")
-        return {"emails": [], "phones": [], "profiles": [], "social_links": []}
+        logger.debug("    🧠 Extracted: %s emails, %s phones, %s URLs", len(extracted_clues.get('emails', [])), len(extracted_clues.get('phones', [])), len(extracted_clues.get('urls', [])))
 
-def enhanced_mri_scan(
-    alias,
-    phone=None,
-    location=None,
-    source_platform=None,
-    review_text=None,
-    verbose=False
-):
+        # Show first result for debugging
+        if len(result) > 0:
+            logger.debug("    📄 Sample result: %s...", str(result[0])[:100])
+    else:
+        record_query_yield(query, result)
+        logger.debug("    ⚠️ Query returned no results (result=%s)", result)
+
+def _report_query_error(query_error):
+    logger.debug("    ❌ Query failed: %s", str(query_error))
+    logger.debug("    ❌ Query error type: %s", type(query_error).__name__)
+
+def _collect_target_urls(all_results, discovered_data, clue_queue):
+    """Find profile and people-search URLs in the SERPER results and queue them for scraping"""
+    for i, result in enumerate(all_results):
+        logger.debug("📊 Processing result %s/%s", i+1, len(all_results))
+
+        # SERPER records keep their link, so no URL has to be regexed or rebuilt from the snippet
+        found_url = result.link
+        logger.debug("    📄 #%s %s - %s...", result.rank, result.domain or 'no link', result.text[:100])
+
+        kind = classify_url(found_url)
+        if found_url and kind.is_target:
+            logger.debug("    🎯 Target URL found: %s", found_url)
+
+            if kind.is_profile:
+                discovered_data["profiles"].append({
+                    "url": found_url,
+                    "platform": kind.platform,
+                    "source_query": f"Query {i+1}"
+                })
+                logger.debug("    👤 Profile found: %s", found_url)
+
+            # Add to clue queue for potential scraping - FORCE ADD people search URLs
+            if clue_queue.add(found_url):
+                logger.debug("    🧩 URL added to clue queue: %s", found_url)
+
+    logger.info(f"🧩 Clue Queue populated with {len(clue_queue)} URLs")
+
+    # 🧠 DEBUG: Show clues and URLs
+    logger.debug("🧠 Clues found: %s", list(clue_queue))
+    logger.debug("🔗 URLs to scrape: %s", list(clue_queue))
+
+def _emit(on_event, event_type, **data):
+    """Hand a typed progress event to the scan's listener, if any; a failing listener never stops the scan"""
+    if on_event is None:
+        return
+    try:
+        on_event(dict(data, type=event_type))
+    except Exception as e:
+        logger.warning(f"⚠️ MRI event listener failed on {event_type}: {e}")
+
+def _announce_findings(result, query, announced, on_event):
+    """Emit the emails, phones and profiles in one query's results that the listener has not seen yet"""
+    if on_event is None or not result:
+        return
+    clues = analyze_serper_results(result, query)
+    for kind, values in (("email", clues["emails"]), ("phone", clues["phones"])):
+        for value in values:
+            if (kind, value) not in announced:
+                announced.add((kind, value))
+                _emit(on_event, f"{kind}_found", value=value, query=query)
+    for r in result:
+        kind = classify_url(r.link)
+        if r.link and ("profile", r.link) not in announced and kind.is_profile:
+            announced.add(("profile", r.link))
+            _emit(on_event, "profile_found", url=r.link, platform=kind.platform, query=query)
+
+def _scrape_candidates(result):
+    """Records in one query's results worth scraping as soon as they are seen"""
+    return [r for r in result or [] if r.link and classify_url(r.link).is_target]
+
+def _new_scrape_pipeline(alias, workers, scrape=None):
+    """Scrape slots handed out best-first by expected contact yield"""
+    return ScrapePipeline(
+        scrape or _checkpointed_scrape, MRI_MAX_SCRAPES, workers,
+        score=scrape_scorer(alias), fingerprint=content_fingerprint
+    )
+
+def _top_up_scrapes(pipeline, clue_queue):
     """
-    Enhanced MRI scan with diagnostic logging and flow verification
+    Once every query is done, fill any scrape slots the target URLs left free with the
+    best-scoring remaining clue URLs. Returns the (url, future) scrapes of the scan.
     """
-    print(f"🔬 Starting Enhanced MRI Scan for: {alias}", flush=True)
+    logger.info(f"🕷️ Starting URL scraping phase...")
+    pipeline.offer_all(clue_queue)
+    claimed = pipeline.claimed()
+
+    if claimed:
+        logger.info(f"🚀 Collecting {len(claimed)} scrapes via Puppeteer or ScraperAPI...")
+    else:
+        logger.warning("⚠️ No URLs found to scrape.")
+    return claimed
+
+def _absorb_scrape(scraped, discovered_data):
+    if scraped:
+        emails_found = scraped.get("emails", [])
+        phones_found = scraped.get("phones", [])
+        profiles_found = scraped.get("profiles", [])
+
+        discovered_data["emails"].extend(emails_found)
+        discovered_data["phones"].extend(phones_found)
+        discovered_data["profiles"].extend(profiles_found)
+
+        logger.debug("    ✅ Scraped: %s emails, %s phones, %s profiles", len(emails_found), len(phones_found), len(profiles_found))
+    else:
+        logger.debug("    ⚠️ No data scraped from URL")
+
+def _report_scan_error(e):
+    logger.error(f"❌ Error in MRI scan: {str(e)}", exc_info=e)
 
-    discovered_data = {
+def _finalize_mri_results(alias, discovered_data, clue_queue, urls_scraped, skipped_phases=()):
+    # Remove duplicates
+    discovered_data["emails"] = list(set(discovered_data["emails"]))
+    discovered_data["phones"] = list(set(discovered_data["phones"]))
+
+    logger.info(f"🧬 MRI Scan Completed for {alias}")
+    logger.info(f"📊 Final Results:")
+    logger.info(f"  📧 Emails: {len(discovered_data['emails'])}")
+    logger.info(f"  📞 Phones: {len(discovered_data['phones'])}")
+    logger.info(f"  👤 Profiles: {len(discovered_data['profiles'])}")
+    logger.debug("  🕷️ URLs Scraped: %s", urls_scraped)
+    if skipped_phases:
+        logger.warning(f"⏱️ Scan deadline reached; partial results, skipped: {list(skipped_phases)}")
+
+    return {
+        "target": alias,
+        "partial": bool(skipped_phases),
+        "skipped_phases": list(skipped_phases),
+        "phone": discovered_data["phones"][0] if discovered_data["phones"] else None,
+        "email": discovered_data["emails"][0] if discovered_data["emails"] else None,
+        "discovered_data": discovered_data,
+        "scan_summary": {
+            "scan_complete": not skipped_phases,
+            "total_emails_found": len(discovered_data["emails"]),
+            "total_phones_found": len(discovered_data["phones"]),
+            "total_profiles_found": len(discovered_data["profiles"]),
+            "urls_scanned": len(clue_queue),
+            "urls_scraped": urls_scraped,
+            "clues_queued": len(clue_queue)
+        },
+        "clue_queue": list(clue_queue)
+    }
+
+def rate_mri_results(mri_results):
+    """
+    Attach risk score, star rating, reason and confidence to a finished MRI scan.
+    Contact details found mean the reviewer can be tracked; two or more review
+    profiles is the high-risk pattern.
+    """
+    discovered = mri_results.get('discovered_data', {})
+    discovered_emails = discovered.get('emails', [])
+    discovered_phones = discovered.get('phones', [])
+    discovered_profiles = discovered.get('profiles', [])
+
+    final_confidence = 30
+    risk_score = 20
+    star_rating = 5
+    rating_reason = "No significant risk indicators found"
+
+    if discovered_emails or discovered_phones:
+        final_confidence = 85
+        risk_score = 70
+        star_rating = 2
+        rating_reason = "Contact information discovered - potential reviewer tracking"
+
+    if len(discovered_profiles) >= 2:
+        risk_score = 90
+        star_rating = 1
+        rating_reason = "Multiple review profiles found - high risk pattern"
+
+    if MRI_BUDGET_SKIPPED in mri_results.get('skipped_phases', []):
+        # Queries the handle never ran could hold the evidence: no rating, not a clean one
+        risk_score = None
+        star_rating = None
+        rating_reason = "Not rated: the batch query budget ran out before this handle was fully searched"
+        final_confidence = 0
+    elif mri_results.get('partial'):
+        # The scan ran out of time: what was found stands, but absence of evidence is weaker
+        rating_reason += f" (partial scan, skipped: {', '.join(mri_results['skipped_phases'])})"
+        final_confidence = min(final_confidence, 60)
+
+    mri_results.update({
+        'risk_score': risk_score,
+        'star_rating': star_rating,
+        'rating_reason': rating_reason,
+        'confidence_score': final_confidence
+    })
+    return mri_results
+
+def _new_discovered_data():
+    return {
         "emails": [],
         "phones": [],
         "profiles": [],
@@ -145,262 +390,398 @@ def enhanced_mri_scan(
         "review_platforms": []
     }
 
-    clue_queue = []
+def _checkpointed_scrape(url):
+    """scrape_contact_info, skipped for URLs an earlier attempt of this scan already scraped"""
+    return checkpointed("scrape", url, lambda: scrape_contact_info(url))
+
+def enhanced_mri_scan(
+    alias,
+    phone=None,
+    location=None,
+    source_platform=None,
+    review_text=None,
+    verbose=False,
+    deadline=None
+):
+    """
+    Enhanced MRI scan with diagnostic logging and flow verification.
+    Queries and scrapes are checkpointed, so a retry after a crash resumes the scan.
+    The scan answers within `deadline` seconds (MRI_SCAN_DEADLINE by default); work it
+    had no time for is skipped and the result is marked partial.
+    """
+    with scan_checkpoint(scan_id_for("mri", alias, location)) as checkpoint:
+        with scan_deadline(deadline or MRI_SCAN_DEADLINE) as scan_time:
+            results = _enhanced_mri_scan(alias, location, scan_time)
+            if not results["partial"]:
+                checkpoint.complete()
+            return results
+
+def _enhanced_mri_scan(alias, location, deadline):
+    logger.info(f"🔬 Starting Enhanced MRI Scan for: {alias}")
+
+    discovered_data = _new_discovered_data()
+    clue_queue = ClueSet()  # canonical-URL dedup, discovery order
     urls_scraped = 0
+    skipped_phases = []
+    # Promising URLs are scraped in the background while the remaining queries run
+    pipeline = _new_scrape_pipeline(alias, MRI_SCRAPE_CONCURRENCY)
 
     try:
-        # Import required functions
-        print(f"📥 Importing search_utils functions...", flush=True)
-        from search_utils import generate_platform_queries, extract_identity_clues
-        print(f"✅ Successfully imported search_utils functions", flush=True)
-
-        print(f"🔧 Generating platform queries for alias='{alias}', location='{location}'", flush=True)
-        queries = generate_platform_queries(alias, location, [])
-        print(f"🧠 Generated {len(queries)} queries", flush=True)
-
-        if len(queries) == 0:
-            print(f"⚠️ WARNING: No queries generated! This will cause empty results.", flush=True)
-        else:
-            print(f"📝 First few queries: {queries[:3]}", flush=True)
+        queries, _ = _generate_mri_queries(alias, location)
 
         all_results = []
         for i, query in enumerate(queries, 1):
-            print(f"🔍 Executing query {i}/{len(queries)}: {query[:50]}...", flush=True)
+            if deadline.remaining() <= MRI_FINALIZE_RESERVE:
+                skipped_phases.append(f"search ({len(queries) - i + 1} of {len(queries)} queries)")
+                break
+            logger.debug("🔍 Executing query %s/%s: %s...", i, len(queries), query[:50])
             try:
-                print(f"📡 Calling run_verbose_serper_scan with query: {query}", flush=True)
-                from search_utils import run_verbose_serper_scan
+                logger.debug("📡 Calling run_verbose_serper_scan with query: %s", query)
                 result = run_verbose_serper_scan(query)
-                print(f"📡 run_verbose_serper_scan returned: {type(result)}, length: {len(result) if result else 0}", flush=True)
-
-                if result:
-                    all_results.extend(result)
-                    print(f"    ✅ Query returned {len(result)} results", flush=True)
-                    
-                    # 🧠 ANALYZE SERPER RESULTS AND EXTRACT CLUES
-                    from search_utils import analyze_serper_results
-                    extracted_clues = analyze_serper_results(result, query)
-                    
-                    # Add discovered emails and phones to main discovered_data
-                    discovered_data["emails"].extend(extracted_clues.get("emails", []))
-                    discovered_data["phones"].extend(extracted_clues.get("phones", []))
-                    
-                    # Add URLs to clue queue for scraping
-                    clue_queue.extend(extracted_clues.get("urls", []))
-                    
-                    print(f"    🧠 Extracted: {len(extracted_clues.get('emails', []))} emails, {len(extracted_clues.get('phones', []))} phones, {len(extracted_clues.get('urls', []))} URLs")
-                    
-                    # Show first result for debugging
-                    if len(result) > 0:
-                        print(f"    📄 Sample result: {str(result[0])[:100]}...", flush=True)
-                else:
-                    print(f"    ⚠️ Query returned no results (result={result})", flush=True)
+                _absorb_query_results(result, query, all_results, discovered_data, clue_queue)
+                pipeline.offer_records(_scrape_candidates(result))
             except Exception as query_error:
-                print(f"    ❌ Query failed: {str(query_error)}", flush=True)
-                print(f"    ❌ Query error type: {type(query_error).__name__}", flush=True)
+                _report_query_error(query_error)
                 continue
 
-        print(f"🔍 SERPER returned {len(all_results)} total results", flush=True)
-
-        for i, result in enumerate(all_results):
-                print(f"📊 Processing result {i+1}/{len(all_results)}")
-
-                text_content = ""
-                url = ""
-
-                if isinstance(result, dict):
-                    text_content = f"{result.get('title', '')} {result.get('snippet', '')}"
-                    url = result.get('link', '')
-                    print(f"    📄 Dict result - URL: {url[:50] if url else 'None'}...")
-                    print(f"    📄 Dict result - Text: {text_content[:100]}...")
-                elif isinstance(result, str):
-                    text_content = result
-                    print(f"    📄 String result: {text_content[:100]}...")
-                    # Extract URLs from text using improved regex
-                    import re
-                    url_pattern = r'https?://[^\s<>"\']+(?:[^\s<>"\'.,;!?])'
-                    urls = re.findall(url_pattern, result)
-                    if not urls:
-                        # Try to construct URLs from people search results
-                        if 'whitepages.com' in text_content.lower():
-                            # Look for names in the snippet
-                            name_match = re.search(r'([A-Z][a-z]+ [A-Z][a-z]*)', text_content)
-                            if name_match:
-                                url = f"https://www.whitepages.com/name/{name_match.group(1).replace(' ', '-')}"
-                        elif 'fastpeoplesearch.com' in text_content.lower():
-                            name_match = re.search(r'([A-Z][a-z]+ [A-Z][a-z]*)', text_content)
-                            if name_match:
-                                url = f"https://www.fastpeoplesearch.com/name/{name_match.group(1).replace(' ', '-')}"
-                    else:
-                        url = urls[0]
-                    print(f"    📄 Extracted URL: {url[:50] if url else 'None'}...")
-
-        # Enhanced URL extraction from result content
-                all_urls = []
-                if url:
-                    all_urls.append(url)
-
-                # Extract additional URLs from text content
-                url_pattern = r'https?://[^\s<>"\']+(?:[^\s<>"\'.,;!?])'
-                additional_urls = re.findall(url_pattern, text_content)
-                all_urls.extend(additional_urls)
-
-                # FORCE target URL creation for people search sites
-                people_search_domains = ['whitepages.com', 'fastpeoplesearch.com', 'spokeo.com', 'radaris.com', 'truepeoplesearch.com']
-                for domain in people_search_domains:
-                    if domain in text_content.lower() and not any(domain in u for u in all_urls):
-                        # Extract name from snippet and create synthetic URL
-                        name_patterns = [
-                            r'([A-Z][a-z]+ [A-Z][a-z]*)',  # "Seth Moore"
-                            r'([A-Z][a-z]+ [A-Z] [A-Z][a-z]*)',  # "Seth D Moore"
-                        ]
-                        for pattern in name_patterns:
-                            name_match = re.search(pattern, text_content)
-                            if name_match:
-                                synthetic_url = f"https://www.{domain}/name/{name_match.group(1).replace(' ', '-')}"
-                                all_urls.append(synthetic_url)
-                                print(f"    🔧 Synthetic URL created: {synthetic_url}")
-                                break
-
-                # Process all found URLs with enhanced filtering
-                for found_url in all_urls:
-                    if found_url and (is_mri_target_url(found_url) or any(domain in found_url for domain in people_search_domains)):
-                        print(f"    🎯 Target URL found: {found_url}")
-
-                        if is_profile_link(found_url) or any(domain in found_url for domain in people_search_domains):
-                            discovered_data["profiles"].append({
-                                "url": found_url,
-                                "platform": extract_platform_from_url(found_url),
-                                "source_query": f"Query {i+1}"
-                            })
-                            print(f"    👤 Profile found: {found_url}")
-
-                        # Add to clue queue for potential scraping - FORCE ADD people search URLs
-                        if found_url not in clue_queue:
-                            clue_queue.append(found_url)
-                            print(f"    🧩 URL added to clue queue: {found_url}")
-
-        print(f"🧩 Clue Queue populated with {len(clue_queue)} URLs", flush=True)
-
-        # 🧠 DEBUG: Show clues and URLs
-        print(f"🧠 Clues found: {clue_queue}")
-        print(f"🔗 URLs to scrape: {clue_queue}")
-
-        # Phase 2: URL Scraping
-        print(f"🕷️ Starting URL scraping phase...", flush=True)
-        max_scrapes = min(8, len(clue_queue))  # Limit to prevent timeout
-
-        if clue_queue:
-            print(f"🚀 Attempting to scrape {len(clue_queue)} URLs via Puppeteer or ScraperAPI...")
-        else:
-            print("⚠️ No URLs found to scrape.")
-
-        for i, url in enumerate(clue_queue[:max_scrapes], 1):
-            print(f"🧪 [{i}/{max_scrapes}] Scraping URL: {url}", flush=True)
+        logger.info(f"🔍 SERPER returned {len(all_results)} total results")
+        _collect_target_urls(all_results, discovered_data, clue_queue)
 
+        # Phase 2: collect the scrapes started during the search, topped up from the clue queue
+        claimed = _top_up_scrapes(pipeline, clue_queue)
+        for n, (url, future) in enumerate(claimed):
             try:
-                scraped = scrape_contact_info(url)
+                scraped = future.result(timeout=max(0.0, deadline.remaining() - MRI_FINALIZE_RESERVE))
                 urls_scraped += 1
+                record_scrape_yield(url, scraped)
+                _absorb_scrape(scraped, discovered_data)
+            except (DeadlineExceeded, concurrent.futures.TimeoutError):
+                _cancel_scrapes(claimed[n:])
+                skipped_phases.append(f"scrape ({len(claimed) - n} of {len(claimed)} URLs)")
+                break
+            except Exception as scrape_error:
+                logger.error(f"    ❌ Scraping failed: {str(scrape_error)}")
+                record_scrape_yield(url, None)
+                continue
+
+    except Exception as e:
+        _report_scan_error(e)
+    finally:
+        pipeline.close()
 
-                if scraped:
-                    emails_found = scraped.get("emails", [])
-                    phones_found = scraped.get("phones", [])
-                    profiles_found = scraped.get("profiles", [])
+    return _finalize_mri_results(alias, discovered_data, clue_queue, urls_scraped, skipped_phases)
 
-                    discovered_data["emails"].extend(emails_found)
-                    discovered_data["phones"].extend(phones_found)
-                    discovered_data["profiles"].extend(profiles_found)
+def _cancel_scrapes(claimed):
+    """Give up on scrapes the scan has no time left to wait for"""
+    for url, future in claimed:
+        if future.cancel():
+            logger.debug("    ⏹️ Scrape cancelled: %s", url)
 
-                    print(f"    ✅ Scraped: {len(emails_found)} emails, {len(phones_found)} phones, {len(profiles_found)} profiles", flush=True)
-                else:
-                    print(f"    ⚠️ No data scraped from URL", flush=True)
+async def enhanced_mri_scan_async(
+    alias,
+    phone=None,
+    location=None,
+    source_platform=None,
+    review_text=None,
+    verbose=False,
+    serper_concurrency=None,
+    scrape_concurrency=None,
+    on_event=None,
+    serper_slots=None,
+    scrape=None,
+    query_budget=None
+):
+    """
+    asyncio version of enhanced_mri_scan.
+    Every query variant is issued concurrently, bounded by MRI_SERPER_CONCURRENCY, and
+    each query's target URLs start scraping (MRI_SCRAPE_CONCURRENCY at a time, at most
+    MRI_MAX_SCRAPES per scan) as soon as that query answers. Search results are merged
+    in query order; which URLs win the scrape slots depends on which queries answer first.
+    on_event, if given, is called with a typed progress dict as each step happens.
+    When the scan deadline comes, unanswered queries and unfinished scrapes are abandoned
+    and the evidence so far is returned, marked partial with the phases skipped.
+    Scans run as a batch pass a shared serper_slots semaphore, scrape function and
+    query_budget, so they draw on one concurrency limit and one quota.
+    """
+    logger.info(f"🔬 Starting Enhanced MRI Scan (async) for: {alias}")
+    deadline = current_deadline() or Deadline(MRI_SCAN_DEADLINE)
+    skipped_phases = []
 
+    serper_slots = serper_slots or asyncio.Semaphore(serper_concurrency or MRI_SERPER_CONCURRENCY)
+    pipeline = _new_scrape_pipeline(alias, scrape_concurrency or MRI_SCRAPE_CONCURRENCY, scrape)
+
+    discovered_data = _new_discovered_data()
+    clue_queue = ClueSet()  # canonical-URL dedup, discovery order
+    urls_scraped = 0
+    announced = set()
+
+    async def run_variant(variant):
+        async with serper_slots:
+            logger.debug("🔍 Querying SERPER with: %s", variant)
+            # The broker dedups this variant against every other scan in the process; an
+            # abandoned scan cancels only its own wait, never the query another scan shares
+            return await asyncio.wrap_future(submit_query(variant, priority=PRIORITY_HIGH))
+
+    async def run_query(query):
+        # Same expansion as run_verbose_serper_scan, with the variants in flight together
+        _emit(on_event, "query_started", query=query)
+        variants = generate_query_variants(query)
+        responses = await asyncio.gather(*(run_variant(v) for v in variants), return_exceptions=True)
+        results = []
+        for variant, response in zip(variants, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"⚠️ SERPER query failed for '{variant}': {response}")
+                continue
+            merge_variant_response(results, response)
+        if all(isinstance(response, Exception) for response in responses):
+            # Nothing answered: report a failed query rather than an empty one
+            _emit(on_event, "query_failed", query=query, error=str(responses[0]))
+            raise responses[0]
+        logger.info(f"✅ Found {len(results)} results across {len(variants)} query variants.")
+        _emit(on_event, "query_finished", query=query, results=len(results))
+        _announce_findings(results, query, announced, on_event)
+        # Start scraping this query's targets while the other queries are still running
+        pipeline.offer_records(_scrape_candidates(results))
+        return results
+
+    try:
+        queries, starved = _generate_mri_queries(alias, location, query_budget)
+        if starved:
+            skipped_phases.append(MRI_BUDGET_SKIPPED)
+        _emit(on_event, "scan_started", alias=alias, queries=len(queries))
+        logger.info(f"🚀 Executing {len(queries)} queries concurrently")
+        tasks = [asyncio.ensure_future(run_query(q)) for q in queries]
+        if tasks:
+            await asyncio.wait(tasks, timeout=max(0.0, deadline.remaining() - MRI_FINALIZE_RESERVE))
+        unfinished = [t for t in tasks if not t.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            skipped_phases.append(f"search ({len(unfinished)} of {len(queries)} queries)")
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        query_results = [
+            t.exception() or t.result() if not t.cancelled() else DeadlineExceeded("query abandoned at the deadline")
+            for t in tasks
+        ]
+
+        all_results = []
+        for query, result in zip(queries, query_results):
+            if isinstance(result, Exception):
+                _report_query_error(result)
+                continue
+            _absorb_query_results(result, query, all_results, discovered_data, clue_queue)
+
+        logger.info(f"🔍 SERPER returned {len(all_results)} total results")
+        _collect_target_urls(all_results, discovered_data, clue_queue)
+
+        # Phase 2: collect the scrapes started during the search, topped up from the clue queue
+        claimed = _top_up_scrapes(pipeline, clue_queue)
+        _emit(on_event, "search_finished", results=len(all_results), scrapes=len(claimed))
+        # Scrapes are already running; awaiting them in order keeps the merge deterministic
+        for n, (url, future) in enumerate(claimed):
+            try:
+                scraped = await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=max(0.0, deadline.remaining() - MRI_FINALIZE_RESERVE)
+                )
+            except (DeadlineExceeded, asyncio.TimeoutError):
+                _cancel_scrapes(claimed[n:])
+                skipped_phases.append(f"scrape ({len(claimed) - n} of {len(claimed)} URLs)")
+                break
             except Exception as scrape_error:
-                print(f"    ❌ Scraping failed: {str(scrape_error)}", flush=True)
+                logger.error(f"    ❌ Scraping failed: {str(scrape_error)}")
+                record_scrape_yield(url, None)
+                _emit(on_event, "scrape_failed", url=url, error=str(scrape_error))
                 continue
+            urls_scraped += 1
+            record_scrape_yield(url, scraped)
+            _absorb_scrape(scraped, discovered_data)
+            _emit(
+                on_event, "scrape_done", url=url,
+                emails=(scraped or {}).get("emails", []),
+                phones=(scraped or {}).get("phones", []),
+                profiles=len((scraped or {}).get("profiles", []))
+            )
 
     except Exception as e:
-        print(f"❌ Error in MRI scan: {str(e)}", flush=True)
-        import traceback
-        print(traceback.format_exc(), flush=True)
+        _report_scan_error(e)
+    finally:
+        pipeline.close()
 
-    # Remove duplicates
-    discovered_data["emails"] = list(set(discovered_data["emails"]))
-    discovered_data["phones"] = list(set(discovered_data["phones"]))
+    return _finalize_mri_results(alias, discovered_data, clue_queue, urls_scraped, skipped_phases)
 
-    print(f"🧬 MRI Scan Completed for {alias}", flush=True)
-    print(f"📊 Final Results:", flush=True)
-    print(f"  📧 Emails: {len(discovered_data['emails'])}", flush=True)
-    print(f"  📞 Phones: {len(discovered_data['phones'])}", flush=True)
-    print(f"  👤 Profiles: {len(discovered_data['profiles'])}", flush=True)
-    print(f"  🕷️ URLs Scraped: {urls_scraped}", flush=True)
+def run_enhanced_mri_scan(alias, deadline=None, **kwargs):
+    """
+    Blocking entry point to the async MRI scan for Flask routes and scripts.
+    The scan answers within `deadline` seconds (MRI_SCAN_DEADLINE by default): every SERPER
+    call and scrape is sized to the time left, and a scan that runs out of time returns
+    partial results. Queries and scrapes are checkpointed, so a scan that crashes or was
+    cut short resumes from where it stopped when it is run again.
+    """
+    with scan_checkpoint(scan_id_for("mri", alias, kwargs.get("location"))) as checkpoint:
+        with scan_deadline(deadline or MRI_SCAN_DEADLINE):
+            results = asyncio.run(enhanced_mri_scan_async(alias, **kwargs))
+            if not results["partial"]:
+                checkpoint.complete()
+            return results
+
+def _stream_events(run, heartbeat, name):
+    """
+    Run run(put) on a background thread and yield the events it puts as they happen.
+    With heartbeat set, a {"type": "heartbeat"} event is yielded whenever the
+    work is quiet that many seconds.
+    """
+    events = queue.Queue()
+
+    def target():
+        try:
+            run(events.put)
+        finally:
+            events.put(None)
+
+    # The thread runs in the caller's context, so per-request debug logging follows the scan
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(target,), name=name, daemon=True).start()
+    while True:
+        try:
+            event = events.get(timeout=heartbeat)
+        except queue.Empty:
+            yield {"type": "heartbeat"}
+            continue
+        if event is None:
+            return
+        yield event
+
+def stream_enhanced_mri_scan(alias, heartbeat=None, **kwargs):
+    """
+    Generator version of run_enhanced_mri_scan: runs the scan on a background thread and
+    yields its progress events as they happen. The last event is "rating" followed by
+    "complete" (carrying the rated results), or "error".
+    """
+    def run(put):
+        try:
+            results = rate_mri_results(run_enhanced_mri_scan(alias, on_event=put, **kwargs))
+            _emit(put, "rating", star_rating=results["star_rating"], risk_score=results["risk_score"],
+                  rating_reason=results["rating_reason"], confidence_score=results["confidence_score"])
+            _emit(put, "complete", results=results)
+        except Exception as e:
+            _report_scan_error(e)
+            _emit(put, "error", error=str(e))
+
+    return _stream_events(run, heartbeat, f"mri-stream-{alias[:20]}")
+
+class _SharedScrapes:
+    """
+    Scrape function shared by the scans of a batch: each page is scraped once however
+    many handles find it, and at most `concurrency` scrapes run at a time batch-wide.
+    """
 
-    return {
-        "target": alias,
-        "phone": discovered_data["phones"][0] if discovered_data["phones"] else None,
-        "email": discovered_data["emails"][0] if discovered_data["emails"] else None,
-        "discovered_data": discovered_data,
-        "scan_summary": {
-            "scan_complete": True,
-            "total_emails_found": len(discovered_data["emails"]),
-            "total_phones_found": len(discovered_data["phones"]),
-            "total_profiles_found": len(discovered_data["profiles"]),
-            "urls_scanned": len(clue_queue),
-            "urls_scraped": urls_scraped,
-            "clues_queued": len(clue_queue)
-        },
-        "clue_queue": clue_queue
+    def __init__(self, concurrency):
+        self._flight = SingleFlight()
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._results = {}
+        self.shared = 0
+
+    def __call__(self, url):
+        key = canonicalize_url(url)
+        with self._lock:
+            if key in self._results:
+                self.shared += 1
+                return self._results[key]
+
+        ran = []
+
+        def scrape():
+            ran.append(True)
+            with self._slots:
+                return _checkpointed_scrape(url)
+
+        result = self._flight.do(key, scrape)
+        with self._lock:
+            self._results[key] = result
+            if not ran:
+                # Joined another handle's scrape of the same page while it was running
+                self.shared += 1
+        return result
+
+def run_batch_mri_scan(targets, on_event=None, deadline=None, query_budget=None):
+    """
+    MRI-scan many handles in one asyncio loop. targets is a list of {"handle", "location"}.
+    The scans share one SERPER concurrency limit, one query budget (batch_query_budget by
+    default) split evenly across the handles (a query two handles generate is paid once) and one scrape cache (a page two
+    handles find is scraped once), all under one deadline (MRI_BATCH_DEADLINE by default).
+    A handle the budget starved is partial and left unrated. on_event receives a "result"
+    event with the rated results of each handle as it finishes, or an "error" event.
+    Returns (rated results in target order, batch stats).
+    """
+    scrapes = _SharedScrapes(MRI_BATCH_SCRAPE_CONCURRENCY)
+    budget = SharedQueryBudget(query_budget or batch_query_budget(len(targets)), scans=len(targets))
+
+    async def run_all():
+        serper_slots = asyncio.Semaphore(MRI_SERPER_CONCURRENCY)
+
+        async def scan_one(target):
+            handle, location = target["handle"], target.get("location", "")
+            try:
+                with scan_checkpoint(scan_id_for("mri", handle, location)) as checkpoint:
+                    results = await enhanced_mri_scan_async(
+                        handle, location=location, scrape_concurrency=2,
+                        serper_slots=serper_slots, scrape=scrapes, query_budget=budget
+                    )
+                    if not results["partial"]:
+                        checkpoint.complete()
+                rated = rate_mri_results(results)
+                _emit(on_event, "result", handle=handle, location=location, results=rated)
+                return rated
+            except Exception as e:
+                _report_scan_error(e)
+                _emit(on_event, "error", handle=handle, location=location, error=str(e))
+                return None
+
+        return await asyncio.gather(*(scan_one(t) for t in targets))
+
+    with scan_deadline(deadline or MRI_BATCH_DEADLINE):
+        results = asyncio.run(run_all())
+
+    stats = {
+        "handles": len(targets),
+        "queries_paid": budget.used,
+        "query_budget": budget.limit,
+        "queries_deduplicated": budget.deduplicated,
+        "scrapes_shared": scrapes.shared,
+        "partial": sum(1 for r in results if r is None or r.get("partial")),
+        "unrated": sum(1 for r in results if r is None or r.get("star_rating") is None)
     }
+    logger.info(f"📦 Batch MRI scan finished: {stats}")
+    return results, stats
+
+def stream_batch_mri_scan(targets, heartbeat=None, **kwargs):
+    """
+    Generator version of run_batch_mri_scan: yields "batch_started", then a "result" or
+    "error" event per handle as each finishes, then "batch_complete" with the batch stats.
+    """
+    def run(put):
+        _emit(put, "batch_started", handles=[t["handle"] for t in targets])
+        try:
+            _, stats = run_batch_mri_scan(targets, on_event=put, **kwargs)
+            _emit(put, "batch_complete", stats=stats)
+        except Exception as e:
+            _report_scan_error(e)
+            _emit(put, "error", error=str(e))
+
+    return _stream_events(run, heartbeat, "mri-batch-stream")
 
 def is_mri_target_url(url: str) -> bool:
     """Check if URL is worth MRI scanning"""
-    target_domains = [
-        'yelp.com', 'tripadvisor.com', 'google.com',
-        'reddit.com', 'facebook.com', 'instagram.com',
-        'linkedin.com', 'twitter.com', 'opentable.com',
-        'trustpilot.com', 'foursquare.com', 'zomato.com',
-        'grubhub.com', 'seamless.com', 'doordash.com',
-        'whitepages.com', 'fastpeoplesearch.com', 'spokeo.com',
-        'radaris.com', 'truepeoplesearch.com'
-    ]
-    return any(domain in url.lower() for domain in target_domains)
+    return classify_url(url).is_target
 
 def is_profile_link(url: str) -> bool:
     """Check if URL appears to be a user profile or contains contact info"""
-    profile_indicators = [
-        '/user/', '/profile/', '/users/', '/member/',
-        'yelp.com/user_details', 'reddit.com/user/',
-        'facebook.com/', 'instagram.com/', 'linkedin.com/in/',
-        'whitepages.com/', 'fastpeoplesearch.com/', 
-        'spokeo.com/', 'radaris.com/', 'truepeoplesearch.com/'
-    ]
-    # Also check if URL contains contact info indicators
-    contact_indicators = [
-        'phone', 'email', 'contact', 'address', 'details'
-    ]
-
-    has_profile = any(indicator in url.lower() for indicator in profile_indicators)
-    has_contact = any(indicator in url.lower() for indicator in contact_indicators)
-
-    return has_profile or has_contact
+    return classify_url(url).is_profile
 
 def extract_platform_from_url(url: str) -> str:
     """Extract platform name from URL"""
-    if 'yelp.com' in url:
-        return 'Yelp'
-    elif 'tripadvisor.com' in url:
-        return 'TripAdvisor'
-    elif 'google.com' in url:
-        return 'Google'
-    elif 'reddit.com' in url:
-        return 'Reddit'
-    elif 'linkedin.com' in url:
-        return 'LinkedIn'
-    elif 'facebook.com' in url:
-        return 'Facebook'
-    elif 'trustpilot.com' in url:
-        return 'Trustpilot'
-    else:
-        return 'Unknown'
+    return classify_url(url).platform
 
 if __name__ == "__main__":
     # Test with Seth D.
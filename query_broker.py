@@ -0,0 +1,229 @@
+import os
+import time
+import queue
+import itertools
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from serper_cache import cache_key
+from deadline import current_deadline, DeadlineExceeded
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Process-wide broker that every SERPER query generator submits to.
+# Equivalent queries share one Future, higher-priority work runs first,
+# and a fixed pool of threads bounds how many queries run at once.
+QUERY_BROKER_WORKERS = int(os.environ.get("QUERY_BROKER_WORKERS", 8))
+QUERY_BROKER_MEMO_TTL = float(os.environ.get("QUERY_BROKER_MEMO_TTL", 120))  # seconds a finished result is reused
+QUERY_BROKER_MEMO_SIZE = 2048
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+
+class _CallerFuture(Future):
+    """One caller's view of a shared query: waiting on it never outlasts that caller's deadline"""
+
+    def __init__(self, deadline):
+        super().__init__()
+        self._deadline = deadline
+
+    def result(self, timeout=None):
+        if self._deadline is None:
+            return super().result(timeout)
+        try:
+            return super().result(self._deadline.remaining() if timeout is None else self._deadline.cap(timeout))
+        except FutureTimeout:
+            if not self._deadline.expired():
+                raise
+            if self.cancel():
+                raise DeadlineExceeded("scan deadline reached while waiting for a brokered SERPER query")
+            return super().result()  # delivered just as the deadline passed
+
+
+class QueryBroker:
+    def __init__(self, fetch, recall=None, keep=None, max_workers=QUERY_BROKER_WORKERS, memo_ttl=QUERY_BROKER_MEMO_TTL):
+        self._fetch = fetch
+        self._recall = recall
+        self._keep = keep
+        self._max_workers = max_workers
+        self._memo_ttl = memo_ttl
+        self._lock = threading.Lock()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._pending = {}  # key -> Future for queued or running queries
+        self._memo = OrderedDict()  # key -> (finished_at, Future) for recently finished queries
+        self._workers_pid = None
+        self._stats = {"submitted": 0, "recalled": 0, "deduplicated": 0, "executed": 0, "failed": 0}
+
+    def _ensure_workers(self):
+        # Threads do not survive fork, so a forked gunicorn worker starts its own pool
+        if self._workers_pid == os.getpid():
+            return
+        self._workers_pid = os.getpid()
+        self._queue = queue.PriorityQueue()
+        self._pending = {}
+        for i in range(self._max_workers):
+            threading.Thread(target=self._work, name=f"query-broker-{i}", daemon=True).start()
+
+    def _recent(self, key, now):
+        entry = self._memo.get(key)
+        if entry is None:
+            return None
+        finished_at, future = entry
+        if now - finished_at > self._memo_ttl:
+            del self._memo[key]
+            return None
+        self._memo.move_to_end(key)
+        return future
+
+    def submit(self, query, num_results=10, priority=PRIORITY_NORMAL):
+        """
+        Queue a SERPER query and return a Future for its SerperResult records.
+        A query equivalent to one already queued, running or just finished
+        shares that query's job instead of being issued again.
+        Jobs run outside every caller's scan: each caller's deadline bounds only its
+        own wait, and the result goes into its checkpoint and evidence when it arrives.
+        """
+        context = contextvars.copy_context()
+        recalled = context.run(self._recall, query, num_results) if self._recall else None
+        if recalled is not None:
+            with self._lock:
+                self._stats["submitted"] += 1
+                self._stats["recalled"] += 1
+            future = Future()
+            future.set_result(recalled)
+            return future
+
+        caller = _CallerFuture(context.run(current_deadline))
+        shared = self._shared(query, num_results, priority)
+        shared.add_done_callback(lambda done: self._deliver(caller, done, context, query, num_results))
+        return caller
+
+    def _shared(self, query, num_results, priority):
+        key = cache_key(query, num_results)
+        with self._lock:
+            self._ensure_workers()
+            self._stats["submitted"] += 1
+
+            future = self._pending.get(key) or self._recent(key, time.time())
+            if future is not None:
+                self._stats["deduplicated"] += 1
+                if not future.done():
+                    # Re-queue at the better priority; the worker skips whichever entry comes second
+                    self._queue.put((priority, next(self._sequence), key, query, num_results, future))
+                return future
+
+            future = Future()
+            self._pending[key] = future
+            self._queue.put((priority, next(self._sequence), key, query, num_results, future))
+            return future
+
+    def _deliver(self, caller, shared, context, query, num_results):
+        if not caller.set_running_or_notify_cancel():
+            return  # the caller stopped waiting, so nothing is recorded for it
+        error = shared.exception()
+        if error is not None:
+            caller.set_exception(error)
+            return
+        result = shared.result()
+        if self._keep:
+            try:
+                context.run(self._keep, query, num_results, result)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not record brokered SERPER result for '{query}': {e}")
+        caller.set_result(result)
+
+    def _work(self):
+        while True:
+            priority, _, key, query, num_results, future = self._queue.get()
+            if future.done() or future.running():
+                continue
+            if not future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._pending.pop(key, None)
+                continue
+
+            try:
+                # An empty context: the shared job carries no caller's deadline, checkpoint or evidence
+                result = contextvars.Context().run(self._fetch, query, num_results)
+            except Exception as e:
+                with self._lock:
+                    self._stats["failed"] += 1
+                    self._pending.pop(key, None)
+                future.set_exception(e)
+                continue
+
+            with self._lock:
+                self._stats["executed"] += 1
+                self._pending.pop(key, None)
+                self._memo[key] = (time.time(), future)
+                while len(self._memo) > QUERY_BROKER_MEMO_SIZE:
+                    self._memo.popitem(last=False)
+            future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, queued=self._queue.qsize(), in_flight=len(self._pending))
+
+
+def _fetch_from_serper(query, num_results):
+    from search_utils import fetch_serper_records
+    return fetch_serper_records(query, num_results=num_results)
+
+
+def _recall_for_scan(query, num_results):
+    from search_utils import recall_serper_records
+    return recall_serper_records(query, num_results=num_results)
+
+
+def _keep_for_scan(query, num_results, records):
+    from search_utils import keep_serper_records
+    keep_serper_records(query, num_results, records)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = QueryBroker(_fetch_from_serper, recall=_recall_for_scan, keep=_keep_for_scan)
+    return _broker
+
+
+def submit_query(query, num_results=10, priority=PRIORITY_NORMAL):
+    return get_broker().submit(query, num_results=num_results, priority=priority)
+
+
+def submit_queries(queries, num_results=10, priority=PRIORITY_NORMAL):
+    """Submit a batch of queries; returns their Futures in the same order"""
+    broker = get_broker()
+    return [broker.submit(q, num_results=num_results, priority=priority) for q in queries]
+
+
+def run_query(query, num_results=10, priority=PRIORITY_NORMAL):
+    """Submit one query and block for its results"""
+    return submit_query(query, num_results=num_results, priority=priority).result()
+
+
+def gather_results(futures, queries=None):
+    """
+    Wait for submitted queries and return their results in order.
+    A failed query contributes an empty list, matching query_serper's behaviour.
+    """
+    results = []
+    for i, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            label = queries[i] if queries else f"#{i + 1}"
+            logger.warning(f"⚠️ Brokered SERPER query failed for '{label}': {e}")
+            results.append([])
+    return results
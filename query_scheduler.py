@@ -0,0 +1,139 @@
+import os
+import threading
+from deadline import current_deadline
+from query_broker import PRIORITY_NORMAL, submit_queries
+from query_yield import rank_queries, record_query_yield
+from serper_cache import cache_key, known_empty_queries
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Each scan gets a SERPER budget and spends it on the highest-yield queries first,
+# a few at a time, stopping as soon as more evidence would not change the rating.
+SCHEDULER_BATCH_SIZE = int(os.environ.get("SCHEDULER_BATCH_SIZE", 3))
+SCHEDULER_STABLE_BATCHES = int(os.environ.get("SCHEDULER_STABLE_BATCHES", 2))  # unchanged ratings before stopping
+
+
+class QueryBudget:
+    """Number of SERPER queries one scan may still issue, shared across its phases"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self, wanted):
+        """Reserve up to `wanted` queries; returns how many were granted"""
+        with self._lock:
+            granted = max(0, min(wanted, self.limit - self.used))
+            self.used += granted
+            return granted
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.used)
+
+
+class SharedQueryBudget(QueryBudget):
+    """
+    One budget for several scans run together. Each scan may spend an equal share of
+    what is left when it asks, so the first scans cannot starve the rest; a share a
+    scan does not use passes on to the scans after it. A query is paid for once: when
+    another scan in the group asks for a query already admitted, it is free (the query
+    broker and SERPER cache answer it without a second call).
+    """
+
+    def __init__(self, limit, scans=1):
+        super().__init__(limit)
+        self._paid = set()
+        self._scans_left = max(1, scans)
+        self.deduplicated = 0
+
+    def admit(self, queries):
+        """The queries, in order, that fit the asking scan's share of the budget"""
+        admitted = []
+        with self._lock:
+            share = (self.limit - self.used) // self._scans_left
+            self._scans_left = max(1, self._scans_left - 1)
+            spent = 0
+            for query in queries:
+                key = cache_key(query)
+                if key in self._paid:
+                    self.deduplicated += 1
+                elif spent < share:
+                    spent += 1
+                    self.used += 1
+                    self._paid.add(key)
+                else:
+                    continue
+                admitted.append(query)
+        return admitted
+
+
+class StableRating:
+    """
+    Early-stop test for run_scheduled_queries: true once the star rating computed
+    from the evidence so far has stayed the same for `patience` batches in a row.
+    """
+
+    def __init__(self, rate, patience=SCHEDULER_STABLE_BATCHES):
+        self._rate = rate
+        self._patience = patience
+        self._last = None
+        self._unchanged = 0
+
+    def __call__(self, executed):
+        stars = self._rate(executed)
+        self._unchanged = self._unchanged + 1 if stars == self._last else 1
+        self._last = stars
+        return self._unchanged >= self._patience
+
+
+def run_scheduled_queries(queries, budget, num_results=10, is_settled=None, abort_if_dry=0, measure=None,
+                          batch_size=SCHEDULER_BATCH_SIZE, priority=PRIORITY_NORMAL, label="Scheduled"):
+    """
+    Run queries best-yield first, in batches through the query broker, within the budget.
+    Queries SERPER recently answered with nothing are skipped without spending budget.
+    Stops early when is_settled(executed) says the rating is stable, after the first
+    batch when it returned fewer than abort_if_dry results, or at the scan's deadline. measure(records) may return
+    the (profiles, emails, phones) found, for the yield statistics. Returns [(query, records)].
+    """
+    executed = []
+    total_hits = 0
+    queries = list(dict.fromkeys(queries))
+    known_empty = known_empty_queries(queries, num_results)
+    if known_empty:
+        logger.info(f"🕳️ {label}: skipping {len(known_empty)} queries known to return nothing")
+    ranked = rank_queries([q for q in queries if q not in known_empty])
+    deadline = current_deadline()
+
+    for start in range(0, len(ranked), batch_size):
+        if deadline is not None and deadline.expired():
+            logger.warning(f"⏱️ {label}: scan deadline reached, skipping {len(ranked) - start} queries")
+            break
+        batch = ranked[start:start + batch_size]
+        batch = batch[:budget.take(len(batch))]
+        if not batch:
+            logger.info(f"💸 {label}: query budget spent ({budget.used}/{budget.limit}), skipping {len(ranked) - start} queries")
+            break
+
+        for query, future in zip(batch, submit_queries(batch, num_results=num_results, priority=priority)):
+            try:
+                records = future.result()
+            except Exception as e:
+                # A failed query says nothing about the site's yield
+                logger.warning(f"⚠️ {label}: query failed, not counted: '{query}': {e}")
+                continue
+            profiles, emails, phones = measure(records) if measure else (0, 0, 0)
+            record_query_yield(query, records, profiles=profiles, emails=emails, phones=phones)
+            total_hits += len(records)
+            executed.append((query, records))
+
+        if start == 0 and total_hits < abort_if_dry:
+            logger.warning(f"⚠️ Early abort: {label} queries yielding minimal results")
+            break
+        if is_settled and start + batch_size < len(ranked) and is_settled(executed):
+            logger.info(f"🎯 {label}: rating stable after {len(executed)}/{len(ranked)} queries, stopping early")
+            break
+
+    return executed
@@ -0,0 +1,232 @@
+import os
+import re
+import time
+import random
+import sqlite3
+from local_db import get_connection
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Historical yield of SERPER queries, kept per site: operator and per query template
+# (the query with its quoted identifiers blanked out), shared by all workers. Counts fade
+# with a half-life, so a bad week does not outweigh everything a site did before or after.
+QUERY_YIELD_DB = "query_yield.db"
+QUERY_YIELD_PRIOR = 0.5  # hit rate assumed for a site or template we have never tried
+QUERY_YIELD_PRIOR_WEIGHT = 2  # how many observations the prior is worth
+QUERY_YIELD_HALF_LIFE = float(os.environ.get("QUERY_YIELD_HALF_LIFE", 7 * 24 * 3600))  # seconds; 0 never fades
+
+# Platforms tried at least MIN_ATTEMPTS times with a hit rate below MIN_RATE are pruned
+# from the query generators: "deprioritize" moves them last, "drop" removes them, "off"
+# keeps them. Each generator call still keeps a pruned platform with probability
+# EXPLORE_RATE, so a site that recovers can prove itself again.
+QUERY_YIELD_PRUNE_MODE = os.environ.get("QUERY_YIELD_PRUNE_MODE", "deprioritize")
+QUERY_YIELD_MIN_RATE = float(os.environ.get("QUERY_YIELD_MIN_RATE", 0.05))
+QUERY_YIELD_MIN_ATTEMPTS = int(os.environ.get("QUERY_YIELD_MIN_ATTEMPTS", 20))
+QUERY_YIELD_EXPLORE_RATE = float(os.environ.get("QUERY_YIELD_EXPLORE_RATE", 0.1))
+_COUNTERS = ("attempts", "hits", "results", "profiles", "emails", "phones")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS yields (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    results INTEGER NOT NULL DEFAULT 0,
+    profiles INTEGER NOT NULL DEFAULT 0,
+    emails INTEGER NOT NULL DEFAULT 0,
+    phones INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+_initialized_pid = None
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(QUERY_YIELD_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def _tokens(query):
+    return re.findall(r'"[^"]*"|\S+', (query or "").strip().lower())
+
+
+def query_site(query):
+    """The site: target of a query ('' for an open web query)"""
+    sites = sorted(t[5:] for t in _tokens(query) if t.startswith("site:"))
+    return " ".join(sites)
+
+
+def query_template(query):
+    """
+    The shape of a query with identifiers removed, so '"seth d." reviews site:yelp.com'
+    and '"617-555-1234" reviews site:reddit.com' share the template '"*" reviews'.
+    """
+    terms = ['"*"' if t.startswith('"') else t for t in _tokens(query) if not t.startswith("site:")]
+    return " ".join(terms)
+
+
+def _keys(query):
+    return (("site", query_site(query)), ("template", query_template(query)))
+
+
+def _decay(age):
+    """Weight left on counts last updated `age` seconds ago"""
+    if QUERY_YIELD_HALF_LIFE <= 0:
+        return 1.0
+    return 0.5 ** (max(0.0, age) / QUERY_YIELD_HALF_LIFE)
+
+
+def _decayed(row, now=None):
+    """A stored row's counters faded to now ({} for a site never tried)"""
+    if row is None:
+        return {}
+    weight = _decay((now or time.time()) - row["updated_at"])
+    return {name: row[name] * weight for name in _COUNTERS if name in row.keys()}
+
+
+def record_query_yield(query, results, profiles=0, emails=0, phones=0):
+    """
+    Count one query SERPER actually answered, whether it returned anything, and the evidence
+    it produced. Callers skip queries that failed; test mode never reaches SERPER, so its
+    empty answers are not counted either.
+    """
+    if os.environ.get("CONTROLL_TEST_MODE"):
+        return
+    count = len(results or [])
+    observed = {"attempts": 1, "hits": 1 if count else 0, "results": count,
+                "profiles": profiles, "emails": emails, "phones": phones}
+    now = time.time()
+    try:
+        conn = _db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for kind, key in _keys(query):
+                row = conn.execute(
+                    "SELECT * FROM yields WHERE kind = ? AND key = ?", (kind, key)
+                ).fetchone()
+                previous = _decayed(row, now)
+                values = [previous.get(name, 0) + observed[name] for name in _COUNTERS]
+                conn.execute(
+                    "INSERT OR REPLACE INTO yields (kind, key, attempts, hits, results, profiles, emails, phones, "
+                    "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, key, *values, now)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Query yield update failed: {e}")
+
+
+def _smoothed(row, now=None):
+    counts = _decayed(row, now)
+    attempts, hits = counts.get("attempts", 0), counts.get("hits", 0)
+    return (hits + QUERY_YIELD_PRIOR * QUERY_YIELD_PRIOR_WEIGHT) / (attempts + QUERY_YIELD_PRIOR_WEIGHT)
+
+
+def expected_yields(queries):
+    """
+    Estimated hit probability for each query: the mean of its site's and its
+    template's smoothed historical hit rates. Unknown sites start at the prior.
+    """
+    rows = {}
+    try:
+        conn = _db()
+        for row in conn.execute("SELECT kind, key, attempts, hits, updated_at FROM yields"):
+            rows[(row["kind"], row["key"])] = row
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Query yield lookup failed: {e}")
+
+    now = time.time()
+    estimates = {}
+    for q in queries:
+        site_key, template_key = _keys(q)
+        estimates[q] = (_smoothed(rows.get(site_key), now) + _smoothed(rows.get(template_key), now)) / 2
+    return estimates
+
+
+def rank_queries(queries):
+    """Queries ordered by expected yield, best first; ties keep generator order"""
+    estimates = expected_yields(queries)
+    # Fading makes equal histories differ in the last digits; those still count as ties
+    return sorted(queries, key=lambda q: -round(estimates[q], 3))
+
+
+def _is_dead(row, min_rate, min_attempts, now=None):
+    counts = _decayed(row, now)
+    attempts = counts.get("attempts", 0)
+    return attempts >= min_attempts and counts["hits"] / attempts < min_rate
+
+
+def prune_platforms(platforms, mode=None, min_rate=None, min_attempts=None, explore_rate=None):
+    """
+    Filter a generator's platform list ("site:reddit.com", "reviews site:facebook.com", ...)
+    by recorded yield. Sites without enough recent attempts are always kept so they can
+    prove themselves, and a pruned site is kept anyway with probability explore_rate.
+    """
+    mode = mode or QUERY_YIELD_PRUNE_MODE
+    min_rate = QUERY_YIELD_MIN_RATE if min_rate is None else min_rate
+    min_attempts = QUERY_YIELD_MIN_ATTEMPTS if min_attempts is None else min_attempts
+    explore_rate = QUERY_YIELD_EXPLORE_RATE if explore_rate is None else explore_rate
+    if mode == "off":
+        return list(platforms)
+
+    try:
+        rows = {row["key"]: row for row in _db().execute(
+            "SELECT key, attempts, hits, updated_at FROM yields WHERE kind = 'site'"
+        )}
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Query yield lookup failed, keeping all platforms: {e}")
+        return list(platforms)
+
+    now = time.time()
+    live, dead = [], []
+    for platform in platforms:
+        if _is_dead(rows.get(query_site(platform)), min_rate, min_attempts, now) and random.random() >= explore_rate:
+            dead.append(platform)
+        else:
+            live.append(platform)
+    if dead:
+        logger.info(f"✂️ {'Dropping' if mode == 'drop' else 'Deprioritizing'} {len(dead)} low-yield platforms: {dead}")
+    return live if mode == "drop" else live + dead
+
+
+def get_yield_stats():
+    """Hit rates and evidence counts per site and template, for diagnostics"""
+    try:
+        rows = _db().execute(
+            "SELECT kind, key, attempts, hits, results, profiles, emails, phones, updated_at "
+            "FROM yields ORDER BY kind, attempts DESC"
+        ).fetchall()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+
+    stats = {
+        "prune_mode": QUERY_YIELD_PRUNE_MODE,
+        "min_rate": QUERY_YIELD_MIN_RATE,
+        "min_attempts": QUERY_YIELD_MIN_ATTEMPTS,
+        "half_life": QUERY_YIELD_HALF_LIFE,
+        "explore_rate": QUERY_YIELD_EXPLORE_RATE,
+        "site": {},
+        "template": {}
+    }
+    now = time.time()
+    for row in rows:
+        counts = _decayed(row, now)
+        attempts = counts["attempts"]
+        entry = {name: round(value, 2) for name, value in counts.items()}
+        entry.update({
+            "hit_rate": round(counts["hits"] / attempts, 3) if attempts else 0.0,
+            "evidence_rate": round((counts["profiles"] + counts["emails"] + counts["phones"]) / attempts, 3) if attempts else 0.0,
+            "pruned": row["kind"] == "site" and _is_dead(row, QUERY_YIELD_MIN_RATE, QUERY_YIELD_MIN_ATTEMPTS, now)
+        })
+        stats.setdefault(row["kind"], {})[row["key"] or "(open web)"] = entry
+    return stats
@@ -0,0 +1,191 @@
+import os
+import time
+import sqlite3
+from email.utils import parsedate_to_datetime
+from local_db import get_connection
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Token buckets shared by every gunicorn worker, one per upstream we call.
+# Each rate can be tuned with RATE_LIMIT_<NAME>_RPS / RATE_LIMIT_<NAME>_BURST.
+RATE_LIMIT_DB = "rate_limits.db"
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_MAX_WAIT = float(os.environ.get("RATE_LIMIT_MAX_WAIT", 30))  # seconds a caller will queue
+RATE_LIMIT_MIN_FACTOR = 0.1  # never slow an upstream below 10% of its configured rate
+RATE_LIMIT_RECOVERY = 0.1  # rate factor regained per successful call
+RATE_LIMIT_DEFAULT_PENALTY = 2.0  # pause after a 429 without Retry-After
+
+DEFAULT_LIMITS = {
+    "serper": (5.0, 10),
+    "puppeteer": (1.0, 3),
+    "scraper": (1.0, 3),
+    "yelp": (0.5, 2),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    rate_factor REAL NOT NULL DEFAULT 1.0
+);
+"""
+
+_initialized_pid = None
+
+
+class RateLimitTimeout(Exception):
+    """Raised when an upstream stays saturated for longer than the caller is willing to wait"""
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(RATE_LIMIT_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def get_limits(name):
+    """Return (requests per second, burst size) for an upstream"""
+    rate, burst = DEFAULT_LIMITS.get(name, (2.0, 4))
+    rate = float(os.environ.get(f"RATE_LIMIT_{name.upper()}_RPS", rate))
+    burst = float(os.environ.get(f"RATE_LIMIT_{name.upper()}_BURST", burst))
+    return rate, burst
+
+
+def _take_token(conn, name, now):
+    """
+    Refill and try to take one token inside a write transaction.
+    Returns 0 if a token was taken, otherwise the seconds to wait before retrying.
+    """
+    rate, burst = get_limits(name)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT tokens, updated_at, blocked_until, rate_factor FROM buckets WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            tokens, blocked_until, factor = burst, 0.0, 1.0
+        else:
+            factor = row["rate_factor"]
+            blocked_until = row["blocked_until"]
+            tokens = min(burst, row["tokens"] + (now - row["updated_at"]) * rate * factor)
+
+        if now < blocked_until:
+            wait = blocked_until - now
+        elif tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / (rate * factor)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets (name, tokens, updated_at, blocked_until, rate_factor) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, tokens, now, blocked_until, factor)
+        )
+        conn.execute("COMMIT")
+        return wait
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def acquire(name, max_wait=None):
+    """
+    Block until the named upstream has capacity.
+    Returns True once a token is taken, False if that would take longer than max_wait.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return True
+
+    max_wait = RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+    give_up_at = time.time() + max_wait
+    while True:
+        now = time.time()
+        try:
+            wait = _take_token(_db(), name, now)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Rate limiter unavailable for {name}, not pacing: {e}")
+            return True
+
+        if wait <= 0:
+            return True
+        if now + wait > give_up_at:
+            return False
+        time.sleep(min(wait, 1.0))
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) into seconds from now"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def report(name, status_code, retry_after=None):
+    """
+    Feed an upstream response back into its bucket.
+    429 and 5xx halve the effective rate (and 429/Retry-After pauses the bucket);
+    successes gradually restore it.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+
+    throttled = status_code == 429 or status_code >= 500
+    now = time.time()
+    try:
+        conn = _db()
+        row = conn.execute("SELECT rate_factor FROM buckets WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return
+
+        if throttled:
+            pause = retry_after
+            if pause is None and status_code == 429:
+                pause = RATE_LIMIT_DEFAULT_PENALTY
+            conn.execute(
+                "UPDATE buckets SET rate_factor = MAX(?, rate_factor * 0.5), "
+                "blocked_until = MAX(blocked_until, ?) WHERE name = ?",
+                (RATE_LIMIT_MIN_FACTOR, now + (pause or 0), name)
+            )
+            logger.warning(f"🐢 {name} returned {status_code}; slowing down" + (f" for {pause:.1f}s" if pause else ""))
+        elif row["rate_factor"] < 1.0:
+            conn.execute(
+                "UPDATE buckets SET rate_factor = MIN(1.0, rate_factor + ?) WHERE name = ?",
+                (RATE_LIMIT_RECOVERY, name)
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Rate limiter report failed for {name}: {e}")
+
+
+def get_limiter_state():
+    """Current bucket levels and slowdown factors, for diagnostics"""
+    try:
+        rows = _db().execute("SELECT * FROM buckets").fetchall()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    now = time.time()
+    state = {}
+    for row in rows:
+        rate, burst = get_limits(row["name"])
+        state[row["name"]] = {
+            "rate_per_second": rate,
+            "burst": burst,
+            "rate_factor": round(row["rate_factor"], 3),
+            "tokens": round(min(burst, row["tokens"] + (now - row["updated_at"]) * rate * row["rate_factor"]), 2),
+            "blocked_for": round(max(0.0, row["blocked_until"] - now), 2)
+        }
+    return state
@@ -1,3 +1,7 @@
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
 def analyze_full_review_block(review_block):
     lines = review_block.strip().split('\n')
     results = []
@@ -52,7 +56,7 @@ def save_review_to_fingerprint(alias, review_text):
     with open("review_fingerprints.json", "w") as f:
         json.dump(fingerprints, f, indent=2)
 
-    print(f"🧠 Fingerprint sample saved for {alias}")
+    logger.debug("🧠 Fingerprint sample saved for %s", alias)
 
 def analyze_review_text(text):
     """Analyze review text for tone, risk indicators, and patterns"""
@@ -100,12 +104,12 @@ def analyze_review_text(text):
     if stylometric_trigger_found:
         risk_score += 15
         risk_score = min(risk_score, 100)
-        print("🧠 Stylometric trigger phrase detected. Risk score increased.")
+        logger.info("🧠 Stylometric trigger phrase detected. Risk score increased.")
         
         # PATCH 3: Boost if multiple triggers hit
         if len(stylometric_triggers_found) >= 2:
             risk_score += 10
-            print("🔥 Stylometric pattern match: Negative reviewer language")
+            logger.info("🔥 Stylometric pattern match: Negative reviewer language")
 
     # Determine tone
     if negative_count > positive_count:
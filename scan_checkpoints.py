@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import contextvars
+from contextlib import contextmanager
+from local_db import get_connection
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Per-scan progress records. While a scan runs under scan_checkpoint(), every SERPER query
+# and scrape it completes is saved; if the scan dies (worker timeout, deploy, cold start)
+# the retry replays those answers from the checkpoint instead of spending quota and time
+# again, rebuilding the same evidence, and only does the work that was still missing.
+SCAN_CHECKPOINT_DB = "scan_checkpoints.db"
+SCAN_CHECKPOINT_ENABLED = os.environ.get("SCAN_CHECKPOINT_ENABLED", "1") != "0"
+SCAN_CHECKPOINT_TTL = float(os.environ.get("SCAN_CHECKPOINT_TTL", 6 * 3600))  # seconds an unfinished scan stays resumable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS steps (
+    scan_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (scan_id, kind, key)
+);
+CREATE INDEX IF NOT EXISTS steps_saved_at ON steps (saved_at);
+"""
+
+_current = contextvars.ContextVar("controll_scan_checkpoint", default=None)
+_initialized_pid = None
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(SCAN_CHECKPOINT_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def scan_id_for(kind, *identifiers):
+    """Stable id for a scan, so a retry with the same inputs finds the same checkpoint"""
+    raw = json.dumps([kind] + [(i or "").strip().lower() for i in identifiers])
+    return f"{kind}:{hashlib.sha1(raw.encode()).hexdigest()[:16]}"
+
+
+class ScanCheckpoint:
+    def __init__(self, scan_id):
+        self.scan_id = scan_id
+        self.completed = False
+        self.resumed_steps = 0
+
+    def load(self, kind, key):
+        """The saved value of a finished step, or None"""
+        try:
+            row = _db().execute(
+                "SELECT value FROM steps WHERE scan_id = ? AND kind = ? AND key = ? AND saved_at >= ?",
+                (self.scan_id, kind, key, time.time() - SCAN_CHECKPOINT_TTL)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Checkpoint read failed: {e}")
+            return None
+        return json.loads(row["value"]) if row else None
+
+    def save(self, kind, key, value):
+        try:
+            _db().execute(
+                "INSERT OR REPLACE INTO steps (scan_id, kind, key, value, saved_at) VALUES (?, ?, ?, ?, ?)",
+                (self.scan_id, kind, key, json.dumps(value, default=str), time.time())
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Checkpoint write failed: {e}")
+
+    def step_counts(self):
+        try:
+            rows = _db().execute(
+                "SELECT kind, COUNT(*) AS n FROM steps WHERE scan_id = ? AND saved_at >= ? GROUP BY kind",
+                (self.scan_id, time.time() - SCAN_CHECKPOINT_TTL)
+            ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {row["kind"]: row["n"] for row in rows}
+
+    def complete(self):
+        """Mark the scan finished; its checkpoint is dropped when the block exits"""
+        self.completed = True
+
+    def clear(self):
+        try:
+            _db().execute("DELETE FROM steps WHERE scan_id = ?", (self.scan_id,))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Checkpoint cleanup failed: {e}")
+
+
+def current_checkpoint():
+    """The checkpoint of the scan running in this context, or None"""
+    return _current.get()
+
+
+def _purge_expired():
+    try:
+        _db().execute("DELETE FROM steps WHERE saved_at < ?", (time.time() - SCAN_CHECKPOINT_TTL,))
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Checkpoint purge failed: {e}")
+
+
+@contextmanager
+def scan_checkpoint(scan_id):
+    """
+    Run the enclosed scan with checkpointing. Call complete() on the yielded checkpoint
+    once the scan has everything it needs; otherwise its steps are kept for the retry.
+    Inside another scan's checkpoint the outer one is reused, like nested deadlines.
+    """
+    outer = _current.get()
+    if outer is not None or not SCAN_CHECKPOINT_ENABLED:
+        yield outer or ScanCheckpoint(scan_id)
+        return
+
+    _purge_expired()
+    checkpoint = ScanCheckpoint(scan_id)
+    counts = checkpoint.step_counts()
+    if counts:
+        logger.info(f"♻️ Resuming scan {scan_id} from checkpoint: {counts}")
+    token = _current.set(checkpoint)
+    try:
+        yield checkpoint
+    finally:
+        _current.reset(token)
+        if checkpoint.resumed_steps:
+            logger.info(f"♻️ Scan {scan_id} reused {checkpoint.resumed_steps} checkpointed steps")
+        if checkpoint.completed:
+            checkpoint.clear()
+
+
+def recall_step(kind, key, decode=None):
+    """The step an earlier attempt of the current scan saved, or None"""
+    checkpoint = _current.get()
+    if checkpoint is None:
+        return None
+    saved = checkpoint.load(kind, key)
+    if saved is None:
+        return None
+    checkpoint.resumed_steps += 1
+    return decode(saved) if decode else saved
+
+
+def keep_step(kind, key, value, encode=None):
+    """Save a computed step to the current scan's checkpoint, if it has one"""
+    checkpoint = _current.get()
+    if checkpoint is not None:
+        checkpoint.save(kind, key, encode(value) if encode else value)
+
+
+def checkpointed(kind, key, compute, encode=None, decode=None):
+    """
+    compute() once per scan: inside a checkpointed scan a step saved by an earlier
+    attempt is returned from the checkpoint, and a newly computed one is saved.
+    Steps that raise are not saved, so the retry tries them again.
+    """
+    if _current.get() is None:
+        return compute()
+
+    saved = recall_step(kind, key, decode)
+    if saved is not None:
+        return saved
+
+    value = compute()
+    keep_step(kind, key, value, encode)
+    return value
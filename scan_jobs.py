@@ -0,0 +1,341 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from local_db import get_connection
+from scan_logging import get_scan_logger, scan_debug, setup_logging
+
+logger = get_scan_logger(__name__)
+
+# Durable queue for long scans. The web app enqueues a job and answers with its id at once;
+# scan workers claim jobs from the SQLite file and write progress back, so web latency does
+# not depend on running scans. By default the workers are threads inside the web process.
+# A separate `python scan_jobs.py` process only sees the jobs when it shares the web
+# process's CONTROLL_DB_DIR; set SCAN_EXTERNAL_WORKERS=1 on the web process to rely on it.
+SCAN_JOBS_DB = "scan_jobs.db"
+SCAN_WORKERS = int(os.environ.get("SCAN_WORKERS", 4))  # scan threads per worker process
+SCAN_EXTERNAL_WORKERS = os.environ.get("SCAN_EXTERNAL_WORKERS", "0").lower() in ("1", "true", "yes")
+SCAN_JOB_POLL = float(os.environ.get("SCAN_JOB_POLL", 1.0))  # seconds between checks of an empty queue
+SCAN_JOB_HEARTBEAT = float(os.environ.get("SCAN_JOB_HEARTBEAT", 5))
+SCAN_JOB_STALE_AFTER = float(os.environ.get("SCAN_JOB_STALE_AFTER", 60))  # silent running jobs are requeued
+SCAN_JOB_MAX_ATTEMPTS = int(os.environ.get("SCAN_JOB_MAX_ATTEMPTS", 2))
+SCAN_JOB_RETENTION = float(os.environ.get("SCAN_JOB_RETENTION", 7 * 24 * 3600))  # finished jobs kept this long
+# Scan threads inside the web process: none when external workers run the queue
+SCAN_EMBEDDED_WORKERS = int(os.environ.get("SCAN_EMBEDDED_WORKERS", 0 if SCAN_EXTERNAL_WORKERS else SCAN_WORKERS))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    partial TEXT,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+_initialized_pid = None
+_handlers = {}
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(SCAN_JOBS_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def job_handler(kind):
+    """Register fn(payload, progress) as the runner for jobs of this kind"""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def enqueue_job(kind, payload):
+    """Queue a scan and return its job id"""
+    job_id = uuid.uuid4().hex
+    _db().execute(
+        "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+        (job_id, kind, json.dumps(payload), time.time())
+    )
+    logger.info(f"📥 Queued {kind} job {job_id}")
+    return job_id
+
+
+def _load(text):
+    return json.loads(text) if text else None
+
+
+def get_job(job_id):
+    """Status, partial results, final result and timings of a job, or None if unknown"""
+    try:
+        row = _db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Job lookup failed: {e}")
+        return None
+    if row is None:
+        return None
+
+    now = time.time()
+    started, finished = row["started_at"], row["finished_at"]
+    return {
+        "id": row["id"],
+        "kind": row["kind"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "payload": _load(row["payload"]),
+        "partial": _load(row["partial"]),
+        "result": _load(row["result"]),
+        "error": row["error"],
+        "timings": {
+            "created_at": row["created_at"],
+            "started_at": started,
+            "finished_at": finished,
+            "queued_seconds": round((started or now) - row["created_at"], 3),
+            "run_seconds": round((finished or now) - started, 3) if started else None
+        }
+    }
+
+
+def _requeue_stale(conn, now):
+    """Jobs whose worker stopped heartbeating (crash, deploy, timeout) go back to the queue or fail"""
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error = 'Worker lost; attempts exhausted', finished_at = ? "
+        "WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?",
+        (now, now - SCAN_JOB_STALE_AFTER, SCAN_JOB_MAX_ATTEMPTS)
+    )
+    conn.execute(
+        "UPDATE jobs SET status = 'queued', worker = NULL "
+        "WHERE status = 'running' AND heartbeat_at < ?",
+        (now - SCAN_JOB_STALE_AFTER,)
+    )
+
+
+def claim_job(worker):
+    """Atomically take the oldest queued job for this worker; returns (id, kind, payload) or None"""
+    conn = _db()
+    now = time.time()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _requeue_stale(conn, now)
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                    "started_at = COALESCE(started_at, ?), heartbeat_at = ? WHERE id = ?",
+                    (worker, now, now, row["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Job claim failed: {e}")
+        return None
+    return (row["id"], row["kind"], _load(row["payload"])) if row else None
+
+
+def heartbeat(job_id, partial=None):
+    """Mark a job as alive, optionally saving its partial results"""
+    try:
+        if partial is None:
+            _db().execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+        else:
+            _db().execute(
+                "UPDATE jobs SET heartbeat_at = ?, partial = ? WHERE id = ?",
+                (time.time(), json.dumps(partial, default=str), job_id)
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Job heartbeat failed for {job_id}: {e}")
+
+
+def finish_job(job_id, result=None, error=None):
+    status = "failed" if error else "done"
+    _db().execute(
+        "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, heartbeat_at = ? WHERE id = ?",
+        (status, json.dumps(result, default=str) if result is not None else None, error,
+         time.time(), time.time(), job_id)
+    )
+
+
+def purge_finished_jobs():
+    """Drop finished jobs older than SCAN_JOB_RETENTION"""
+    try:
+        _db().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (time.time() - SCAN_JOB_RETENTION,)
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Job purge failed: {e}")
+
+
+def get_job_stats():
+    """Job counts per status, for diagnostics"""
+    try:
+        rows = _db().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    return {row["status"]: row["n"] for row in rows}
+
+
+class JobProgress:
+    """
+    Partial results of a running job. Scans call update() as they go; the snapshot
+    is written with the next heartbeat so progress never costs a write per event.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._partial = {}
+        self._dirty = False
+
+    def update(self, **fields):
+        with self._lock:
+            self._partial.update(fields)
+            self._dirty = True
+
+    def append(self, field, value):
+        with self._lock:
+            self._partial.setdefault(field, []).append(value)
+            self._dirty = True
+
+    def flush(self):
+        with self._lock:
+            partial = dict(self._partial) if self._dirty else None
+            self._dirty = False
+        heartbeat(self.job_id, partial)
+
+
+def _run_job(job_id, kind, payload):
+    handler = _handlers.get(kind)
+    if handler is None:
+        finish_job(job_id, error=f"Unknown job kind: {kind}")
+        return
+
+    progress = JobProgress(job_id)
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(SCAN_JOB_HEARTBEAT):
+            progress.flush()
+
+    threading.Thread(target=beat, name=f"job-heartbeat-{job_id[:8]}", daemon=True).start()
+    started = time.time()
+    try:
+        with scan_debug(payload.get("debug")):
+            result = handler(payload, progress)
+        stop.set()
+        progress.flush()
+        finish_job(job_id, result=result)
+        logger.info(f"✅ Job {job_id} ({kind}) done in {time.time() - started:.1f}s")
+    except Exception as e:
+        stop.set()
+        progress.flush()
+        logger.exception(f"❌ Job {job_id} ({kind}) failed: {e}")
+        finish_job(job_id, error=str(e))
+
+
+def worker_loop(name, stop=None):
+    """Claim and run jobs until stop is set"""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        job = claim_job(name)
+        if job is None:
+            stop.wait(SCAN_JOB_POLL)
+            continue
+        _run_job(*job)
+
+
+def check_job_workers():
+    """
+    Refuse to serve a queue nobody reads: the web process needs embedded workers, or
+    external ones sharing an explicitly configured CONTROLL_DB_DIR. Raises RuntimeError.
+    """
+    if SCAN_EMBEDDED_WORKERS > 0:
+        return
+    if not SCAN_EXTERNAL_WORKERS:
+        raise RuntimeError(
+            "No scan workers: set SCAN_EMBEDDED_WORKERS > 0, or run `python scan_jobs.py` "
+            "and set SCAN_EXTERNAL_WORKERS=1 with a shared CONTROLL_DB_DIR"
+        )
+    if not os.environ.get("CONTROLL_DB_DIR"):
+        raise RuntimeError(
+            "SCAN_EXTERNAL_WORKERS=1 needs CONTROLL_DB_DIR set to a directory the web and "
+            "worker processes both mount; otherwise queued jobs are never run"
+        )
+
+
+def start_workers(count, prefix="scan-worker"):
+    """Start `count` daemon scan threads in this process; returns the event that stops them"""
+    stop = threading.Event()
+    for i in range(count):
+        name = f"{prefix}-{os.getpid()}-{i}"
+        threading.Thread(target=worker_loop, args=(name, stop), name=name, daemon=True).start()
+    logger.info(f"👷 Started {count} scan workers")
+    return stop
+
+
+@job_handler("alias_scan")
+def _run_alias_scan(payload, progress):
+    from mri_scanner import run_enhanced_mri_scan, rate_mri_results
+
+    def on_event(event):
+        kind = event["type"]
+        if kind == "query_finished":
+            progress.append("queries_finished", event["query"])
+        elif kind == "profile_found":
+            progress.append("profiles", event["url"])
+        elif kind in ("email_found", "phone_found"):
+            progress.append(kind.replace("_found", "s"), event["value"])
+        elif kind == "scrape_done":
+            progress.append("urls_scraped", event["url"])
+        progress.update(last_event=kind)
+
+    results = run_enhanced_mri_scan(
+        payload["handle"], deadline=payload.get("deadline"), location=payload.get("location", ""), on_event=on_event
+    )
+    return rate_mri_results(results)
+
+
+@job_handler("guest_scan")
+def _run_guest_scan(payload, progress):
+    from search_utils import run_full_guest_search, run_incremental_guest_search
+    progress.update(stage="searching")
+    if payload.get("incremental"):
+        return run_incremental_guest_search(
+            payload.get("name"), email=payload.get("email"), phone=payload.get("phone"),
+            freshness=payload.get("freshness"), verbose=payload.get("verbose", False),
+            deadline=payload.get("deadline")
+        )
+    return run_full_guest_search(
+        payload.get("name"), email=payload.get("email"), phone=payload.get("phone"),
+        verbose=payload.get("verbose", False), deadline=payload.get("deadline")
+    )
+
+
+if __name__ == "__main__":
+    setup_logging()
+    logger.info(f"🏭 Scan worker process {os.getpid()} running {SCAN_WORKERS} threads")
+    purge_finished_jobs()
+    start_workers(SCAN_WORKERS)
+    while True:
+        time.sleep(3600)
+        purge_finished_jobs()
@@ -0,0 +1,132 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+# Scan, search and storage modules log through one non-blocking queue: the thread doing
+# the scan only enqueues the record, and a listener thread formats and writes it. Detail
+# such as every query and result is logged at DEBUG, which is off unless SCAN_LOG_LEVEL
+# asks for it or a single request turns it on with scan_debug(). Entry points (the web
+# app, the scan worker) call setup_logging(); importing a scan module configures nothing.
+SCAN_LOG_LEVEL = os.environ.get("SCAN_LOG_LEVEL", "INFO").upper()
+SCAN_LOG_QUEUE_SIZE = int(os.environ.get("SCAN_LOG_QUEUE_SIZE", 10000))  # records beyond this are dropped
+SCAN_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_debug = contextvars.ContextVar("controll_scan_debug", default=False)
+_lock = threading.Lock()
+_listener = None
+_listener_pid = None
+
+
+def _configured_level():
+    level = logging.getLevelName(SCAN_LOG_LEVEL)
+    return level if isinstance(level, int) else logging.INFO
+
+
+class ScanLogger(logging.Logger):
+    """
+    Logger whose level check also passes while the current request is being debugged, so
+    a DEBUG call costs one context lookup, and builds no record, for every other request
+    """
+
+    def isEnabledFor(self, level):
+        return super().isEnabledFor(level) or (_debug.get() and not self.disabled)
+
+
+class _RequestLevelFilter(logging.Filter):
+    """Pass records at the configured level, and every record of a request being debugged"""
+
+    def __init__(self, level):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record):
+        return record.levelno >= self.level or _debug.get()
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Never makes the logging thread wait: when the listener falls behind, records are dropped"""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            type(self).dropped += 1
+
+
+def setup_logging():
+    """Route the root logger through the queue (once per process; safe to call again)"""
+    global _listener, _listener_pid
+    with _lock:
+        if _listener_pid == os.getpid():
+            return
+        level = _configured_level()
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter(SCAN_LOG_FORMAT))
+        records = queue.Queue(SCAN_LOG_QUEUE_SIZE)
+        handler = _NonBlockingQueueHandler(records)
+        handler.addFilter(_RequestLevelFilter(level))
+
+        root = logging.getLogger()
+        for old in list(root.handlers):
+            root.removeHandler(old)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(records, stream, respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+        atexit.register(_listener.stop)
+
+
+def get_scan_logger(name):
+    """Logger for a scan, search or storage module, at SCAN_LOG_LEVEL plus per-request DEBUG"""
+    with _lock:
+        logger_class = logging.getLoggerClass()
+        logging.setLoggerClass(ScanLogger)
+        try:
+            logger = logging.getLogger(name)
+        finally:
+            logging.setLoggerClass(logger_class)
+    logger.setLevel(_configured_level())
+    return logger
+
+
+def scan_debug_enabled():
+    return _debug.get()
+
+
+def set_scan_debug(enabled):
+    """Turn per-request DEBUG logging on or off in this context; returns a token for reset_scan_debug"""
+    return _debug.set(bool(enabled))
+
+
+def reset_scan_debug(token):
+    _debug.reset(token)
+
+
+@contextmanager
+def scan_debug(enabled=True):
+    """Log DEBUG detail for everything run inside this block (and the threads it hands work to)"""
+    token = set_scan_debug(enabled)
+    try:
+        yield
+    finally:
+        reset_scan_debug(token)
+
+
+def get_logging_stats():
+    """Queue depth and dropped records, for diagnostics"""
+    return {
+        "level": SCAN_LOG_LEVEL,
+        "queued": _listener.queue.qsize() if _listener else 0,
+        "dropped": _NonBlockingQueueHandler.dropped
+    }
@@ -0,0 +1,119 @@
+import os
+import heapq
+import itertools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from url_utils import canonicalize_url
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+SCRAPE_DUPLICATE_PENALTY = 0.3  # score factor for a page whose snippet matches an already claimed page
+SCRAPE_EARLY_MIN_SCORE = float(os.environ.get("SCRAPE_EARLY_MIN_SCORE", 1.0))  # weaker pages wait for the search to end
+
+
+class ScrapePipeline:
+    """
+    Scrapes URLs as soon as a scan discovers them instead of after every query has finished.
+    At most `limit` URLs are scraped per scan, however many queries offer them; a URL offered
+    twice (in any equivalent form) is scraped once. Scrapes run on `workers` threads in the
+    offering caller's context, so they share its scan deadline.
+
+    With a `score(url, record)` function, offered URLs wait in a priority queue and each free
+    worker takes the best one, so the limited slots go to the most promising pages rather
+    than the first ones found. Pages repeating a claimed page's snippet are pushed down.
+    """
+
+    def __init__(self, scrape, limit, workers, score=None, fingerprint=None):
+        self._scrape = scrape
+        self._limit = limit
+        self._workers = workers
+        self._score = score
+        self._fingerprint = fingerprint
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mri-scrape")
+        self._lock = threading.RLock()
+        self._claimed = []  # (url, future) in the order URLs were accepted
+        self._seen = set()
+        self._pending = []  # heap of (-score, seq, url, fingerprint, penalized, context)
+        self._sequence = itertools.count()
+        self._fingerprints = set()
+        self._running = 0
+        self._draining = False
+        self._closed = False
+
+    def offer(self, url, record=None):
+        """Queue url for scraping unless it was already taken or the scan's cap is reached"""
+        key = canonicalize_url(url)
+        with self._lock:
+            if not key or key in self._seen or len(self._claimed) >= self._limit:
+                return False
+            self._seen.add(key)
+            score = self._score(url, record) if self._score else 0.0
+            fingerprint = self._fingerprint(record) if self._fingerprint else None
+            heapq.heappush(
+                self._pending,
+                (-score, next(self._sequence), url, fingerprint, False, contextvars.copy_context())
+            )
+            self._dispatch()
+        return True
+
+    def offer_all(self, urls):
+        for url in urls:
+            if self.full():
+                break
+            self.offer(url)
+
+    def offer_records(self, records):
+        """Offer SERPER records, letting the scorer see their title and snippet"""
+        for record in records:
+            if self.full():
+                break
+            self.offer(record.link, record)
+
+    def _dispatch(self):
+        # Called with the lock held. While searching, only free workers take a URL, and only
+        # a promising one, so better candidates found later still compete for the slots.
+        while not self._closed and self._pending and len(self._claimed) < self._limit and (
+            self._draining or self._running < self._workers
+        ):
+            if not self._draining and self._score and -self._pending[0][0] < SCRAPE_EARLY_MIN_SCORE:
+                break
+            neg_score, _, url, fingerprint, penalized, context = heapq.heappop(self._pending)
+            if fingerprint and fingerprint in self._fingerprints and not penalized:
+                heapq.heappush(
+                    self._pending,
+                    (neg_score * SCRAPE_DUPLICATE_PENALTY, next(self._sequence), url, fingerprint, True, context)
+                )
+                continue
+            if fingerprint:
+                self._fingerprints.add(fingerprint)
+            future = self._pool.submit(context.run, self._scrape, url)
+            self._claimed.append((url, future))
+            self._running += 1
+            logger.debug("🧪 [%s/%s] Scraping URL (score %.2f): %s", len(self._claimed), self._limit, -neg_score, url)
+            future.add_done_callback(self._on_done)
+
+    def _on_done(self, _future):
+        with self._lock:
+            self._running -= 1
+            self._dispatch()
+
+    def full(self):
+        with self._lock:
+            return len(self._claimed) >= self._limit
+
+    def claimed(self):
+        """
+        (url, future) pairs in the order the scrapes were started. Call once every URL has
+        been offered: the best waiting URLs are given the remaining slots first.
+        """
+        with self._lock:
+            self._draining = True
+            self._dispatch()
+            return list(self._claimed)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,135 @@
+import os
+import re
+import time
+import sqlite3
+from local_db import get_connection
+from url_utils import classify_url
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Expected contact-info yield of a candidate URL, used to hand out a scan's few scrape
+# slots. Combines what kind of page it is, whether its snippet is about the handle, and
+# how often scrapes of its domain have found an email or phone before.
+SCRAPE_YIELD_DB = "scrape_yield.db"
+SCRAPE_YIELD_PRIOR = 0.3  # success rate assumed for a domain we have never scraped
+SCRAPE_YIELD_PRIOR_WEIGHT = 3
+SCRAPE_HANDLE_MATCH_BONUS = 2.0
+SCRAPE_CONTACT_SNIPPET_BONUS = 2.0  # the snippet already shows an email or phone
+# People-search pages are usually generic listings: they rank below profiles and only
+# climb when their snippet shows the handle or contact data
+SCRAPE_KIND_WEIGHTS = {"profile": 2.0, "target": 1.0, "people_search": 0.8, "other": 0.4}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_yields (
+    domain TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    contacts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+"""
+
+_initialized_pid = None
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(SCRAPE_YIELD_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def record_scrape_yield(url, scraped):
+    """Count one scrape of url; it succeeded if it found an email or phone (None = failed)"""
+    domain = classify_url(url).domain
+    if not domain:
+        return
+    contacts = len((scraped or {}).get("emails", [])) + len((scraped or {}).get("phones", []))
+    try:
+        _db().execute(
+            "INSERT INTO scrape_yields (domain, attempts, successes, contacts, updated_at) VALUES (?, 1, ?, ?, ?) "
+            "ON CONFLICT(domain) DO UPDATE SET attempts = attempts + 1, successes = successes + excluded.successes, "
+            "contacts = contacts + excluded.contacts, updated_at = excluded.updated_at",
+            (domain, 1 if contacts else 0, contacts, time.time())
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Scrape yield update failed: {e}")
+
+
+def domain_success_rates():
+    """Smoothed share of scrapes per domain that found contact info"""
+    try:
+        rows = _db().execute("SELECT domain, attempts, successes FROM scrape_yields").fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Scrape yield lookup failed: {e}")
+        return {}
+    return {
+        row["domain"]: (row["successes"] + SCRAPE_YIELD_PRIOR * SCRAPE_YIELD_PRIOR_WEIGHT)
+        / (row["attempts"] + SCRAPE_YIELD_PRIOR_WEIGHT)
+        for row in rows
+    }
+
+
+_CONTACT_IN_TEXT = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+|\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+
+
+def _handle_terms(handle):
+    return [t for t in re.findall(r"[a-z0-9]+", (handle or "").lower()) if len(t) >= 2]
+
+
+def _page_kind(kind):
+    if kind.is_people_search:
+        return "people_search"
+    if kind.is_profile:
+        return "profile"
+    return "target" if kind.is_target else "other"
+
+
+def score_candidate(url, record=None, handle_terms=(), rates=None):
+    """Expected value of scraping url; higher is better"""
+    kind = classify_url(url)
+    score = SCRAPE_KIND_WEIGHTS[_page_kind(kind)]
+    score *= 0.5 + (rates or {}).get(kind.domain, SCRAPE_YIELD_PRIOR)
+    if record is not None:
+        text = record.text.lower()
+        if handle_terms and all(term in text for term in handle_terms):
+            score *= SCRAPE_HANDLE_MATCH_BONUS
+        if _CONTACT_IN_TEXT.search(text):
+            score *= SCRAPE_CONTACT_SNIPPET_BONUS
+    return score
+
+
+def scrape_scorer(handle):
+    """score(url, record) for one scan, with the domain history read once"""
+    terms = _handle_terms(handle)
+    rates = domain_success_rates()
+    return lambda url, record=None: score_candidate(url, record, terms, rates)
+
+
+def content_fingerprint(record):
+    """Normalized snippet text, so pages showing the same content are recognized as duplicates"""
+    if record is None or not record.snippet:
+        return None
+    return " ".join(re.findall(r"[a-z0-9]+", record.snippet.lower()))[:200] or None
+
+
+def get_scrape_yield_stats():
+    """Scrape attempts and success rates per domain, for diagnostics"""
+    try:
+        rows = _db().execute(
+            "SELECT domain, attempts, successes, contacts FROM scrape_yields ORDER BY attempts DESC"
+        ).fetchall()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    return {
+        row["domain"]: {
+            "attempts": row["attempts"],
+            "successes": row["successes"],
+            "contacts": row["contacts"],
+            "success_rate": round(row["successes"] / row["attempts"], 3) if row["attempts"] else 0.0
+        }
+        for row in rows
+    }
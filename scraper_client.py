@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import threading
+from typing import NamedTuple, Optional
+
+import http_client
+from deadline import time_left
+from url_utils import classify_url
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# One client for every page fetch. Backends:
+#   puppeteer - the Render headless-browser service (renders JavaScript, can return page text)
+#   scraper   - the Render Cheerio scraper (static HTML)
+#   direct    - a plain GET from this worker
+# All of them go through http_client's pooled session and upstream rate limits; this module
+# adds per-site concurrency, a response size cap, deadline-aware timeouts and one result type.
+SCRAPE_PUPPETEER_URL = os.environ.get("PUPPETEER_ENDPOINT", "https://controll-puppeteer.onrender.com/scrape")
+SCRAPE_SCRAPER_URL = os.environ.get("SCRAPER_ENDPOINT", "https://controll-scraper.onrender.com/scrape")
+SCRAPE_MAX_BYTES = int(os.environ.get("SCRAPE_MAX_BYTES", 2 * 1024 * 1024))  # larger pages are truncated
+SCRAPE_HOST_CONCURRENCY = int(os.environ.get("SCRAPE_HOST_CONCURRENCY", 2))  # scrapes of one site at a time, per process
+SCRAPE_PUPPETEER_WAIT_MS = int(os.environ.get("SCRAPE_PUPPETEER_WAIT_MS", 2000))
+SCRAPE_CHUNK_SIZE = 64 * 1024
+
+# Seconds per backend; each can be tuned with SCRAPE_<BACKEND>_TIMEOUT
+DEFAULT_TIMEOUTS = {"puppeteer": 10.0, "scraper": 10.0, "direct": 15.0}
+# Sites fetched directly that have their own rate-limit bucket
+DIRECT_UPSTREAMS = {"yelp.com": "yelp"}
+DIRECT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+_backends = {}
+_host_slots = {}
+_host_lock = threading.Lock()
+
+
+class ScrapeResult(NamedTuple):
+    url: str
+    backend: str
+    ok: bool
+    status: int  # HTTP status from the backend; 0 if it never answered
+    text: str  # page text or HTML, '' on failure
+    truncated: bool  # the page was cut at SCRAPE_MAX_BYTES
+    elapsed: float
+    error: Optional[str]
+
+
+class ScrapeTooLarge(Exception):
+    """A backend's JSON envelope exceeded SCRAPE_MAX_BYTES, so it cannot be parsed"""
+
+
+def scrape_backend(name):
+    """Register fn(url, timeout, **options) -> (status, text, truncated) as a scrape backend"""
+    def register(fn):
+        _backends[name] = fn
+        return fn
+    return register
+
+
+def scrape_timeout(backend):
+    """The timeout a scrape on this backend gets now: its configured value, cut to the scan's time left"""
+    default = DEFAULT_TIMEOUTS.get(backend, 10.0)
+    return time_left(float(os.environ.get(f"SCRAPE_{backend.upper()}_TIMEOUT", default)))
+
+
+def _slots_for(host):
+    with _host_lock:
+        slots = _host_slots.get(host)
+        if slots is None:
+            slots = _host_slots[host] = threading.BoundedSemaphore(SCRAPE_HOST_CONCURRENCY)
+        return slots
+
+
+def _read_capped(response, limit=None):
+    """Body of a streamed response, reading at most limit bytes; returns (bytes, truncated)"""
+    limit = limit or SCRAPE_MAX_BYTES
+    if response.raw is None:
+        # Replayed responses arrive fully loaded
+        body = response.content or b""
+        return body[:limit], len(body) > limit
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(SCRAPE_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                return b"".join(chunks)[:limit], True
+        return b"".join(chunks), False
+    finally:
+        response.close()
+
+
+def _decode(response, body):
+    return body.decode(response.encoding or "utf-8", errors="replace")
+
+
+def _read_envelope(response):
+    """Parsed JSON body of a Render backend, refusing envelopes over the size cap"""
+    body, truncated = _read_capped(response)
+    if truncated:
+        raise ScrapeTooLarge(f"Response larger than {SCRAPE_MAX_BYTES} bytes")
+    try:
+        return json.loads(body or b"{}")
+    except ValueError:
+        return {"content": _decode(response, body)}
+
+
+@scrape_backend("puppeteer")
+def _scrape_puppeteer(url, timeout, wait_for=None, extract_text=True):
+    response = http_client.post(SCRAPE_PUPPETEER_URL, json={
+        "url": url,
+        "waitFor": SCRAPE_PUPPETEER_WAIT_MS if wait_for is None else wait_for,
+        "extractText": extract_text
+    }, timeout=timeout, upstream="puppeteer", max_wait=timeout, stream=True)
+    if response.status_code != 200:
+        response.close()
+        return response.status_code, "", False
+    data = _read_envelope(response)
+    return response.status_code, data.get("content") or data.get("html") or "", False
+
+
+@scrape_backend("scraper")
+def _scrape_scraper(url, timeout):
+    response = http_client.post(
+        SCRAPE_SCRAPER_URL, json={"url": url}, timeout=timeout, upstream="scraper", max_wait=timeout, stream=True
+    )
+    if response.status_code != 200:
+        response.close()
+        return response.status_code, "", False
+    data = _read_envelope(response)
+    return response.status_code, data.get("html") or "", False
+
+
+@scrape_backend("direct")
+def _scrape_direct(url, timeout, headers=None):
+    upstream = DIRECT_UPSTREAMS.get(classify_url(url).domain, "direct")
+    response = http_client.get(
+        url, headers=dict(DIRECT_HEADERS, **(headers or {})), timeout=timeout,
+        upstream=upstream, max_wait=timeout, stream=True
+    )
+    if response.status_code != 200:
+        response.close()
+        return response.status_code, "", False
+    body, truncated = _read_capped(response)
+    return response.status_code, _decode(response, body), truncated
+
+
+def scrape(url, backend="puppeteer", timeout=None, **options):
+    """
+    Fetch a page through one of the registered backends. Never raises: failures come back
+    as a ScrapeResult with ok=False and the error. At most SCRAPE_HOST_CONCURRENCY scrapes
+    of the same site run at once in this process; a scrape that cannot get a slot before
+    its timeout fails as busy rather than piling more load on the site.
+    """
+    fetch = _backends.get(backend)
+    if fetch is None:
+        raise ValueError(f"Unknown scrape backend: {backend}")
+    timeout = scrape_timeout(backend) if timeout is None else timeout
+    started = time.monotonic()
+
+    def result(ok, status=0, text="", truncated=False, error=None):
+        return ScrapeResult(url, backend, ok, status, text, truncated, round(time.monotonic() - started, 3), error)
+
+    host = classify_url(url).domain
+    if not host:
+        return result(False, error="Not a web URL")
+    if timeout <= 0:
+        return result(False, error="No time left to scrape")
+    slots = _slots_for(host)
+    if not slots.acquire(timeout=timeout):
+        return result(False, error=f"{host} is busy; no scrape slot within {timeout:.1f}s")
+    try:
+        status, text, truncated = fetch(url, max(0.1, timeout - (time.monotonic() - started)), **options)
+    except Exception as e:
+        logger.warning(f"⚠️ {backend} scrape failed for {url}: {e}")
+        return result(False, error=str(e))
+    finally:
+        slots.release()
+
+    if status != 200:
+        return result(False, status, error=f"Failed to scrape: {status}")
+    if truncated:
+        logger.debug("✂️ Scraped page truncated at %s bytes: %s", SCRAPE_MAX_BYTES, url)
+    return result(True, status, text, truncated)
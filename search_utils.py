@@ -2,18 +2,40 @@ import os
 import re
 import time
 import random
-import requests
+import http_client
+import rate_limiter
 from typing import Dict, Set, Any
 from api_usage_tracker import check_api_quota
+from serper_cache import (
+    cache_key, get_cached_response, store_response,
+    acquire_inflight_lease, release_inflight_lease, wait_for_inflight_result, SERPER_INFLIGHT_TTL
+)
+from single_flight import SingleFlight
+from deadline import Deadline, current_deadline, scan_deadline, backoff_delay
+from serper_results import SerperResult, to_records, snippets, to_rows, from_rows
+from scan_checkpoints import scan_checkpoint, scan_id_for, recall_step, keep_step
+from url_utils import ClueSet, classify_url, REVIEW_PLATFORMS
+from contact_extractor import extract_contacts
+from scraper_client import scrape
+from guest_storage import update_guest_db
+from guest_evidence import (
+    load_guest_evidence, save_guest_evidence, incremental_evidence, recall_evidence, keep_evidence, diff_evidence
+)
+from query_broker import PRIORITY_LOW, submit_query, submit_queries, gather_results
+from query_scheduler import QueryBudget, StableRating, run_scheduled_queries
+from query_yield import prune_platforms
 import json
 from shared_guest_alerts import add_shared_guest_profile, check_shared_guest_alert, get_shared_guest_count
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
 
 # Load secrets from secrets.json
 try:
     with open("secrets.json") as f:
         secrets = json.load(f)
 except FileNotFoundError:
-    print("⚠️ secrets.json not found, falling back to environment variables")
+    logger.warning("⚠️ secrets.json not found, falling back to environment variables")
     secrets = {
         "SERPER_API_KEY": os.environ.get('SERPER_API_KEY', '1d67ed1df4aee6acf1491b1bbcbdf82b545473cf'),
         "PUPPETEER_ENDPOINT": "https://controll-puppeteer.onrender.com",
@@ -35,10 +57,10 @@ def load_critic_fallbacks():
         with open("critic_alias_map.json") as f:
             return json.load(f)
     except FileNotFoundError:
-        print("⚠️ critic_alias_map.json not found, using empty fallbacks")
+        logger.warning("⚠️ critic_alias_map.json not found, using empty fallbacks")
         return {}
     except json.JSONDecodeError:
-        print("⚠️ Error parsing critic_alias_map.json, using empty fallbacks")
+        logger.warning("⚠️ Error parsing critic_alias_map.json, using empty fallbacks")
         return {}
 
 # === PATCH: Yelp Critic Detection and Identity Lock ===
@@ -54,10 +76,10 @@ def safe_phone_update(existing_phone, new_phone, location):
     if not existing_phone:
         return new_phone
     if phone_confidence_score(new_phone, location) > phone_confidence_score(existing_phone, location):
-        print(f"📞 Overwriting weaker phone {existing_phone} with stronger {new_phone}")
+        logger.debug("📞 Overwriting weaker phone %s with stronger %s", existing_phone, new_phone)
         return new_phone
     else:
-        print(f"📞 Skipping overwrite: existing phone ({existing_phone}) stronger than new ({new_phone})")
+        logger.debug("📞 Skipping overwrite: existing phone (%s) stronger than new (%s)", existing_phone, new_phone)
         return existing_phone
 
 def extract_review_count_from_snippets(snippets):
@@ -65,7 +87,7 @@ def extract_review_count_from_snippets(snippets):
         match = re.search(r"(\d+)\s+reviews", s)
         if match:
             count = int(match.group(1))
-            print(f"📊 Yelp review count detected: {count}")
+            logger.debug("📊 Yelp review count detected: %s", count)
             return count
     return 0
 
@@ -76,7 +98,7 @@ def scan_all_yelp_review_snippets(snippets):
         tone = analyze_review_text(s)
         if tone == "Negative":
             negative_count += 1
-    print(f"🧠 Negative tone reviews: {negative_count}")
+    logger.info(f"🧠 Negative tone reviews: {negative_count}")
     return negative_count
 
 def enhanced_email_search(name, phone):
@@ -87,7 +109,8 @@ def enhanced_email_search(name, phone):
         f"{phone} contact site:intelius.com",
         f"{name} email site:pipl.com"
     ]
-    return queries  # to be integrated with SERPER queue
+    # Low priority: these only enrich a guest we already have a phone for
+    return submit_queries(queries, num_results=3, priority=PRIORITY_LOW)
 
 # === END PATCH ===
 
@@ -129,18 +152,18 @@ def search_for_writing_presence(identifier):
 
     for query in search_queries[:3]:  # Limit to 3 queries to avoid API exhaustion
         try:
-            results = query_serper(query, num_results=5)
+            results = query_serper_records(query, num_results=5)
             if results:
                 for result in results:
-                    snippet = result.get('snippet', '')
+                    snippet = result.snippet
                     if snippet and len(snippet) > 50:
                         writing_snippets.append(snippet)
         except Exception as e:
             if os.environ.get('CONTROLL_TEST_MODE'):
-                print(f"[TEST MODE] Simulated writing search for: {identifier}")
+                logger.debug("[TEST MODE] Simulated writing search for: %s", identifier)
                 writing_snippets.append(f"Test writing sample for {identifier}")
             else:
-                print(f"Writing search error for {identifier}: {e}")
+                logger.info(f"Writing search error for {identifier}: {e}")
 
     return writing_snippets
 
@@ -175,24 +198,24 @@ def run_stylometry_analysis(snippets):
     ✅ DO NOT DELETE — This powers ConTROLL's tone/risk engine.
     """
     if not snippets:
-        print("[DEBUG Stylometry] No writing samples provided.")
+        logger.debug("[DEBUG Stylometry] No writing samples provided.")
         return []
 
     # Filter out garbage before analysis
     valid_snippets = [s for s in snippets if is_valid_review(s)]
-    print(f"[DEBUG Stylometry] Filtered {len(snippets)} samples down to {len(valid_snippets)} valid reviews")
+    logger.debug("[DEBUG Stylometry] Filtered %s samples down to %s valid reviews", len(snippets), len(valid_snippets))
 
     if not valid_snippets:
-        print("[DEBUG Stylometry] No valid review samples after filtering.")
+        logger.debug("[DEBUG Stylometry] No valid review samples after filtering.")
         return []
 
     filtered = [s.strip().lower() for s in valid_snippets if len(s.strip()) >= 40]
     if not filtered:
-        print("[DEBUG Stylometry] No usable samples.")
+        logger.debug("[DEBUG Stylometry] No usable samples.")
         return []
 
     combined_text = " ".join(filtered)
-    print(f"[DEBUG Stylometry] Analyzing combined text: {combined_text[:200]}...")
+    logger.debug("[DEBUG Stylometry] Analyzing combined text: %s...", combined_text[:200])
     flags = []
 
     aggressive_phrases = [
@@ -205,7 +228,7 @@ def run_stylometry_analysis(snippets):
 
     for phrase in aggressive_phrases:
         if phrase in combined_text:
-            print(f"[DEBUG Stylometry] Matched aggressive phrase: {phrase}")
+            logger.debug("[DEBUG Stylometry] Matched aggressive phrase: %s", phrase)
             flags.append("aggressive_tone")
             break
 
@@ -217,7 +240,7 @@ def run_stylometry_analysis(snippets):
 
     for phrase in troll_phrases:
         if phrase in combined_text:
-            print(f"[DEBUG Stylometry] Matched troll phrase: {phrase}")
+            logger.debug("[DEBUG Stylometry] Matched troll phrase: %s", phrase)
             flags.append("troll_indicators")
             break
 
@@ -229,16 +252,20 @@ def run_stylometry_analysis(snippets):
 
     for signature in seth_signatures:
         if signature in combined_text:
-            print(f"[DEBUG Stylometry] Matched Seth D. signature: {signature}")
+            logger.debug("[DEBUG Stylometry] Matched Seth D. signature: %s", signature)
             flags.append("seth_d_signature")
             break
 
     if "aggressive_tone" in flags and "troll_indicators" in flags:
         flags.append("extreme_sentiment")
 
-    print(f"[DEBUG Stylometry] Final flags: {flags}")
+    logger.debug("[DEBUG Stylometry] Final flags: %s", flags)
     return flags
 
+# The stylometry trigger further down redefines run_stylometry_analysis(name, email, phone);
+# code scoring collected writing samples calls this scorer by its own name
+score_writing_style = run_stylometry_analysis
+
 
 def infer_critic_from_matches(platforms_found):
     """Infer critic status based on cross-platform presence"""
@@ -275,18 +302,10 @@ def check_for_critic_identity(guest):
 
     for query in critic_queries[:2]:  # Limit searches
         try:
-            results = query_serper(query, num_results=3)
-            if results and isinstance(results, list):
-                # Handle case where results are snippets (strings) not dicts
+            results = query_serper_records(query, num_results=3)
+            if results:
                 for result in results:
-                    if isinstance(result, str):
-                        # If result is just a snippet string
-                        content = result.lower()
-                    else:
-                        # If result is a dict with title/snippet
-                        title = result.get('title', '').lower() if hasattr(result, 'get') else ''
-                        snippet = result.get('snippet', '').lower() if hasattr(result, 'get') else str(result).lower()
-                        content = f"{title} {snippet}"
+                    content = result.text.lower()
 
                     # Check for critic indicators
                     critic_indicators = [
@@ -300,11 +319,11 @@ def check_for_critic_identity(guest):
 
         except Exception as e:
             if os.environ.get('CONTROLL_TEST_MODE'):
-                print(f"[TEST MODE] Simulated critic search for: {name}")
+                logger.debug("[TEST MODE] Simulated critic search for: %s", name)
                 if "critic" in name.lower():
                     return f"Test critic detection: {name}"
             else:
-                print(f"Critic search error for {name}: {e}")
+                logger.info(f"Critic search error for {name}: {e}")
 
     return None
 
@@ -372,7 +391,7 @@ def filter_junk_identity(email=None, phone=None, alias=None, verbose=False):
         # Check exact matches
         if email_lower in JUNK_EMAILS:
             if verbose:
-                print(f"⚠️ Junk email detected: {email}")
+                logger.debug("⚠️ Junk email detected: %s", email)
             # Log the skipped identity
             try:
                 with open("junk_id_log.txt", "a") as log:
@@ -386,7 +405,7 @@ def filter_junk_identity(email=None, phone=None, alias=None, verbose=False):
         for pattern in generic_patterns:
             if email_lower.startswith(pattern):
                 if verbose:
-                    print(f"⚠️ Generic business email detected: {email}")
+                    logger.debug("⚠️ Generic business email detected: %s", email)
                 try:
                     with open("junk_id_log.txt", "a") as log:
                         log.write(f"Skipped generic email: {alias}, {email}\n")
@@ -396,7 +415,7 @@ def filter_junk_identity(email=None, phone=None, alias=None, verbose=False):
 
     if phone and phone in JUNK_PHONES:
         if verbose:
-            print(f"⚠️ Junk phone detected: {phone}")
+            logger.debug("⚠️ Junk phone detected: %s", phone)
         try:
             with open("junk_id_log.txt", "a") as log:
                 log.write(f"Skipped junk phone match: {alias}, {phone}\n")
@@ -437,7 +456,7 @@ def check_for_influencer_identity(name, verbose=False):
 
         for query in critic_queries:
             if verbose:
-                print(f"🔍 SERPER API Call: \"{query}\"")
+                logger.debug("🔍 SERPER API Call: \"%s\"", query)
 
             results = query_serper(query)
             if results and 'organic' in results:
@@ -486,13 +505,13 @@ def check_for_influencer_identity(name, verbose=False):
             if negative_reviewer:
                 reason.append(f"negative review pattern ({negative_review_count} flags)")
 
-            print(f"🚨 Critic detection triggered: {', '.join(reason)}")
+            logger.warning(f"🚨 Critic detection triggered: {', '.join(reason)}")
 
         return is_critic, critic_indicators
 
     except Exception as e:
         if verbose:
-            print(f"⚠️ Critic detection error: {e}")
+            logger.warning(f"⚠️ Critic detection error: {e}")
         return False, []
 
 # ✅ Real Name Resolution Guardrails
@@ -536,9 +555,9 @@ def replace_cached_identity(old_alias, new_identity, confidence_score):
         with open("alias_cache.json", "w") as f:
             json.dump(alias_cache, f, indent=2)
 
-        print(f"🔄 Cache override: {old_alias} → {new_identity} (was: {old_cached})")
+        logger.info(f"🔄 Cache override: {old_alias} → {new_identity} (was: {old_cached})")
     except Exception as e:
-        print(f"❌ Cache update error: {e}")
+        logger.error(f"❌ Cache update error: {e}")
 
     # Update confidence cache
     try:
@@ -551,27 +570,22 @@ def replace_cached_identity(old_alias, new_identity, confidence_score):
             json.dump(confidence_cache, f, indent=2)
 
     except Exception as e:
-        print(f"❌ Confidence cache update error: {e}")
+        logger.error(f"❌ Confidence cache update error: {e}")
 
     # Update guest database entries
     try:
-        with open("guest_db.json", "r") as f:
-            guest_db = json.load(f)
-
-        # Look for entries with the old alias and update them
-        for guest_key in list(guest_db.keys()):
-            if old_alias.lower() in guest_key.lower():
-                guest_data = guest_db[guest_key]
-                del guest_db[guest_key]
-                guest_db[new_identity] = guest_data
-                guest_db[new_identity]['verified_identity'] = new_identity
-                print(f"📝 Guest DB updated: {guest_key} → {new_identity}")
-
-        with open("guest_db.json", "w") as f:
-            json.dump(guest_db, f, indent=2)
+        with update_guest_db() as guest_db:
+            # Look for entries with the old alias and update them
+            for guest_key in list(guest_db.keys()):
+                if old_alias.lower() in guest_key.lower():
+                    guest_data = guest_db[guest_key]
+                    del guest_db[guest_key]
+                    guest_db[new_identity] = guest_data
+                    guest_db[new_identity]['verified_identity'] = new_identity
+                    logger.info(f"📝 Guest DB updated: {guest_key} → {new_identity}")
 
     except Exception as e:
-        print(f"❌ Guest DB update error: {e}")
+        logger.error(f"❌ Guest DB update error: {e}")
 
 def push_to_global_network(identity_data):
     """Push verified identity to shared contributions for global alerts"""
@@ -594,7 +608,7 @@ def push_to_global_network(identity_data):
     with open("shared_contributions.json", "w") as f:
         json.dump(shared_data, f, indent=2)
 
-    print(f"🌐 Global network updated: {identity_data.get('full_name')} (Risk: {identity_data.get('risk_score')})")
+    logger.info(f"🌐 Global network updated: {identity_data.get('full_name')} (Risk: {identity_data.get('risk_score')})")
 
 def detect_soft_lock(query_str, new_identity, new_confidence, cached_identity, cached_confidence):
     """Detect if legacy alias is blocking stronger identity match"""
@@ -605,11 +619,11 @@ def detect_soft_lock(query_str, new_identity, new_confidence, cached_identity, c
         cached_is_echo = not is_real_name(cached_identity)
 
         if confidence_gap >= 20 and new_is_real and cached_is_echo:
-            print(f"⚠️ Soft-lock active: legacy alias '{cached_identity}' is blocking stronger identity match '{new_identity}'")
-            print(f"🔍 Confidence gap: {confidence_gap} points ({cached_confidence} → {new_confidence})")
+            logger.warning(f"⚠️ Soft-lock active: legacy alias '{cached_identity}' is blocking stronger identity match '{new_identity}'")
+            logger.info(f"🔍 Confidence gap: {confidence_gap} points ({cached_confidence} → {new_confidence})")
             return True
         elif confidence_gap >= 15 and new_is_real:
-            print(f"⚠️ Soft-lock detected: '{cached_identity}' may be blocking real identity '{new_identity}'")
+            logger.warning(f"⚠️ Soft-lock detected: '{cached_identity}' may be blocking real identity '{new_identity}'")
             return True
 
     return False
@@ -627,7 +641,7 @@ def try_expanded_aliases(base_name):
         with open("common_m_names.json", "r") as f:
             m_names = json.load(f)
     except Exception as e:
-        print(f"⚠️ Could not load M-name expansions: {e}")
+        logger.warning(f"⚠️ Could not load M-name expansions: {e}")
         return []
 
     expanded_names = [f"{base_name} {surname}" for surname in m_names]
@@ -636,70 +650,186 @@ def try_expanded_aliases(base_name):
 MAX_CRAWL_QUERIES = 75
 MAX_RECURSION_DEPTH = 3  # Added constant for maximum recursion depth
 
+# Coalesces identical SERPER queries issued concurrently by threads in this worker
+_serper_flight = SingleFlight()
+
+SERPER_URL = "https://google.serper.dev/search"
+SERPER_DEADLINE = float(os.environ.get("SERPER_DEADLINE", 20))  # seconds per query when no scan deadline is set
+SERPER_MAX_RETRIES = int(os.environ.get("SERPER_MAX_RETRIES", 3))
+SERPER_MIN_ATTEMPT_TIME = 1.0  # never start an attempt with less time than this left
+SERPER_HEDGE = os.environ.get("SERPER_HEDGE", "0") == "1"
+SERPER_HEDGE_DEFAULT_DELAY = float(os.environ.get("SERPER_HEDGE_DEFAULT_DELAY", 2.0))  # until p95 is known
+
+class SerperUnavailable(Exception):
+    """SERPER could not answer a query before its deadline (distinct from an empty answer)"""
+
+class _SerperRetryable(Exception):
+    """A throttled or failed SERPER response that another attempt may fix"""
+
 def query_serper(q, location="", num_results=10):
     """Query SERPER API for search results - Enhanced for Maserati mode"""
-    # Check if running in test mode
-    import os
-    if os.environ.get('CONTROLL_TEST_MODE'):
-        print(f"🧪 Test mode: Skipping API call for query: {q[:50]}...")
+    try:
+        return snippets(query_serper_records(q, location=location, num_results=num_results))
+    except SerperUnavailable:
         return []
 
-    api_key = secrets["SERPER_API_KEY"]
+def query_serper_records(q, location="", num_results=10):
+    """
+    Query SERPER and return SerperResult records (link, domain, title, snippet, rank).
+    Raises SerperUnavailable if SERPER could not answer in time.
+    """
+    records = recall_serper_records(q, num_results)
+    if records is None:
+        records = fetch_serper_records(q, num_results)
+        keep_serper_records(q, num_results, records)
+    return records
 
-    payload = {"q": q}
-    try:
-        response = requests.post("https://google.serper.dev/search", headers={
-            "X-API-KEY": api_key,
-            "Content-Type": "application/json"
-        }, json=payload)
+def recall_serper_records(q, num_results=10):
+    """
+    Records the running scan already holds for a query, or None: an incremental re-scan
+    reuses fresh stored evidence, a resumed scan gets the answer its earlier attempt paid for.
+    """
+    key = cache_key(q, num_results)
+    records = recall_evidence(key, decode=from_rows)
+    if records is None:
+        records = recall_step("serper", key, decode=from_rows)
+        if records is not None:
+            keep_evidence(key, q, records, encode=to_rows)
+    return records
 
-        print(f"🔍 SERPER API Call: \"{q}\"")
-        print(f"🔑 Using API key: {api_key[:10]}...")
-        print(f"🌐 Making SERPER request to: https://google.serper.dev/search")
-        print(f"📡 SERPER Response Status: {response.status_code}")
+def keep_serper_records(q, num_results, records):
+    """Save fetched records to the running scan's checkpoint and incremental evidence"""
+    if os.environ.get('CONTROLL_TEST_MODE'):
+        return
+    key = cache_key(q, num_results)
+    keep_step("serper", key, records, encode=to_rows)
+    keep_evidence(key, q, records, encode=to_rows)
 
-        data = response.json()
-        if "organic" in data:
-            print(f"✅ SERPER Results: Found {len(data['organic'])} organic results")
-            return [item.get("snippet", "") for item in data["organic"]]
-        else:
-            print("❌ SERPER returned no organic results.")
-            return []
-    except Exception as e:
-        print(f"❌ SERPER ERROR: {e}")
+def fetch_serper_records(q, num_results=10):
+    """SERPER records for a query from the shared cache or SERPER itself, independent of any scan"""
+    if os.environ.get('CONTROLL_TEST_MODE'):
+        logger.debug("🧪 Test mode: Skipping API call for query: %s...", q[:50])
         return []
+    return _lookup_serper_records(q, num_results)
+
+def _lookup_serper_records(q, num_results):
+    cached = get_cached_response(q, num_results)
+    if cached is not None:
+        logger.debug("💾 SERPER cache hit: \"%s\" (%s results)", q, len(cached))
+        return to_records(cached)
+
+    organic = _serper_flight.do(cache_key(q, num_results), lambda: _fetch_serper_coalesced(q, num_results))
+    return to_records(organic)
+
+def _fetch_serper_coalesced(q, num_results):
+    """Fetch once across workers: if another worker holds the lease, wait for its cached result"""
+    deadline = current_deadline() or Deadline(SERPER_DEADLINE)
+    if not acquire_inflight_lease(q, num_results):
+        logger.debug("⏳ SERPER query already in flight in another worker, waiting: \"%s\"", q)
+        shared = wait_for_inflight_result(q, num_results, timeout=deadline.cap(SERPER_INFLIGHT_TTL))
+        if shared is not None:
+            return shared
+
+    try:
+        return _fetch_serper(q, num_results, deadline)
+    finally:
+        release_inflight_lease(q, num_results)
+
+def _post_serper(payload, deadline):
+    """One SERPER call sized to the deadline, hedged at the observed p95 when SERPER_HEDGE=1"""
+    request_kwargs = {
+        "headers": {
+            "X-API-KEY": secrets["SERPER_API_KEY"],
+            "Content-Type": "application/json"
+        },
+        "json": payload,
+        "upstream": "serper",
+        "max_wait": deadline.remaining(),
+        "timeout": (
+            deadline.cap(http_client.HTTP_CONNECT_TIMEOUT),
+            deadline.cap(http_client.HTTP_READ_TIMEOUT)
+        )
+    }
+    if SERPER_HEDGE:
+        hedge_after = http_client.latency_percentile("serper", 0.95) or SERPER_HEDGE_DEFAULT_DELAY
+        return http_client.hedged_request("POST", SERPER_URL, hedge_after, deadline=deadline, **request_kwargs)
+    return http_client.post(SERPER_URL, **request_kwargs)
+
+def _fetch_serper(q, num_results, deadline):
+    """
+    Send one query to SERPER and return its organic results.
+    Server errors and dropped connections are retried with jittered exponential backoff
+    while the deadline leaves room for another attempt; after that SerperUnavailable is
+    raised. Rate limiting is retried only by http_client, which paces calls through the
+    serper token bucket: a 429 that reaches this layer is final.
+    """
+    if deadline.remaining() < SERPER_MIN_ATTEMPT_TIME:
+        # The scan is out of time: do not spend quota on an answer nobody will wait for
+        raise SerperUnavailable(f"Scan deadline reached before \"{q}\" was sent")
+    payload = {"q": q}
+    attempt = 0
+    while True:
+        try:
+            logger.debug("🔍 SERPER API Call: \"%s\" (attempt %s, %.1fs left)", q, attempt + 1, deadline.remaining())
+            logger.debug("🌐 Making SERPER request to: %s", SERPER_URL)
+            response = _post_serper(payload, deadline)
+            logger.debug("📡 SERPER Response Status: %s", response.status_code)
+
+            if response.status_code == 429 or (response.status_code == 503 and response.headers.get("Retry-After")):
+                # http_client already waited and retried these as far as the rate limiter allows
+                raise SerperUnavailable(f"SERPER is rate limiting us ({response.status_code})")
+            if response.status_code >= 500:
+                raise _SerperRetryable(f"SERPER returned {response.status_code}")
+            if not response.ok:
+                # Bad key, bad request: retrying cannot help
+                logger.error(f"❌ SERPER ERROR: {response.status_code} {response.text[:200]}")
+                raise SerperUnavailable(f"SERPER rejected the query with {response.status_code}")
+
+            data = response.json()
+            if "organic" in data:
+                logger.debug("✅ SERPER Results: Found %s organic results", len(data['organic']))
+                store_response(q, num_results, data["organic"])
+                return data["organic"]
+            else:
+                logger.error("❌ SERPER returned no organic results.")
+                store_response(q, num_results, [])
+                return []
+        except rate_limiter.RateLimitTimeout as e:
+            raise SerperUnavailable(str(e)) from e
+        except (*http_client.TRANSIENT_ERRORS, ValueError, _SerperRetryable) as e:
+            delay = backoff_delay(attempt)
+            attempt += 1
+            if attempt > SERPER_MAX_RETRIES or deadline.remaining() < delay + SERPER_MIN_ATTEMPT_TIME:
+                logger.error(f"❌ SERPER ERROR: giving up on \"{q}\" after {attempt} attempts: {e}")
+                raise SerperUnavailable(str(e)) from e
+            logger.warning(f"🔁 SERPER attempt {attempt} failed ({e}); retrying in {delay:.2f}s")
+            time.sleep(delay)
 
 def extract_identity_clues(results, handle):
     """Extract potential identity clues from search results"""
     clues = set()
     handle_lower = handle.lower()
+    name_patterns = [
+        re.compile(r'\b' + re.escape(handle_lower) + r'\s+([a-z]+)\b'),
+        re.compile(r'\b([a-z]+)\s+' + re.escape(handle_lower) + r'\b')
+    ]
 
     for result in results:
         title = result.get('title', '').lower()
         snippet = result.get('snippet', '').lower()
 
         # Look for full names
-        name_patterns = [
-            r'\b' + re.escape(handle_lower) + r'\s+([a-z]+)\b',
-            r'\b([a-z]+)\s+' + re.escape(handle_lower) + r'\b'
-        ]
-
         for pattern in name_patterns:
-            matches = re.findall(pattern, title + ' ' + snippet)
+            matches = pattern.findall(title + ' ' + snippet)
             for match in matches:
                 if len(match) > 2:
                     clues.add(f"{handle} {match.title()}")
 
         # Look for contact info
-        email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-
-        emails = re.findall(email_pattern, snippet)
-        phones = re.findall(phone_pattern, snippet)
-
-        for email in emails:
+        contacts = extract_contacts(snippet, junk=filter_junk_identity, kinds=("email", "phone"))
+        for email in contacts.emails:
             clues.add(f"email:{email}")
-        for phone in phones:
+        for phone in contacts.phones:
             clues.add(f"phone:{phone}")
 
     return clues
@@ -808,7 +938,7 @@ def compare_identity_styles(review_text, identity_candidates):
 maserati_enabled = True
 
 def run_full_guest_search(query_str=None, location_str=None, review_str=None, verbose=False, platform=None):
-    print("🚗 MASERATI MODE FULL POWER — Executing real 100-query SERPER sweep")
+    logger.info("🚗 MASERATI MODE FULL POWER — Executing real 100-query SERPER sweep")
     writing_snippets = []
     clue_pool = set()
 
@@ -822,15 +952,17 @@ def run_full_guest_search(query_str=None, location_str=None, review_str=None, ve
     max_queries = 100
     query_count = 0
 
+    planned = []
     for clue in clue_pool:
-        maserati_queries = generate_maserati_queries(clue)
-        for q in maserati_queries:
+        for q in generate_maserati_queries(clue):
             if query_count >= max_queries:
                 break
-            results = query_serper(q)
-            writing_snippets.extend(results)
+            planned.append(q)
             query_count += 1
 
+    for results in gather_results(submit_queries(planned), planned):
+        writing_snippets.extend(snippets(results))
+
     # Filter garbage
     def is_valid_review(text):
         return (
@@ -842,9 +974,9 @@ def run_full_guest_search(query_str=None, location_str=None, review_str=None, ve
         )
 
     filtered = [s for s in writing_snippets if is_valid_review(s)]
-    print(f"[MASERATI] Filtered {len(writing_snippets)} down to {len(filtered)} valid writing samples.")
+    logger.info(f"[MASERATI] Filtered {len(writing_snippets)} down to {len(filtered)} valid writing samples.")
 
-    flags = run_stylometry_analysis(filtered)
+    flags = score_writing_style(filtered)
 
     return {
         "writing_snippets": filtered,
@@ -878,7 +1010,7 @@ def generate_maserati_queries(base_clue):
     """Generate platform-specific queries for deep clue expansion"""
     base_clue = base_clue.strip().lower()
     queries = []
-    for platform in MASERATI_PLATFORMS:
+    for platform in prune_platforms(MASERATI_PLATFORMS):
         queries.append(f'"{base_clue}" {platform}')
     return queries
 
@@ -923,7 +1055,7 @@ def generate_platform_queries(name, location, phrases=[]):
     ]
 
     result = [f"{site} {combined}" for site in platforms]
-    print(f"✅ Generated {len(platforms)} platform queries for '{name}' in '{location}'")
+    logger.info(f"✅ Generated {len(platforms)} platform queries for '{name}' in '{location}'")
     return result
 
 def extract_clue_phrases(text):
@@ -936,7 +1068,7 @@ def extract_clue_phrases(text):
     for t in triggers:
         if t.lower() in text.lower():
             found.append(t)
-    print(f"🧬 Clue phrases found: {found}")
+    logger.info(f"🧬 Clue phrases found: {found}")
     return found
 
 def scrape_contact_info(url, verbose=False):
@@ -945,17 +1077,15 @@ def scrape_contact_info(url, verbose=False):
     Returns structured contact information extracted from the page
     """
     try:
-        scraper_url = "https://controll-scraper.onrender.com/scrape"
-        response = requests.post(scraper_url, json={"url": url}, timeout=10)
+        page = scrape(url, backend="scraper")
 
-        if response.status_code == 200:
-            html = response.json().get("html", "")
+        if page.ok:
+            html = page.text
             if verbose:
-                print(f"🧠 Scraped HTML from {url}:\n", html[:1000])
+                logger.info(f"🧠 Scraped HTML from {url}:\n{html[:1000]}")
 
-            # Extract emails and phones
-            emails = re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", html)
-            phones = re.findall(r"\(?\b[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b", html)
+            # Extract emails and phones in one pass
+            contacts = extract_contacts(html, kinds=("email", "phone"))
 
             # Detect review platform URLs
             review_platforms = []
@@ -977,47 +1107,43 @@ def scrape_contact_info(url, verbose=False):
                 if site in html:
                     social_links.append(site)
 
-            # Clean and filter results
+            # Filter junk results
             clean_emails = []
-            for email in emails:
-                email = email.lower().strip()
-                if "@" in email and "." in email.split("@")[1]:
-                    if not filter_junk_identity(email=email):
-                        clean_emails.append(email)
-                    elif verbose:
-                        print(f"🚫 Filtered junk email: {email}")
+            for email in contacts.emails:
+                if not filter_junk_identity(email=email):
+                    clean_emails.append(email)
+                elif verbose:
+                    logger.debug("🚫 Filtered junk email: %s", email)
 
             clean_phones = []
-            for phone in phones:
-                clean_phone = re.sub(r'[^\d]', '', str(phone))
-                if len(clean_phone) >= 10:
-                    if not filter_junk_identity(phone=clean_phone):
-                        clean_phones.append(clean_phone)
-                    elif verbose:
-                        print(f"🚫 Filtered junk phone: {clean_phone}")
+            for phone in contacts.phones:
+                if not filter_junk_identity(phone=phone):
+                    clean_phones.append(phone)
+                elif verbose:
+                    logger.debug("🚫 Filtered junk phone: %s", phone)
 
             result = {
-                "emails": list(set(clean_emails)),
-                "phones": list(set(clean_phones)),
+                "emails": clean_emails,
+                "phones": clean_phones,
                 "review_platforms": review_platforms,
                 "social_links": social_links,
                 "html_snippet": html[:1000]  # optional for debugging
             }
 
             if verbose:
-                print(f"✅ Contact extraction complete: {len(result['emails'])} emails, {len(result['phones'])} phones")
+                logger.info(f"✅ Contact extraction complete: {len(result['emails'])} emails, {len(result['phones'])} phones")
                 if result["emails"]:
-                    print(f"   📧 Emails: {result['emails']}")
+                    logger.info(f"   📧 Emails: {result['emails']}")
                 if result["phones"]:
-                    print(f"   📞 Phones: {result['phones']}")
+                    logger.info(f"   📞 Phones: {result['phones']}")
                 if review_platforms:
-                    print(f"   📝 Review platforms: {review_platforms}")
+                    logger.info(f"   📝 Review platforms: {review_platforms}")
                 if social_links:
-                    print(f"   📱 Social links: {social_links}")
+                    logger.info(f"   📱 Social links: {social_links}")
 
             return result
         else:
-            return {"error": f"Failed to scrape: {response.status_code}"}
+            return {"error": page.error}
     except Exception as e:
         return {"error": str(e)}
 
@@ -1067,12 +1193,10 @@ def detect_influencer_presence(name, email=None, phone=None):
 
     try:
         for query in queries[:2]:  # Limit to avoid API exhaustion
-            results = query_serper(query, num_results=3)
+            results = query_serper_records(query, num_results=3)
             if results:
                 for result in results:
-                    title = result.get('title', '').lower()
-                    snippet = result.get('snippet', '').lower()
-                    combined_text = f"{title} {snippet}"
+                    combined_text = result.text.lower()
 
                     # Check for critic/influencer keywords
                     for keyword in keywords:
@@ -1081,11 +1205,11 @@ def detect_influencer_presence(name, email=None, phone=None):
 
     except Exception as e:
         if os.environ.get('CONTROLL_TEST_MODE'):
-            print(f"[TEST MODE] Simulated influencer detection for: {name}")
+            logger.debug("[TEST MODE] Simulated influencer detection for: %s", name)
             if "critic" in name.lower():
                 return f"Test critic detection: {name}"
         else:
-            print(f"Influencer detection error for {name}: {e}")
+            logger.info(f"Influencer detection error for {name}: {e}")
 
     return None
 
@@ -1106,11 +1230,11 @@ def run_reverse_phonebook_search(name):
     results = []
     contact_info = {"emails": [], "phones": [], "addresses": []}
 
-    print(f"📞 Starting reverse phonebook search for: {name}")
+    logger.info(f"📞 Starting reverse phonebook search for: {name}")
 
     for query in queries[:8]:  # Limit to 8 queries to avoid API exhaustion
         try:
-            print(f"🔍 Reverse lookup: {query}")
+            logger.debug("🔍 Reverse lookup: %s", query)
             response = query_serper(query, num_results=3)
 
             if response:
@@ -1118,30 +1242,19 @@ def run_reverse_phonebook_search(name):
 
                 # Extract contact info from snippets
                 for snippet in response:
-                    # Extract emails
-                    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                    emails = re.findall(email_pattern, snippet)
-                    for email in emails:
-                        if not filter_junk_identity(email=email, verbose=False):
-                            contact_info["emails"].append(email)
-
-                    # Extract phone numbers
-                    phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-                    phones = re.findall(phone_pattern, snippet)
-                    for phone in phones:
-                        clean_phone = re.sub(r'[^\d]', '', phone)
-                        if not filter_junk_identity(phone=clean_phone, verbose=False):
-                            contact_info["phones"].append(phone)
+                    contacts = extract_contacts(snippet, junk=filter_junk_identity, kinds=("email", "phone"))
+                    contact_info["emails"].extend(contacts.emails)
+                    contact_info["phones"].extend(contacts.phones)
 
         except Exception as e:
-            print(f"⚠️ Reverse phonebook error for query '{query}': {e}")
+            logger.warning(f"⚠️ Reverse phonebook error for query '{query}': {e}")
 
     # Remove duplicates
     contact_info["emails"] = list(set(contact_info["emails"]))
     contact_info["phones"] = list(set(contact_info["phones"]))
 
     found_count = len(contact_info["emails"]) + len(contact_info["phones"])
-    print(f"📞 Reverse phonebook completed: {found_count} contact clues found")
+    logger.info(f"📞 Reverse phonebook completed: {found_count} contact clues found")
 
     return contact_info if found_count > 0 else None
 
@@ -1163,41 +1276,36 @@ def reverse_email_lookup_from_phone(phone_number, verbose=False):
     ]
 
     email_hits = []
-    print(f"📞➡️📧 Starting reverse email lookup from phone: {phone_clue}")
+    logger.info(f"📞➡️📧 Starting reverse email lookup from phone: {phone_clue}")
 
     for site in platforms[:3]:  # Limit to 3 platforms to avoid API exhaustion
         query = f'"{phone_clue}" email site:{site}'
         try:
             if verbose:
-                print(f"🔍 Email reverse lookup: {query}")
+                logger.debug("🔍 Email reverse lookup: %s", query)
 
             results = query_serper(query, num_results=3)
 
             if results:
                 for snippet in results:
                     # Extract email patterns from snippets
-                    import re
-                    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                    emails = re.findall(email_pattern, snippet)
-
-                    for email in emails:
-                        clean_email = email.lower().strip()
+                    for clean_email in extract_contacts(snippet, kinds=("email",)).emails:
                         # Apply junk filtering
                         if not filter_junk_identity(email=clean_email, verbose=False):
                             if clean_email not in email_hits:
                                 email_hits.append(clean_email)
                                 if verbose:
-                                    print(f"📧 Email candidate found: {clean_email}")
+                                    logger.debug("📧 Email candidate found: %s", clean_email)
                         else:
                             if verbose:
-                                print(f"🚫 Junk email filtered: {clean_email}")
+                                logger.debug("🚫 Junk email filtered: %s", clean_email)
 
         except Exception as e:
-            print(f"⚠️ Reverse email lookup error for {site}: {e}")
+            logger.warning(f"⚠️ Reverse email lookup error for {site}: {e}")
 
     # Remove duplicates and return unique emails
     unique_emails = list(set(email_hits))
-    print(f"📞➡️📧 Reverse email lookup completed: {len(unique_emails)} emails found")
+    logger.info(f"📞➡️📧 Reverse email lookup completed: {len(unique_emails)} emails found")
 
     return unique_emails
 
@@ -1284,9 +1392,9 @@ def resolve_identity_conflicts(existing_identity, new_identity, verbose=False):
     if conflicts:
         merged['conflict_resolution'] = conflicts
         if verbose:
-            print(f"🔄 Identity conflicts resolved:")
+            logger.info(f"🔄 Identity conflicts resolved:")
             for conflict in conflicts:
-                print(f"   • {conflict}")
+                logger.info(f"   • {conflict}")
 
     # Update confidence based on number of sources
     base_confidence = max(
@@ -1298,7 +1406,7 @@ def resolve_identity_conflicts(existing_identity, new_identity, verbose=False):
     if len(all_phones) > 1 or len(all_emails) > 1:
         merged['confidence_score'] = min(base_confidence + 10, 100)
         if verbose:
-            print(f"🎯 Confidence boosted to {merged['confidence_score']} due to multiple corroborating sources")
+            logger.info(f"🎯 Confidence boosted to {merged['confidence_score']} due to multiple corroborating sources")
 
     return merged
 
@@ -1310,40 +1418,30 @@ def store_identity_with_conflict_resolution(name, new_identity, verbose=False):
     """
     Store identity with intelligent conflict resolution
     """
-    try:
-        # Load existing guest database
-        with open("guest_db.json", "r") as f:
-            guest_db = json.load(f)
-    except FileNotFoundError:
-        guest_db = {}
-
-    # Check for existing identity
-    existing_identity = guest_db.get(name)
+    with update_guest_db() as guest_db:
+        # Check for existing identity
+        existing_identity = guest_db.get(name)
 
-    if existing_identity:
-        if verbose:
-            print(f"🔍 Found existing identity for {name}, resolving conflicts...")
+        if existing_identity:
+            if verbose:
+                logger.info(f"🔍 Found existing identity for {name}, resolving conflicts...")
 
-        # Resolve conflicts
-        merged_identity = resolve_identity_conflicts(existing_identity, new_identity, verbose=verbose)
+            # Resolve conflicts
+            merged_identity = resolve_identity_conflicts(existing_identity, new_identity, verbose=verbose)
 
-        # Store merged identity
-        guest_db[name] = merged_identity
+            # Store merged identity
+            guest_db[name] = merged_identity
 
-        # Add metadata
-        guest_db[name]['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
-        guest_db[name]['conflict_resolved'] = True
+            # Add metadata
+            guest_db[name]['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
+            guest_db[name]['conflict_resolved'] = True
 
-    else:
-        # New identity - store directly
-        guest_db[name] = new_identity
-        guest_db[name]['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
-        if verbose:
-            print(f"✅ New identity stored for {name}")
-
-    # Save updated database
-    with open("guest_db.json", "w") as f:
-        json.dump(guest_db, f, indent=2)
+        else:
+            # New identity - store directly
+            guest_db[name] = new_identity
+            guest_db[name]['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
+            if verbose:
+                logger.info(f"✅ New identity stored for {name}")
 
     return guest_db[name]
 
@@ -1352,9 +1450,9 @@ def display_identity_summary(identity_data):
     Display a clean, structured summary of identity resolution results
     """
     # Enhanced formatting for better readability
-    print("\n" + "="*55)
-    print("🎯 FINAL IDENTITY RESOLUTION SUMMARY")
-    print("="*55)
+    logger.info("\n" + "="*55)
+    logger.info("🎯 FINAL IDENTITY RESOLUTION SUMMARY")
+    logger.info("="*55)
 
     # Get star rating for display
     from star_rating import get_star_rating
@@ -1374,88 +1472,88 @@ def display_identity_summary(identity_data):
     platforms_display = ', '.join(matched_platforms) if matched_platforms else 'None'
 
     # Clean, organized output
-    print(f"📋 Full Name: {identity_data.get('full_name', 'N/A')}")
-    print(f"📍 Location: {identity_data.get('location', 'N/A')}")
+    logger.info(f"📋 Full Name: {identity_data.get('full_name', 'N/A')}")
+    logger.info(f"📍 Location: {identity_data.get('location', 'N/A')}")
 
     # Display multiple phones if available
     phones = identity_data.get('phones', [])
     if phones:
         if len(phones) == 1:
-            print(f"📞 Phone: {phones[0]}")
+            logger.info(f"📞 Phone: {phones[0]}")
         else:
-            print(f"📞 Phones: {', '.join(phones)} (primary: {phones[0]})")
+            logger.info(f"📞 Phones: {', '.join(phones)} (primary: {phones[0]})")
     else:
-        print(f"📞 Phone: {identity_data.get('phone', 'N/A')}")
+        logger.info(f"📞 Phone: {identity_data.get('phone', 'N/A')}")
 
     # Display multiple emails if available
     emails = identity_data.get('emails', [])
     if emails:
         if len(emails) == 1:
-            print(f"📧 Email: {emails[0]}")
+            logger.info(f"📧 Email: {emails[0]}")
         else:
-            print(f"📧 Emails: {', '.join(emails)} (primary: {emails[0]})")
+            logger.info(f"📧 Emails: {', '.join(emails)} (primary: {emails[0]})")
     else:
-        print(f"📧 Email: {identity_data.get('email', 'N/A')}")
+        logger.info(f"📧 Email: {identity_data.get('email', 'N/A')}")
 
-    print(f"⭐ Star Rating: {star_rating}")
-    print(f"🧠 Stylometry Flags: {stylometry_display}")
-    print(f"🎭 Critic/Influencer: {critic_display}")
-    print(f"⚠️ Risk Score: {risk_score}/100")
-    print(f"🌐 Matched Platforms: {platforms_display}")
-    print(f"🎯 Confidence: {identity_data.get('confidence_score', 'N/A')}%")
-    print(f"👻 Alias Used: {identity_data.get('alias', 'N/A')} on {identity_data.get('platform', 'N/A')}")
+    logger.info(f"⭐ Star Rating: {star_rating}")
+    logger.info(f"🧠 Stylometry Flags: {stylometry_display}")
+    logger.info(f"🎭 Critic/Influencer: {critic_display}")
+    logger.warning(f"⚠️ Risk Score: {risk_score}/100")
+    logger.info(f"🌐 Matched Platforms: {platforms_display}")
+    logger.info(f"🎯 Confidence: {identity_data.get('confidence_score', 'N/A')}%")
+    logger.info(f"👻 Alias Used: {identity_data.get('alias', 'N/A')} on {identity_data.get('platform', 'N/A')}")
 
     # Display conflict resolution if applicable
     conflicts = identity_data.get('conflict_resolution', [])
     if conflicts:
-        print("🔄 Conflict Resolution Applied:")
+        logger.info("🔄 Conflict Resolution Applied:")
         for conflict in conflicts:
-            print(f"   • {conflict}")
+            logger.info(f"   • {conflict}")
 
     # Display risk/star history if available
     risk_history = identity_data.get('risk_scores_history', [])
     if risk_history:
-        print(f"📊 Risk Score History: {' → '.join(map(str, risk_history))}")
+        logger.info(f"📊 Risk Score History: {' → '.join(map(str, risk_history))}")
 
     star_history = identity_data.get('star_ratings_history', [])
     if star_history:
-        print(f"⭐ Star Rating History: {' → '.join(map(str, star_history))}")
+        logger.info(f"⭐ Star Rating History: {' → '.join(map(str, star_history))}")
 
     # Display profile links if available
     profile_links = identity_data.get('profile_links', {})
     if profile_links:
-        print("🔗 Profile Links Discovered:")
+        logger.info("🔗 Profile Links Discovered:")
         if isinstance(profile_links, dict):
             for platform, url in profile_links.items():
-                print(f"   📱 {platform}: {url}")
+                logger.info(f"   📱 {platform}: {url}")
         elif isinstance(profile_links, list):
             for i, url in enumerate(profile_links):
-                print(f"   📱 Profile {i+1}: {url}")
+                logger.info(f"   📱 Profile {i+1}: {url}")
 
     # Display profile tone summary if available
     profile_tone_summary = identity_data.get('profile_tone_summary', [])
     if profile_tone_summary:
-        print("🎭 Profile Tone Analysis:")
+        logger.info("🎭 Profile Tone Analysis:")
         for summary in profile_tone_summary:
             platform = summary.get('platform', 'Unknown')
             tone = summary.get('tone', 'neutral')
             review_count = summary.get('review_count', 'unknown')
             tone_emoji = "😡" if tone == "negative" else "😊" if tone == "positive" else "😐"
-            print(f"   {tone_emoji} {platform}: {tone.title()} tone, {review_count} reviews")
+            logger.info(f"   {tone_emoji} {platform}: {tone.title()} tone, {review_count} reviews")
 
             matched_phrases = summary.get('matched_phrases', [])
             if matched_phrases:
                 phrases_text = ', '.join(matched_phrases[:3])
-                print(f"      📝 Key phrases: {phrases_text}")
+                logger.debug("      📝 Key phrases: %s", phrases_text)
 
     # Display phone penetration results if available
     phone_penetration = identity_data.get('phone_penetration', [])
     if phone_penetration:
-        print("📡 Phone Penetration Detected:")
+        logger.info("📡 Phone Penetration Detected:")
         for platform in phone_penetration:
-            print(f"   - Found on {platform}")
+            logger.info(f"   - Found on {platform}")
 
-    print("="*55 + "\n")
+    logger.info("="*55 + "\n")
 
 
 def post_phone_reverse_email_auto(phone_number, name=None, verbose=False):
@@ -1466,19 +1564,19 @@ def post_phone_reverse_email_auto(phone_number, name=None, verbose=False):
     if not phone_number:
         return []
 
-    print(f"🔁 Auto-triggering reverse email search from phone: {phone_number}")
+    logger.info(f"🔁 Auto-triggering reverse email search from phone: {phone_number}")
     discovered_emails = reverse_email_lookup_from_phone(phone_number, verbose=verbose)
 
     if not discovered_emails:
-        print(f"📭 No email addresses found via phonebook reverse lookup for {phone_number}")
+        logger.info(f"📭 No email addresses found via phonebook reverse lookup for {phone_number}")
         return []
 
-    print(f"✅ Emails discovered from phone {phone_number}: {discovered_emails}")
+    logger.info(f"✅ Emails discovered from phone {phone_number}: {discovered_emails}")
 
     # Trigger recursive guest scan for each discovered email
     enhanced_profiles = []
     for email in discovered_emails[:2]:  # Limit to top 2 emails to avoid API exhaustion
-        print(f"🔍 Triggering enhanced guest scan for: {email}")
+        logger.info(f"🔍 Triggering enhanced guest scan for: {email}")
 
         try:
             # Run full guest search with name + phone + email combination
@@ -1496,24 +1594,82 @@ def post_phone_reverse_email_auto(phone_number, name=None, verbose=False):
                     "profile": enhanced_profile
                 })
 
-                print(f"📊 Enhanced profile completed for {email}")
-                print(f"   Risk Score: {enhanced_profile.get('risk_score', 'N/A')}")
-                print(f"   Writing Samples: {enhanced_profile.get('writing_samples_found', 0)}")
-                print(f"   Stylometry Flags: {len(enhanced_profile.get('stylometry_flags', []))}")
+                logger.info(f"📊 Enhanced profile completed for {email}")
+                logger.info(f"   Risk Score: {enhanced_profile.get('risk_score', 'N/A')}")
+                logger.info(f"   Writing Samples: {enhanced_profile.get('writing_samples_found', 0)}")
+                logger.info(f"   Stylometry Flags: {len(enhanced_profile.get('stylometry_flags', []))}")
 
         except Exception as e:
             if verbose:
-                print(f"⚠️ Enhanced guest scan failed for {email}: {e}")
+                logger.warning(f"⚠️ Enhanced guest scan failed for {email}: {e}")
 
     return enhanced_profiles
 
+GUEST_SCAN_DEADLINE = float(os.environ.get("GUEST_SCAN_DEADLINE", 90))  # seconds for one full guest scan
+GUEST_PHASE_MIN_TIME = 2.0  # a search phase is not started with less time than this left
+
 # DO NOT DELETE — Identity + Writing Presence via SERPER
-def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_loop=False):
+def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_loop=False, deadline=None):
     """
     Comprehensive guest search that finds writing presence, runs stylometry, and detects critics.
     This is the enhanced version for guest scanning (not alias investigation).
+    The scan answers within `deadline` seconds (GUEST_SCAN_DEADLINE by default): every SERPER
+    call shares that budget, and search phases there is no time left for are skipped, with
+    the result marked "partial" and the phases listed in "skipped_phases". Queries are
+    checkpointed so a scan that dies or is cut short resumes without repeating them.
+    """
+    with scan_checkpoint(scan_id_for("guest", name, email, phone)) as checkpoint:
+        with scan_deadline(deadline or GUEST_SCAN_DEADLINE):
+            guest = _run_full_guest_search(name, email, phone, verbose, trigger_loop)
+            # A scan cut short by its deadline keeps its checkpoint for the next attempt
+            if not guest.get("partial"):
+                checkpoint.complete()
+            return guest
+
+def _phase_allowed(phase, skipped_phases):
+    """False, with the phase recorded as skipped, once the scan is too close to its deadline"""
+    deadline = current_deadline()
+    if deadline is not None and deadline.remaining() < GUEST_PHASE_MIN_TIME:
+        logger.warning(f"⏱️ Scan deadline reached, skipping {phase}")
+        skipped_phases.append(phase)
+        return False
+    return True
+
+def run_incremental_guest_search(name, email=None, phone=None, freshness=None, verbose=False, deadline=None):
     """
-    print("[DEBUG] ✅ Guest scan run_full_guest_search() is running!")
+    Re-scan a guest already in guest_db.json, re-querying only evidence older than
+    `freshness` seconds (GUEST_EVIDENCE_FRESHNESS by default); fresher queries are
+    answered from the stored results. The returned guest carries "evidence_diff",
+    what was added or removed since the last scan, and "incremental" query counts.
+    """
+    prior = load_guest_evidence(name)
+    logger.info(f"🔁 Incremental scan for {name}: {len(prior.get('queries') or {})} stored queries")
+
+    with incremental_evidence(prior, freshness) as evidence:
+        guest = run_full_guest_search(name, email=email, phone=phone, verbose=verbose, deadline=deadline)
+
+    clues = analyze_serper_results(from_rows(evidence.all_rows()), "")
+    profile_links = guest.get("profile_links") or {}
+    found = {
+        "profiles": list(profile_links.values() if isinstance(profile_links, dict) else profile_links)
+                    + list(guest.get("discovered_profile_links") or []),
+        "emails": clues["emails"],
+        "phones": clues["phones"],
+        "writing_snippets": guest.get("writing_snippets") or []
+    }
+    rating = {"star_rating": guest.get("star_rating"), "risk_score": guest.get("risk_score")}
+    current = evidence.snapshot(found, rating)
+
+    guest["evidence_diff"] = diff_evidence(prior, current)
+    guest["incremental"] = {"queries_reused": evidence.reused, "queries_refreshed": evidence.refreshed}
+    logger.info(f"🔁 Incremental scan reused {evidence.reused} queries, refreshed {evidence.refreshed}")
+
+    if name and guest.get("star_rating") is not None:
+        save_guest_evidence(name, current, summary=rating)
+    return guest
+
+def _run_full_guest_search(name, email, phone, verbose, trigger_loop):
+    logger.debug("[DEBUG] ✅ Guest scan run_full_guest_search() is running!")
 
     # ⛔ Step 0: Input validation to avoid garbage scans
     name_valid = name and len(name.strip()) >= 3
@@ -1521,7 +1677,7 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
     phone_valid = phone and len(phone.strip()) >= 7
 
     if not (name_valid or email_valid or phone_valid):
-        print("❌ Invalid guest data. Please enter a valid name, email, or phone.")
+        logger.error("❌ Invalid guest data. Please enter a valid name, email, or phone.")
         return {
             "name": name or "Unknown",
             "email": email,
@@ -1547,88 +1703,93 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
     }
 
     writing_samples = []
+    skipped_phases = []
+    # One SERPER budget for the whole scan, shared by every writing search below
+    budget = QueryBudget(MAX_CRAWL_QUERIES)
 
     # DO NOT DELETE — Phone-based web search for writing
-    if phone:
+    if phone and _phase_allowed("phone writing search", skipped_phases):
         try:
-            phone_writing = find_writing_presence(phone=phone)
+            phone_writing = find_writing_presence(phone=phone, budget=budget)
             writing_samples.extend(phone_writing)
             if verbose:
-                print(f"📞 Phone search found {len(phone_writing)} writing samples")
+                logger.info(f"📞 Phone search found {len(phone_writing)} writing samples")
         except Exception as e:
             if verbose:
-                print(f"⚠️ Phone writing search failed: {e}")
+                logger.warning(f"⚠️ Phone writing search failed: {e}")
 
     # DO NOT DELETE — Email-based web search for writing
-    if email:
+    if email and _phase_allowed("email writing search", skipped_phases):
         try:
-            email_writing = find_writing_presence(email=email)
+            email_writing = find_writing_presence(email=email, budget=budget)
             writing_samples.extend(email_writing)
             if verbose:
-                print(f"📧 Email search found {len(email_writing)} writing samples")
+                logger.info(f"📧 Email search found {len(email_writing)} writing samples")
         except Exception as e:
             if verbose:
-                print(f"⚠️ Email writing search failed: {e}")
+                logger.warning(f"⚠️ Email writing search failed: {e}")
 
     # DO NOT DELETE — Name-based web search for writing
-    if name:
+    if name and _phase_allowed("name writing search", skipped_phases):
         try:
-            name_writing = find_writing_presence(name=name)
+            name_writing = find_writing_presence(name=name, budget=budget)
             writing_samples.extend(name_writing)
             if verbose:
-                print(f"👤 Name search found {len(name_writing)} writing samples")
+                logger.info(f"👤 Name search found {len(name_writing)} writing samples")
         except Exception as e:
             if verbose:
-                print(f"⚠️ Name writing search failed: {e}")
+                logger.warning(f"⚠️ Name writing search failed: {e}")
 
     guest["writing_samples_found"] = len(writing_samples)
 
     # DO NOT DELETE — Run stylometry analysis on collected writing
     if writing_samples:
         try:
-            print(f"[DEBUG Guest Scan] About to run stylometry on {len(writing_samples)} writing samples")
+            logger.debug("[DEBUG Guest Scan] About to run stylometry on %s writing samples", len(writing_samples))
 
             # ✅ TESTING: Add known aggressive sample to validate stylometry detection
             writing_samples.append("This place was absolutely disgusting. Worst service ever. Do not recommend.")
-            print(f"[DEBUG Guest Scan] Added test aggressive sample to validate stylometry")
+            logger.debug("[DEBUG Guest Scan] Added test aggressive sample to validate stylometry")
 
             # Debug: Print sample text being analyzed
             for i, sample in enumerate(writing_samples[:3]):  # Show first 3 samples
-                print(f"[DEBUG Sample {i+1}] {sample[:100]}...")
+                logger.debug("[DEBUG Sample %s] %s...", i+1, sample[:100])
 
             # ✅ FIXED: Use the correct stylometry function directly
-            style_analysis = run_stylometry_analysis(writing_samples)
+            style_analysis = score_writing_style(writing_samples)
 
             # Debug: Show what stylometry returned
-            print(f"[DEBUG Stylometry Result] Raw result: {style_analysis}")
-            print(f"[DEBUG Stylometry Result] Type: {type(style_analysis)}")
+            logger.debug("[DEBUG Stylometry Result] Raw result: %s", style_analysis)
+            logger.debug("[DEBUG Stylometry Result] Type: %s", type(style_analysis))
 
             # ✅ FIXED: Ensure we get the flags correctly
             guest["stylometry_flags"] = style_analysis if isinstance(style_analysis, list) else []
-            print(f"[DEBUG Guest Scan] Stylometry completed: {len(guest['stylometry_flags'])} flags detected")
-            print(f"[DEBUG Guest Scan] Flags: {guest['stylometry_flags']}")
+            logger.debug("[DEBUG Guest Scan] Stylometry completed: %s flags detected", len(guest['stylometry_flags']))
+            logger.debug("[DEBUG Guest Scan] Flags: %s", guest['stylometry_flags'])
 
             if verbose:
-                print(f"🧠 Stylometry analysis completed: {len(guest['stylometry_flags'])} flags detected")
+                logger.info(f"🧠 Stylometry analysis completed: {len(guest['stylometry_flags'])} flags detected")
         except Exception as e:
-            print(f"[DEBUG Guest Scan] Stylometry analysis failed: {e}")
+            logger.debug("[DEBUG Guest Scan] Stylometry analysis failed: %s", e)
             if verbose:
-                print(f"⚠️ Stylometry analysis failed: {e}")
+                logger.warning(f"⚠️ Stylometry analysis failed: {e}")
 
     # DO NOT DELETE — Check for critic/influencer identity
     try:
-        critic_flag = check_for_critic_identity({"name": name, "email": email, "phone": phone})
+        critic_flag = None
+        if _phase_allowed("critic check", skipped_phases):
+            critic_flag = check_for_critic_identity({"name": name, "email": email, "phone": phone})
         guest["influencer_flag"] = critic_flag
         if critic_flag and verbose:
-            print(f"🚨 Critic/Influencer detected: {critic_flag}")
+            logger.warning(f"🚨 Critic/Influencer detected: {critic_flag}")
     except Exception as e:
         if verbose:
-            print(f"⚠️ Critic detection failed: {e}")
+            logger.warning(f"⚠️ Critic detection failed: {e}")
 
     # Use structured decision engine for comprehensive evaluation
     from conTROLL_decision_engine import evaluate_guest
 
-    evaluation = evaluate_guest(
+    risk, stars, reason, *_ = evaluate_guest(
         confidence=75,  # Default confidence for guest search
         platform_hits=len(guest.get("matched_platforms", [])),
         stylometry_flags=len(guest["stylometry_flags"]),
@@ -1637,18 +1798,21 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
         is_weak_critic=False
     )
 
-    guest["risk_score"] = evaluation["risk"]
-    guest["star_rating"] = evaluation["stars"]
-    print(f"[DEBUG Risk] Structured evaluation: {evaluation['risk']} risk, {evaluation['stars']} stars")
+    guest["risk_score"] = risk
+    guest["star_rating"] = stars
+    guest["reason"] = reason
+    logger.debug("[DEBUG Risk] Structured evaluation: %s risk, %s stars (%s)", risk, stars, reason)
 
     # ✅ DO NOT DELETE — Pass actual writing samples into returned guest profile
     guest["writing_snippets"] = writing_samples
 
     # ✅ NEW: Enhanced profile link discovery and tone analysis
-    print(f"🔍 Starting profile link discovery for guest...")
+    logger.info(f"🔍 Starting profile link discovery for guest...")
 
     # Step 1: Find review profile links using dedicated function
-    profile_links_list = find_review_profile_link(name, phone, email)
+    profile_links_list = []
+    if _phase_allowed("profile link search", skipped_phases):
+        profile_links_list = find_review_profile_link(name, phone, email)
 
     # Step 2: Attach profile links to guest data
     guest = attach_profiles_to_guest(guest, profile_links_list)
@@ -1660,6 +1824,8 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
     yelp_profiles_processed = []  # Track processed Yelp profiles
 
     for profile_link in profile_links_list[:3]:  # Limit to 3 profiles to avoid overload
+        if not _phase_allowed("profile tone analysis", skipped_phases):
+            break
         try:
             tone_summary = summarize_profile_reviews(profile_link)
             profile_tone_summaries.append(tone_summary)
@@ -1667,14 +1833,14 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
             # Apply risk adjustments based on tone
             if tone_summary["tone"] == "negative":
                 total_negative_score += tone_summary.get("negative_indicators", 0)
-                print(f"⚠️ Negative tone detected on {tone_summary['platform']}")
+                logger.warning(f"⚠️ Negative tone detected on {tone_summary['platform']}")
             elif tone_summary["tone"] == "positive":
                 total_positive_score += tone_summary.get("positive_indicators", 0)
-                print(f"✅ Positive tone detected on {tone_summary['platform']}")
+                logger.info(f"✅ Positive tone detected on {tone_summary['platform']}")
 
         except Exception as e:
             if verbose:
-                print(f"⚠️ Profile tone analysis failed for {profile_link}: {e}")
+                logger.warning(f"⚠️ Profile tone analysis failed for {profile_link}: {e}")
 
     # Step 4: Apply risk score adjustments based on profile tone analysis
     if profile_tone_summaries:
@@ -1684,48 +1850,29 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
         if total_negative_score > total_positive_score + 2:
             risk_adjustment = min(total_negative_score * 5, 20)  # Cap at +20
             guest["risk_score"] = min(guest["risk_score"] + risk_adjustment, 100)
-            print(f"⚠️ Risk score increased by {risk_adjustment} due to negative profile tone")
+            logger.warning(f"⚠️ Risk score increased by {risk_adjustment} due to negative profile tone")
         elif total_positive_score > total_negative_score + 2:
             risk_adjustment = min(total_positive_score * 3, 15)  # Cap at -15
             guest["risk_score"] = max(guest["risk_score"] - risk_adjustment, 0)
-            print(f"✅ Risk score decreased by {risk_adjustment} due to positive profile tone")
+            logger.info(f"✅ Risk score decreased by {risk_adjustment} due to positive profile tone")
 
     # Step 5: Also extract profile links using existing logic for backup
     all_serper_results = []
 
-    # Collect all SERPER results from the search process
-    if phone:
-        try:
-            phone_queries = generate_maserati_queries(phone)
-            for query in phone_queries[:5]:  # Limit to avoid overloading
-                results = query_serper(query, num_results=3)
-                if results:
-                    all_serper_results.extend(results)
-        except Exception as e:
-            if verbose:
-                print(f"⚠️ Profile link extraction failed for phone: {e}")
-
-    if email:
-        try:
-            email_queries = generate_maserati_queries(email)
-            for query in email_queries[:5]:  # Limit to avoid overloading
-                results = query_serper(query, num_results=3)
-                if results:
-                    all_serper_results.extend(results)
-        except Exception as e:
-            if verbose:
-                print(f"⚠️ Profile link extraction failed for email: {e}")
+    # Collect all SERPER results from the search process; these mostly repeat the
+    # writing-presence queries above, so the broker answers them without new calls
+    link_queries = []
+    if _phase_allowed("profile link extraction", skipped_phases):
+        deadline = current_deadline()
+        for identifier in (phone, email, name):
+            if deadline is not None and deadline.expired():
+                break
+            if identifier:
+                link_queries.extend(generate_maserati_queries(identifier)[:5])  # Limit to avoid overloading
 
-    if name:
-        try:
-            name_queries = generate_maserati_queries(name)
-            for query in name_queries[:5]:  # Limit to avoid overloading
-                results = query_serper(query, num_results=3)
-                if results:
-                    all_serper_results.extend(results)
-        except Exception as e:
-            if verbose:
-                print(f"⚠️ Profile link extraction failed for name: {e}")
+    for results in gather_results(submit_queries(link_queries, num_results=3), link_queries):
+        if results:
+            all_serper_results.extend(results)
 
     # Extract additional profile links from all collected results
     additional_profile_links = extract_profile_links_from_serper_results(all_serper_results)
@@ -1735,16 +1882,8 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
     if profile_links_list:
         # Convert list to dict format for consistency
         for i, link in enumerate(profile_links_list):
-            platform = "Unknown"
-            if "yelp.com" in link:
-                platform = "Yelp"
-            elif "tripadvisor.com" in link:
-                platform = "TripAdvisor"
-            elif "trustpilot.com" in link:
-                platform = "Trustpilot"
-            elif "google.com" in link:
-                platform = "Google"
-            else:
+            platform = classify_url(link).platform
+            if platform not in REVIEW_PLATFORMS:
                 platform = f"Platform_{i+1}"
             all_profile_links[platform] = link
 
@@ -1757,7 +1896,9 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
         store_profile_links_in_guest_db(name, all_profile_links)
 
     # ✅ NEW: Automated Guest Profile Discovery and Risk Adjustment
-    discovered_profiles, tone_summary, negative_count = discover_guest_profiles(name, phone, email, yelp_profiles_processed=yelp_profiles_processed)
+    discovered_profiles, tone_summary, negative_count = [], "", 0
+    if _phase_allowed("profile discovery", skipped_phases):
+        discovered_profiles, tone_summary, negative_count = discover_guest_profiles(name, phone, email, yelp_profiles_processed=yelp_profiles_processed)
 
     # 🧯 Scan progress tracking - count evidence quality
     evidence_score = 0
@@ -1768,13 +1909,13 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
     if guest.get("influencer_flag"):
         evidence_score += 5  # Critic detection worth 5 points
 
-    print(f"📊 Evidence Quality Score: {evidence_score}/20")
+    logger.info(f"📊 Evidence Quality Score: {evidence_score}/20")
 
     if discovered_profiles:
         guest["discovered_profile_links"] = discovered_profiles
-        print(f"\n🌐 Auto-Discovered Profile Links ({len(discovered_profiles)}):")
+        logger.info(f"\n🌐 Auto-Discovered Profile Links ({len(discovered_profiles)}):")
         for profile_url in discovered_profiles:
-            print(f"   📱 {profile_url}")
+            logger.info(f"   📱 {profile_url}")
 
         # Merge with existing profile links
         all_profile_links.update({f"Auto_{i+1}": url for i, url in enumerate(discovered_profiles)})
@@ -1789,15 +1930,15 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
         if negative_count >= 3:
             risk_boost = 25
             star_adjustment = -3  # Significant star reduction
-            print(f"🚨 Strong negative tone pattern → Risk +{risk_boost}, Star adjustment: {star_adjustment}")
+            logger.warning(f"🚨 Strong negative tone pattern → Risk +{risk_boost}, Star adjustment: {star_adjustment}")
         elif negative_count >= 2:
             risk_boost = 15
             star_adjustment = -2  # Moderate star reduction
-            print(f"⚠️ Moderate negative tone → Risk +{risk_boost}, Star adjustment: {star_adjustment}")
+            logger.warning(f"⚠️ Moderate negative tone → Risk +{risk_boost}, Star adjustment: {star_adjustment}")
         elif negative_count >= 1:
             risk_boost = 8
             star_adjustment = -1  # Minor star reduction
-            print(f"⚠️ Some negative indicators → Risk +{risk_boost}, Star adjustment: {star_adjustment}")
+            logger.warning(f"⚠️ Some negative indicators → Risk +{risk_boost}, Star adjustment: {star_adjustment}")
 
         # Apply risk boost
         guest["risk_score"] = min(guest["risk_score"] + risk_boost, 100)
@@ -1806,19 +1947,19 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
         current_stars = guest.get("star_rating", 5)
         guest["star_rating"] = max(current_stars + star_adjustment, 1)
 
-        print(f"📉 Profile Tone Analysis: {tone_summary}")
-        print(f"📊 Updated Risk Score: {guest['risk_score']}")
-        print(f"⭐ Updated Star Rating: {guest['star_rating']}")
+        logger.info(f"📉 Profile Tone Analysis: {tone_summary}")
+        logger.info(f"📊 Updated Risk Score: {guest['risk_score']}")
+        logger.info(f"⭐ Updated Star Rating: {guest['star_rating']}")
 
     # 🧯 Quality-based final evaluation
     if evidence_score < 3:  # Very low evidence threshold
-        print("🛑 Quality Gate: No valid evidence found. Skipping profile.")
+        logger.warning("🛑 Quality Gate: No valid evidence found. Skipping profile.")
         guest["risk_score"] = 0
         guest["star_rating"] = 5
         guest["reason"] = "No valid evidence found. Skipping profile."
         guest["quality_skip"] = True
     elif evidence_score < 6:  # Low evidence - reduce confidence
-        print("⚠️ Quality Gate: Limited evidence - reducing risk assessment")
+        logger.warning("⚠️ Quality Gate: Limited evidence - reducing risk assessment")
         guest["risk_score"] = max(guest["risk_score"] - 20, 0)
         guest["star_rating"] = min(guest.get("star_rating", 5) + 1, 5)
         guest["reason"] = "Limited evidence - conservative assessment"
@@ -1828,15 +1969,21 @@ def run_full_guest_search(name, email=None, phone=None, verbose=False, trigger_l
         display_profile_links(all_profile_links)
 
     if verbose:
-        print(f"✅ Comprehensive guest scan complete for {name}")
-        print(f"📊 Risk Score: {guest['risk_score']}")
-        print(f"✍️ Writing Samples: {guest['writing_samples_found']}")
-        print(f"🔍 Stylometry Flags: {len(guest['stylometry_flags'])}")
-        print(f"🎯 Critic Flag: {guest['influencer_flag'] or 'None'}")
-        print(f"🔗 Profile Links: {len(all_profile_links)} found")
-        print(f"📊 Evidence Quality: {evidence_score}/20")
+        logger.info(f"✅ Comprehensive guest scan complete for {name}")
+        logger.info(f"📊 Risk Score: {guest['risk_score']}")
+        logger.info(f"✍️ Writing Samples: {guest['writing_samples_found']}")
+        logger.info(f"🔍 Stylometry Flags: {len(guest['stylometry_flags'])}")
+        logger.info(f"🎯 Critic Flag: {guest['influencer_flag'] or 'None'}")
+        logger.info(f"🔗 Profile Links: {len(all_profile_links)} found")
+        logger.info(f"📊 Evidence Quality: {evidence_score}/20")
         if tone_summary:
-            print(f"🎭 Profile Tone: {tone_summary}")
+            logger.info(f"🎭 Profile Tone: {tone_summary}")
+
+    # Phases the deadline cut are reported, so a missing finding is not read as a clean result
+    guest["skipped_phases"] = list(dict.fromkeys(skipped_phases))
+    guest["partial"] = bool(skipped_phases)
+    if skipped_phases:
+        logger.warning(f"⏱️ Partial guest scan, skipped: {guest['skipped_phases']}")
 
     return guest
 
@@ -1851,76 +1998,65 @@ def filter_valid_review_samples(samples):
             valid.append(s)
     return valid
 
-def find_writing_presence(phone=None, email=None, name=None):
+def measure_query_evidence(records):
+    """(profiles, emails, phones) found in one query's SERPER records, for the yield statistics"""
+    profiles = sum(1 for r in records if classify_url(r.link).is_profile)
+    clues = analyze_serper_results(records, "")
+    return profiles, len(clues["emails"]), len(clues["phones"])
+
+def _writing_stars(executed):
+    """Star rating evaluate_guest would give on the writing collected so far"""
+    from conTROLL_decision_engine import evaluate_guest
+    samples = [snippet for _, records in executed for snippet in snippets(records)]
+    return evaluate_guest(75, 0, score_writing_style(samples), samples)[1]
+
+def find_writing_presence(phone=None, email=None, name=None, budget=None):
     """
     🚗 MASERATI MODE - Uses platform-specific queries to find writing samples
     Returns list of writing snippets found across the web.
+    Queries run highest-yield first within the scan's query budget and stop once
+    the writing found no longer changes the guest's star rating.
     """
-    print("🚗 MASERATI MODE: find_writing_presence() using platform queries")
+    logger.info("🚗 MASERATI MODE: find_writing_presence() using platform queries")
+    if budget is None:
+        budget = QueryBudget(MAX_CRAWL_QUERIES)
     writing_samples = []
     total_hits = 0
-    queries_attempted = 0
 
     # Use Maserati queries for each identifier
-    if phone:
-        phone_queries = generate_maserati_queries(phone)
-        for query in phone_queries[:10]:  # Limit to 10 platform queries
-            results = query_serper(query, num_results=3)
-            queries_attempted += 1
-            if results:
-                total_hits += len(results)
-                writing_samples.extend(results)
-
-            # Early abort if no meaningful results after 3 queries
-            if queries_attempted >= 3 and total_hits < 2:
-                print("⚠️ Early abort: Phone queries yielding minimal results")
-                break
-
-    if email:
-        email_queries = generate_maserati_queries(email)
-        for query in email_queries[:10]:  # Limit to 10 platform queries
-            results = query_serper(query, num_results=3)
-            queries_attempted += 1
-            if results:
-                total_hits += len(results)
-                writing_samples.extend(results)
-
-            # Early abort if no meaningful results after 3 queries
-            if queries_attempted >= 6 and total_hits < 4:
-                print("⚠️ Early abort: Email queries yielding minimal results")
-                break
-
-    if name:
-        name_queries = generate_maserati_queries(name)
-        for query in name_queries[:10]:  # Limit to 10 platform queries
-            results = query_serper(query, num_results=3)
-            queries_attempted += 1
-            if results:
-                total_hits += len(results)
-                writing_samples.extend(results)
-
-            # Early abort if no meaningful results after 3 queries
-            if queries_attempted >= 9 and total_hits < 6:
-                print("⚠️ Early abort: Name queries yielding minimal results")
-                break
+    for label, identifier in (("Phone", phone), ("Email", email), ("Name", name)):
+        if not identifier:
+            continue
+        executed = run_scheduled_queries(
+            generate_maserati_queries(identifier)[:10],  # Limit to 10 platform queries
+            budget,
+            num_results=3,
+            is_settled=StableRating(_writing_stars),
+            abort_if_dry=2,  # Early abort if the first batch yields almost nothing
+            measure=measure_query_evidence,
+            label=label
+        )
+        for _, records in executed:
+            total_hits += len(records)
+            writing_samples.extend(snippets(records))
 
     # Quality check: Abort if all results are too short
     meaningful_samples = [s for s in writing_samples if len(s) >= 100]
     if len(meaningful_samples) < 2 and not (email and phone):
-        print("⚠️ Quality abort: All SERPER results < 100 characters, no email/phone included")
+        logger.warning("⚠️ Quality abort: All SERPER results < 100 characters, no email/phone included")
         return []
 
     # Filter out garbage before returning
     valid_samples = [s for s in writing_samples if is_valid_review(s)]
-    print(f"[MASERATI] Filtered {len(writing_samples)} samples down to {len(valid_samples)} valid reviews")
+    logger.info(f"[MASERATI] Filtered {len(writing_samples)} samples down to {len(valid_samples)} valid reviews")
 
     # PATCH 1: Apply smarter filtering for restaurant content
     restaurant_samples = filter_valid_review_samples(valid_samples)
-    print(f"🍽️ Restaurant content filter: {len(valid_samples)} → {len(restaurant_samples)} restaurant-related samples")
+    logger.info(f"🍽️ Restaurant content filter: {len(valid_samples)} → {len(restaurant_samples)} restaurant-related samples")
 
     # Quality gate: If no substantial content found, return empty
     if len(restaurant_samples) < 1 and total_hits < 5:
-        print("⚠️ Quality gate: Insufficient meaningful content found")
+        logger.warning("⚠️ Quality gate: Insufficient meaningful content found")
         return []
 
     # Remove duplicates and return unique samples  
@@ -1939,9 +2075,9 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
     This handles targeted handle + review investigations separately from full guest scans.
     """
     if verbose:
-        print(f"🔍 Starting alias investigation for: {alias}")
-        print(f"📍 Location: {location}")
-        print(f"🌐 Platform: {platform}")
+        logger.info(f"🔍 Starting alias investigation for: {alias}")
+        logger.info(f"📍 Location: {location}")
+        logger.info(f"🌐 Platform: {platform}")
 
     writing_samples = []
     stylometry_flags = []
@@ -1955,10 +2091,10 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
         if "do you know what al dente means" in review_text.lower():
             text_samples.append("Test aggressive sample with do you know what al dente means")
 
-        stylometry_flags = run_stylometry_analysis(text_samples)
+        stylometry_flags = score_writing_style(text_samples)
         if verbose:
-            print(f"[DEBUG Stylometry] Analyzing {len(text_samples)} samples")
-            print(f"[DEBUG Stylometry] Flags: {stylometry_flags}")
+            logger.debug("[DEBUG Stylometry] Analyzing %s samples", len(text_samples))
+            logger.debug("[DEBUG Stylometry] Flags: %s", stylometry_flags)
 
     # Step 1.5: Check alias cache first
     try:
@@ -1968,7 +2104,7 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
         if alias in alias_cache:
             cached_identity = alias_cache[alias]
             if verbose:
-                print(f"[DEBUG Cache] Found cached identity: {alias} → {cached_identity}")
+                logger.debug("[DEBUG Cache] Found cached identity: %s → %s", alias, cached_identity)
 
             # Clean up any identity echo
             clean_identity = cached_identity
@@ -1986,7 +2122,7 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
                 if cleaned_parts:
                     clean_identity = ' '.join(cleaned_parts)
                     if verbose:
-                        print(f"[DEBUG Cache] Cleaned identity: {cached_identity} → {clean_identity}")
+                        logger.debug("[DEBUG Cache] Cleaned identity: %s → %s", cached_identity, clean_identity)
 
             # Return high confidence result from cache
             return {
@@ -2005,11 +2141,11 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
             }
     except Exception as e:
         if verbose:
-            print(f"[DEBUG Cache] Error reading cache: {e}")
+            logger.debug("[DEBUG Cache] Error reading cache: %s", e)
 
     # Step 2: Expand alias and search SERPER
     if verbose:
-        print(f"[DEBUG Alias] Searching for expanded identities of '{alias}'")
+        logger.debug("[DEBUG Alias] Searching for expanded identities of '%s'", alias)
 
     query_variants = [
         f"{alias} {location} site:yelp.com",
@@ -2020,13 +2156,13 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
     ]
 
     for query in query_variants:
-        print(f"🔍 SERPER API Call: \"{query}\"")
+        logger.debug("🔍 SERPER API Call: \"%s\"", query)
         response = query_serper(query)
         if response:
             writing_samples.extend(response)
             if verbose:
                 for sample in response[:3]:  # Show first 3 samples
-                    print(f"[DEBUG Sample] {sample[:80]}...")
+                    logger.debug("[DEBUG Sample] %s...", sample[:80])
 
     # Calculate risk score
     risk_score = 30
@@ -2054,10 +2190,10 @@ def run_alias_investigation(alias, location, review_text, platform, verbose=Fals
     }
 
     if verbose:
-        print(f"✅ Alias investigation complete")
-        print(f"📊 Risk Score: {risk_score}")
-        print(f"✍️ Writing Samples Found: {len(writing_samples)}")
-        print(f"🔍 Stylometry Flags: {len(stylometry_flags)}")
+        logger.info(f"✅ Alias investigation complete")
+        logger.info(f"📊 Risk Score: {risk_score}")
+        logger.info(f"✍️ Writing Samples Found: {len(writing_samples)}")
+        logger.info(f"🔍 Stylometry Flags: {len(stylometry_flags)}")
 
     return guest_profile
 def add_phonebook_layer(name):
@@ -2069,141 +2205,48 @@ def add_phonebook_layer(name):
         return None
 
 
+_URL_IN_TEXT = re.compile(r"https?://[^\s\"'<>]+")
+_REVIEW_COUNT = re.compile(r"(\d+)\s+reviews?", re.IGNORECASE)
+
 def extract_profile_links_from_serper_results(results):
     """
     Extracts profile URLs from SERPER search results and categorizes them by platform.
     Returns a dictionary of platform -> URL mappings.
     """
     profile_links = {}
-    yelp_review_data = {} # Add a dictionary to store Yelp review data
 
     if not results:
         return profile_links
 
-    # Known profile URL patterns for major platforms
-    profile_patterns = {
-        "Yelp": [
-            r'https?://(?:www\.)?yelp\.com/user_details\?userid=([^&\s]+)',
-            r'https?://(?:www\.)?yelp\.com/profile/([^?\s]+)'
-        ],
-        "TripAdvisor": [
-            r'https?://(?:www\.)?tripadvisor\.com/Profile/([^?\s]+)',
-            r'https?://(?:www\.)?tripadvisor\.com/members/([^?\s]+)'
-        ],
-        "Google": [
-            r'https?://(?:www\.)?google\.com/maps/contrib/(\d+)',
-            r'https?://maps\.google\.com/contrib/(\d+)'
-        ],
-        "Facebook": [
-            r'https?://(?:www\.)?facebook\.com/people/([^/?\s]+)',
-            r'https?://(?:www\.)?facebook\.com/profile\.php\?id=(\d+)'
-        ],
-        "LinkedIn": [
-            r'https?://(?:www\.)?linkedin\.com/in/([^?\s]+)',
-            r'https?://(?:www\.)?linkedin\.com/pub/([^?\s]+)'
-        ],
-        "Reddit": [
-            r'https?://(?:www\.)?reddit\.com/user/([^/?\s]+)',
-            r'https?://(?:www\.)?reddit\.com/u/([^/?\s]+)'
-        ],
-        "Instagram": [
-            r'https?://(?:www\.)?instagram\.com/([^/?\s]+)',
-        ],
-        "Twitter": [
-            r'https?://(?:www\.)?twitter\.com/([^/?\s]+)',
-            r'https?://(?:www\.)?x\.com/([^/?\s]+)'
-        ],
-        "Medium": [
-            r'https?://(?:www\.)?medium\.com/@([^/?\s]+)',
-        ],
-        "Glassdoor": [
-            r'https?://(?:www\.)?glassdoor\.com/member/([^?\s]+)',
-        ],
-        "Nextdoor": [
-            r'https?://(?:www\.)?nextdoor\.com/profile/([^?\s]+)',
-        ]
-    }
-
-    # Process results - handle both list of strings and list of dicts
+    # Process results - records carry their link, older callers may pass strings or dicts
     for result in results:
-        if isinstance(result, str):
-            # If result is just a snippet string
+        if isinstance(result, SerperResult):
+            text_content = result.text
+            urls = [result.link]
+        elif isinstance(result, str):
+            # If result is just a snippet string, look for URLs in it
             text_content = result
-            url_content = result  # Look for URLs in the snippet text
+            urls = _URL_IN_TEXT.findall(result)
         elif isinstance(result, dict):
             # If result is a dict with title/snippet/link
-            title = result.get('title', '')
-            snippet = result.get('snippet', '')
-            link = result.get('link', '')
-            text_content = f"{title} {snippet}"
-            url_content = f"{link} {title} {snippet}"
+            text_content = f"{result.get('title', '')} {result.get('snippet', '')}"
+            urls = [result.get('link', '')] + _URL_IN_TEXT.findall(text_content)
         else:
             continue
 
-        # Check each platform's patterns
-        for platform, patterns in profile_patterns.items():
-            if platform in profile_links:
-                continue  # Already found a profile for this platform
+        for url in urls:
+            url = (url or "").rstrip(".,;)")
+            url_class = classify_url(url)
+            if not url_class.profile_id or url_class.platform in profile_links:
+                continue  # Not a profile, or already found a profile for this platform
+            profile_links[url_class.platform] = url
+            logger.debug("🔗 Profile URL found: %s -> %s", url_class.platform, url)
 
-            for pattern in patterns:
-                import re
-                matches = re.findall(pattern, url_content, re.IGNORECASE)
-                if matches:
-                    # Reconstruct the full URL from the match
-                    if platform == "Yelp":
-                        if "userid=" in pattern:
-                            profile_links[platform] = f"https://www.yelp.com/user_details?userid={matches[0]}"
-                        else:
-                            profile_links[platform] = f"https://www.yelp.com/profile/{matches[0]}"
-
-                        # Extract review count from Yelp snippets
-                        review_count_match = re.search(r'(\d+)\s+reviews?', text_content, re.IGNORECASE)
-                        if review_count_match:
-                            review_count = int(review_count_match.group(1))
-
-                            # Detect critic behavior based on review count
-                            critic_flag = review_count >= 15
-                            if critic_flag:
-                                print(f"📊 Detected {review_count} Yelp reviews — critic flag applied")
-
-                            # Store Yelp review data for later use
-                            yelp_review_data[platform] = {
-                                "review_count": review_count,
-                                "critic_flag": critic_flag,
-                                "profile_url": profile_links[platform]
-                            }
-                    elif platform == "TripAdvisor":
-                        if "Profile/" in pattern:
-                            profile_links[platform] = f"https://www.tripadvisor.com/Profile/{matches[0]}"
-                        else:
-                            profile_links[platform] = f"https://www.tripadvisor.com/members/{matches[0]}"
-                    elif platform == "Google":
-                        profile_links[platform] = f"https://www.google.com/maps/contrib/{matches[0]}"
-                    elif platform == "Facebook":
-                        if "people/" in pattern:
-                            profile_links[platform] = f"https://www.facebook.com/people/{matches[0]}"
-                        else:
-                            profile_links[platform] = f"https://www.facebook.com/profile.php?id={matches[0]}"
-                    elif platform == "LinkedIn":
-                        if "/in/" in pattern:
-                            profile_links[platform] = f"https://www.linkedin.com/in/{matches[0]}"
-                        else:
-                            profile_links[platform] = f"https://www.linkedin.com/pub/{matches[0]}"
-                    elif platform == "Reddit":
-                        profile_links[platform] = f"https://www.reddit.com/user/{matches[0]}"
-                    elif platform == "Instagram":
-                        profile_links[platform] = f"https://www.instagram.com/{matches[0]}"
-                    elif platform == "Twitter":
-                        profile_links[platform] = f"https://www.twitter.com/{matches[0]}"
-                    elif platform == "Medium":
-                        profile_links[platform] = f"https://www.medium.com/@{matches[0]}"
-                    elif platform == "Glassdoor":
-                        profile_links[platform] = f"https://www.glassdoor.com/member/{matches[0]}"
-                    elif platform == "Nextdoor":
-                        profile_links[platform] = f"https://www.nextdoor.com/profile/{matches[0]}"
-
-                    print(f"🔗 Profile URL found: {platform} -> {profile_links[platform]}")
-                    break  # Found a match for this platform, move to next platform
+            if url_class.platform == "Yelp":
+                # Detect critic behavior based on the review count in Yelp snippets
+                review_count_match = _REVIEW_COUNT.search(text_content)
+                if review_count_match and int(review_count_match.group(1)) >= 15:
+                    logger.info(f"📊 Detected {review_count_match.group(1)} Yelp reviews — critic flag applied")
 
     return profile_links
 
@@ -2215,26 +2258,16 @@ def store_profile_links_in_guest_db(guest_name, profile_links):
     if not profile_links:
         return
 
-    try:
-        # Load guest database
-        with open("guest_db.json", "r") as f:
-            guest_db = json.load(f)
-    except FileNotFoundError:
-        guest_db = {}
+    with update_guest_db() as guest_db:
+        # Ensure guest entry exists
+        if guest_name not in guest_db:
+            guest_db[guest_name] = {}
 
-    # Ensure guest entry exists
-    if guest_name not in guest_db:
-        guest_db[guest_name] = {}
+        # Store profile links
+        guest_db[guest_name]["profile_links"] = profile_links
+        guest_db[guest_name]["profile_links_updated"] = "2025-06-02"
 
-    # Store profile links
-    guest_db[guest_name]["profile_links"] = profile_links
-    guest_db[guest_name]["profile_links_updated"] = "2025-06-02"
-
-    # Save updated database
-    with open("guest_db.json", "w") as f:
-        json.dump(guest_db, f, indent=2)
-
-    print(f"🔗 Profile links stored for {guest_name}: {len(profile_links)} profiles found")
+    logger.info(f"🔗 Profile links stored for {guest_name}: {len(profile_links)} profiles found")
 
 
 def display_profile_links(profile_links):
@@ -2244,11 +2277,11 @@ def display_profile_links(profile_links):
     if not profile_links:
         return
 
-    print("\n🔗 DISCOVERED PROFILE LINKS:")
-    print("=" * 40)
+    logger.info("\n🔗 DISCOVERED PROFILE LINKS:")
+    logger.info("=" * 40)
     for platform, url in profile_links.items():
-        print(f"📱 {platform}: {url}")
-    print("=" * 40)
+        logger.info(f"📱 {platform}: {url}")
+    logger.info("=" * 40)
 
 
 def find_review_profile_link(name, phone, email):
@@ -2264,33 +2297,29 @@ def find_review_profile_link(name, phone, email):
         search_terms.append(email)
 
     platforms = ["site:yelp.com", "site:tripadvisor.com", "site:trustpilot.com", "site:google.com"]
-    profile_links = []
+    profile_links = ClueSet()
 
+    submitted = []
     for term in search_terms:
         if not term:
             continue
         for platform in platforms[:2]:  # Limit to avoid API exhaustion
             query = f'"{term}" {platform}'
-            try:
-                results = query_serper(query, num_results=3)
-                if results:
-                    for result in results:
-                        if isinstance(result, dict):
-                            link = result.get("link", "")
-                        else:
-                            # Handle string results - look for URLs in text
-                            import re
-                            url_pattern = r'https?://[^\s]+'
-                            urls = re.findall(url_pattern, str(result))
-                            link = urls[0] if urls else ""
+            submitted.append((term, platform, submit_query(query, num_results=3)))
 
-                        if link and any(x in link for x in ["user_details", "/profile", "/member", "/contrib"]):
-                            profile_links.append(link)
-                            print(f"🔗 Found profile link: {link}")
-            except Exception as e:
-                print(f"⚠️ Profile search error for {term} on {platform}: {e}")
+    for term, platform, future in submitted:
+        try:
+            results = future.result()
+            if results:
+                for result in results:
+                    link = result.link
+                    if link and classify_url(link).is_profile:
+                        if profile_links.add(link):
+                            logger.debug("🔗 Found profile link: %s", link)
+        except Exception as e:
+            logger.warning(f"⚠️ Profile search error for {term} on {platform}: {e}")
 
-    return list(set(profile_links))  # Remove duplicates
+    return list(profile_links)
 
 
 def attach_profiles_to_guest(guest_data, profile_links):
@@ -2299,7 +2328,7 @@ def attach_profiles_to_guest(guest_data, profile_links):
     """
     guest_data["profile_links"] = profile_links
     if profile_links:
-        print(f"🔗 Stored {len(profile_links)} profile links")
+        logger.info(f"🔗 Stored {len(profile_links)} profile links")
     return guest_data
 
 
@@ -2307,23 +2336,17 @@ def summarize_profile_reviews(profile_link):
     """
     Analyze tone and review patterns from a profile link
     """
-    print(f"🔎 Analyzing profile: {profile_link[:50]}...")
+    logger.debug("🔎 Analyzing profile: %s...", profile_link[:50])
 
     # Extract platform type
-    platform = "Unknown"
-    if "yelp.com" in profile_link:
-        platform = "Yelp"
-    elif "tripadvisor.com" in profile_link:
-        platform = "TripAdvisor"
-    elif "trustpilot.com" in profile_link:
-        platform = "Trustpilot"
-    elif "google.com" in profile_link:
-        platform = "Google"
+    platform = classify_url(profile_link).platform
+    if platform not in REVIEW_PLATFORMS:
+        platform = "Unknown"
 
     # For now, simulate analysis - in future this could crawl the actual profile
     try:
         # Use SERPER to get info about the profile
-        results = query_serper(f"site:{profile_link}", num_results=3)
+        results = query_serper_records(f"site:{profile_link}", num_results=3)
 
         negative_indicators = 0
         positive_indicators = 0
@@ -2332,13 +2355,7 @@ def summarize_profile_reviews(profile_link):
 
         if results:
             for result in results:
-                text_content = ""
-                if isinstance(result, dict):
-                    text_content = f"{result.get('title', '')} {result.get('snippet', '')}"
-                else:
-                    text_content = str(result)
-
-                text_lower = text_content.lower()
+                text_lower = result.text.lower()
 
                 # Check for negative tone indicators
                 negative_phrases = [
@@ -2384,11 +2401,11 @@ def summarize_profile_reviews(profile_link):
             "positive_indicators": positive_indicators
         }
 
-        print(f"📋 Profile Summary - Platform: {platform}, Tone: {tone}, Indicators: {negative_indicators} negative, {positive_indicators} positive")
+        logger.debug("📋 Profile Summary - Platform: %s, Tone: %s, Indicators: %s negative, %s positive", platform, tone, negative_indicators, positive_indicators)
         return summary
 
     except Exception as e:
-        print(f"⚠️ Profile analysis error: {e}")
+        logger.warning(f"⚠️ Profile analysis error: {e}")
         return {
             "platform": platform,
             "review_count": "unknown",
@@ -2398,19 +2415,19 @@ def summarize_profile_reviews(profile_link):
             "positive_indicators": 0
         }
 
-    print(f"📞 [Phonebook Layer] Starting phonebook lookup for: {name}")
+    logger.info(f"📞 [Phonebook Layer] Starting phonebook lookup for: {name}")
 
     try:
         phonebook_results = run_reverse_phonebook_search(name)
         if phonebook_results and phonebook_results.get("phones"):
             discovered_phone = phonebook_results["phones"][0]  # Take first result
-            print(f"📞 [Phonebook Layer] Phone discovered: {discovered_phone}")
+            logger.info(f"📞 [Phonebook Layer] Phone discovered: {discovered_phone}")
             return discovered_phone
         else:
-            print(f"📞 [Phonebook Layer] No phone found for {name}")
+            logger.info(f"📞 [Phonebook Layer] No phone found for {name}")
             return None
     except Exception as e:
-        print(f"⚠️ [Phonebook Layer] Error: {e}")
+        logger.warning(f"⚠️ [Phonebook Layer] Error: {e}")
         return None
 
 
@@ -2422,19 +2439,19 @@ def add_reverse_email_layer(phone_number):
     if not phone_number:
         return None
 
-    print(f"📧 [Reverse Email Layer] Starting email lookup from phone: {phone_number}")
+    logger.info(f"📧 [Reverse Email Layer] Starting email lookup from phone: {phone_number}")
 
     try:
         discovered_emails = reverse_email_lookup_from_phone(phone_number, verbose=False)
         if discovered_emails:
             discovered_email = discovered_emails[0]  # Take first result
-            print(f"📧 [Reverse Email Layer] Email discovered: {discovered_email}")
+            logger.info(f"📧 [Reverse Email Layer] Email discovered: {discovered_email}")
             return discovered_email
         else:
-            print(f"📧 [Reverse Email Layer] No email found for phone {phone_number}")
+            logger.info(f"📧 [Reverse Email Layer] No email found for phone {phone_number}")
             return None
     except Exception as e:
-        print(f"⚠️ [Reverse Email Layer] Error: {e}")
+        logger.warning(f"⚠️ [Reverse Email Layer] Error: {e}")
         return None
 
 
@@ -2469,7 +2486,7 @@ def add_final_resolution_layer(name, phone, email, guest_profile):
     Modular final resolution layer - logs summary and updates guest profile
     Returns updated guest profile with module tracking
     """
-    print(f"🎯 [Final Resolution Layer] Consolidating profile for: {name}")
+    logger.info(f"🎯 [Final Resolution Layer] Consolidating profile for: {name}")
 
     # Initialize module tracking if not exists
     if 'source_modules' not in guest_profile:
@@ -2503,9 +2520,9 @@ def add_final_resolution_layer(name, phone, email, guest_profile):
     enhanced_confidence = min(base_confidence + confidence_boost, 100)
     guest_profile['confidence'] = enhanced_confidence
 
-    print(f"🎯 [Final Resolution Layer] Modules used: {', '.join(modules_used)}")
-    print(f"🎯 [Final Resolution Layer] Enhanced confidence: {enhanced_confidence}")
-    print(f"🎯 [Final Resolution Layer] Profile completion: Name={name != 'Unknown'}, Phone={bool(phone)}, Email={bool(email)}")
+    logger.info(f"🎯 [Final Resolution Layer] Modules used: {', '.join(modules_used)}")
+    logger.info(f"🎯 [Final Resolution Layer] Enhanced confidence: {enhanced_confidence}")
+    logger.info(f"🎯 [Final Resolution Layer] Profile completion: Name={name != 'Unknown'}, Phone={bool(phone)}, Email={bool(email)}")
 
     return guest_profile
 
@@ -2518,7 +2535,7 @@ def add_phonebook_layer_enhanced(name):
     if not name or name == "Unknown":
         return None
 
-    print(f"📞 [Phonebook Layer] Starting phonebook lookup for: {name}")
+    logger.info(f"📞 [Phonebook Layer] Starting phonebook lookup for: {name}")
 
     phonebook_sites = [
         "site:whitepages.com",
@@ -2540,25 +2557,19 @@ def add_phonebook_layer_enhanced(name):
                     for snippet in results:
                         # Handle both string snippets and dict results
                         text_content = snippet if isinstance(snippet, str) else f"{snippet.get('title', '')} {snippet.get('snippet', '')}"
-                        phones = re.findall(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text_content)
-
-                        for phone in phones:
-                            cleaned = re.sub(r'[^0-9]', '', phone)
-                            if len(cleaned) == 10:
-                                # Apply junk filtering
-                                if not filter_junk_identity(phone=cleaned, verbose=False):
-                                    found_phones.add(cleaned)
+                        contacts = extract_contacts(text_content, junk=filter_junk_identity, kinds=("phone",))
+                        found_phones.update(contacts.phones)
 
         if found_phones:
             phone = list(found_phones)[0]
-            print(f"📞 [Phonebook Layer] Phone discovered: {phone}")
+            logger.info(f"📞 [Phonebook Layer] Phone discovered: {phone}")
             return phone
         else:
-            print(f"📞 [Phonebook Layer] No phone found for {name}")
+            logger.info(f"📞 [Phonebook Layer] No phone found for {name}")
             return None
 
     except Exception as e:
-        print(f"⚠️ [Phonebook Layer] Error: {e}")
+        logger.warning(f"⚠️ [Phonebook Layer] Error: {e}")
         return None
 
 
@@ -2570,7 +2581,7 @@ def add_reverse_email_layer_enhanced(phone_number, guest_full_name=None):
     if not phone_number:
         return None
 
-    print(f"📧 [Reverse Email Layer] Starting email lookup from phone: {phone_number}")
+    logger.info(f"📧 [Reverse Email Layer] Starting email lookup from phone: {phone_number}")
 
     email_sites = [
         "site:whitepages.com",
@@ -2590,17 +2601,12 @@ def add_reverse_email_layer_enhanced(phone_number, guest_full_name=None):
                 for snippet in results:
                     # Handle both string snippets and dict results
                     text_content = snippet if isinstance(snippet, str) else f"{snippet.get('title', '')} {snippet.get('snippet', '')}"
-                    emails = re.findall(r'[\w.-]+@[\w.-]+\.[a-zA-Z]{2,}', text_content)
-
-                    for email in emails:
-                        if "." in email.split("@")[1]:
-                            # Apply junk filtering
-                            if not filter_junk_identity(email=email, verbose=False):
-                                found_emails.add(email.lower())
+                    contacts = extract_contacts(text_content, junk=filter_junk_identity, kinds=("email",))
+                    found_emails.update(contacts.emails)
 
         # 🔹 2. Enhanced Email Triangulation Layer
         if not found_emails and guest_full_name and guest_full_name != "Unknown":
-            print(f"📧 [Enhanced Triangulation] Trying synthetic email patterns for: {guest_full_name}")
+            logger.info(f"📧 [Enhanced Triangulation] Trying synthetic email patterns for: {guest_full_name}")
 
             # Parse name components
             name_parts = guest_full_name.strip().split()
@@ -2631,7 +2637,7 @@ def add_reverse_email_layer_enhanced(phone_number, guest_full_name=None):
                                 # Check if results match the guest's full name
                                 if matches_identity_in_text(text_content, guest_full_name):
                                     found_emails.add(synthetic_email)
-                                    print(f"📧 [Enhanced Triangulation] Synthetic email validated: {synthetic_email}")
+                                    logger.info(f"📧 [Enhanced Triangulation] Synthetic email validated: {synthetic_email}")
                                     break
 
                             if synthetic_email in found_emails:
@@ -2642,13 +2648,13 @@ def add_reverse_email_layer_enhanced(phone_number, guest_full_name=None):
 
         if found_emails:
             email = list(found_emails)[0]
-            print(f"📧 [Reverse Email Layer] Email discovered: {email}")
+            logger.info(f"📧 [Reverse Email Layer] Email discovered: {email}")
             return email
         else:
-            print(f"📧 [Reverse Email Layer] No email found for phone {phone_number}")
+            logger.info(f"📧 [Reverse Email Layer] No email found for phone {phone_number}")
             return None
     except Exception as e:
-        print(f"⚠️ [Reverse Email Layer] Error: {e}")
+        logger.warning(f"⚠️ [Reverse Email Layer] Error: {e}")
         return None
 
 def matches_identity_in_text(text_content, guest_full_name):
@@ -2678,8 +2684,7 @@ def process_yelp_profile_discovery(profile_url, snippet, verbose=False):
     """
     Scrapes and analyzes Yelp profile for review patterns and tone.
     """
-    print(f"🌐 Scraping Yelp profile: {profile_url}")
-    import requests
+    logger.debug("🌐 Scraping Yelp profile: %s", profile_url)
     from bs4 import BeautifulSoup
 
     # Initialize data structure
@@ -2696,19 +2701,13 @@ def process_yelp_profile_discovery(profile_url, snippet, verbose=False):
 
     try:
         # Fetch the profile content
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        response = requests.get(profile_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        yelp_data["raw_html"] = response.text
+        page = scrape(profile_url, backend="direct")
+        if not page.ok:
+            raise RuntimeError(page.error)
+        yelp_data["raw_html"] = page.text
 
         # Parse with BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(page.text, 'html.parser')
 
         # Extract total review count
         review_count_element = soup.find('span', class_='user-passport-info-reviews')  # Adjust class as needed
@@ -2718,7 +2717,7 @@ def process_yelp_profile_discovery(profile_url, snippet, verbose=False):
             match = re.search(r'(\d+)\s+reviews?', review_count_text, re.IGNORECASE)
             if match:
                 yelp_data["review_count"] = int(match.group(1))
-                print(f"✅ Yelp profile has {yelp_data['review_count']} reviews")
+                logger.debug("✅ Yelp profile has %s reviews", yelp_data['review_count'])
 
         # Simulate tone analysis from snippet - actual crawling is too complex
         negative_phrases = [
@@ -2727,10 +2726,10 @@ def process_yelp_profile_discovery(profile_url, snippet, verbose=False):
         if any(phrase in snippet.lower() for phrase in negative_phrases):
             yelp_data["analysis"]["tone_flag"] = "negative_pattern"
             yelp_data["analysis"]["negative_reviews"] = 3  # Fake value - could be enhanced
-            print(f"⚠️ Negative tone pattern matched from snippet")
+            logger.warning(f"⚠️ Negative tone pattern matched from snippet")
 
     except Exception as e:
-        print(f"❌ Yelp scraping failed: {e}")
+        logger.error(f"❌ Yelp scraping failed: {e}")
 
     return yelp_data
 
@@ -2739,7 +2738,7 @@ def discover_guest_profiles(name, phone, email, yelp_profiles_processed=None):
     Automated guest profile discovery across review platforms
     Returns profile links and tone analysis
     """
-    profile_links = []
+    profile_links = ClueSet()
     tone_summary = ""
     negative_indicators = 0
     yelp_profiles_processed = yelp_profiles_processed if yelp_profiles_processed is not None else []
@@ -2767,54 +2766,42 @@ def discover_guest_profiles(name, phone, email, yelp_profiles_processed=None):
             f'"{email}" site:tripadvisor.com'
         ])
 
-    print(f"🔍 Discovering guest profiles across {len(queries)} platform searches...")
+    logger.info(f"🔍 Discovering guest profiles across {len(queries)} platform searches...")
 
     try:
-        for query in queries[:8]:  # Limit to 8 queries to avoid API exhaustion
-            results = query_serper(query, num_results=3)
+        planned = queries[:8]  # Limit to 8 queries to avoid API exhaustion
+        deadline = current_deadline()
+        for results in gather_results(submit_queries(planned, num_results=3), planned):
+            if deadline is not None and deadline.expired():
+                logger.warning("⏱️ Scan deadline reached, stopping profile discovery")
+                break
 
             if results:
                 for result in results:
-                    # Handle both string and dict results
-                    if isinstance(result, dict):
-                        url = result.get("link", "")
-                        snippet = result.get("snippet", "")
-                        title = result.get("title", "")
-                    else:
-                        # Extract URLs from string content
-                        import re
-                        url_pattern = r'https?://[^\s]+'
-                        urls = re.findall(url_pattern, str(result))
-                        url = urls[0] if urls else ""
-                        snippet = str(result)
-                        title = ""
+                    url, snippet, title = result.link, result.snippet, result.title
 
                     # Check if this is a profile link on review platforms
-                    if url and any(platform in url.lower() for platform in [
-                        "yelp.com", "tripadvisor.com", "trustpilot.com", "google.com"
-                    ]):
+                    kind = classify_url(url)
+                    if url and kind.platform in REVIEW_PLATFORMS:
                         # Check for profile-specific URL patterns
-                        if any(pattern in url.lower() for pattern in [
-                            "user_details", "/profile", "/member", "contrib", "/user/"
-                        ]):
-                            if url not in profile_links:
-                                profile_links.append(url)
-                                print(f"🔗 Profile discovered: {url}")
+                        if kind.is_profile:
+                            if profile_links.add(url):
+                                logger.debug("🔗 Profile discovered: %s", url)
 
                                 # ✅ NEW: Process Yelp profiles immediately for deep analysis
-                                if "yelp.com" in url.lower() and "user_details" in url.lower():
+                                if kind.platform == "Yelp" and kind.profile_id:
                                     try:
-                                        print(f"🔍 Triggering Yelp profile analysis for: {url}")
+                                        logger.debug("🔍 Triggering Yelp profile analysis for: %s", url)
                                         yelp_data = process_yelp_profile_discovery(url, snippet, verbose=True)
                                         yelp_profiles_processed.append(yelp_data)
 
                                         # Update negative indicators based on Yelp analysis
                                         if yelp_data["analysis"]["tone_flag"] == "negative_pattern":
                                             negative_indicators += yelp_data["analysis"]["negative_reviews"]
-                                            print(f"⚠️ Yelp profile shows negative pattern: +{yelp_data['analysis']['negative_reviews']} indicators")
+                                            logger.warning(f"⚠️ Yelp profile shows negative pattern: +{yelp_data['analysis']['negative_reviews']} indicators")
 
                                     except Exception as e:
-                                        print(f"⚠️ Yelp profile processing failed: {e}")
+                                        logger.warning(f"⚠️ Yelp profile processing failed: {e}")
 
                     # Analyze tone from snippets and titles
                     combined_text = f"{title} {snippet}".lower()
@@ -2833,7 +2820,7 @@ def discover_guest_profiles(name, phone, email, yelp_profiles_processed=None):
                             phrase_matches.append(phrase)
 
                     if phrase_matches:
-                        print(f"⚠️ Negative tone detected: {', '.join(phrase_matches[:3])}")
+                        logger.debug("⚠️ Negative tone detected: %s", ', '.join(phrase_matches[:3]))
 
         # Generate tone summary
         if negative_indicators >= 3:
@@ -2843,12 +2830,12 @@ def discover_guest_profiles(name, phone, email, yelp_profiles_processed=None):
         elif negative_indicators >= 1:
             tone_summary = "Some negative indicators found"
 
-        print(f"✅ Profile discovery complete: {len(profile_links)} profiles found, {negative_indicators} negative indicators")
+        logger.info(f"✅ Profile discovery complete: {len(profile_links)} profiles found, {negative_indicators} negative indicators")
 
-        return profile_links, tone_summary, negative_indicators
+        return list(profile_links), tone_summary, negative_indicators
 
     except Exception as e:
-        print(f"⚠️ Profile discovery error: {e}")
+        logger.warning(f"⚠️ Profile discovery error: {e}")
         return [], "", 0
 
 
@@ -2893,12 +2880,12 @@ def estimate_review_volume(real_name):
         total_review_estimate = 0
         platform_counts = {}
 
-        for query in platform_queries[:8]:  # Limit to 8 queries to avoid API exhaustion
-            results = query_serper(query, num_results=3)
+        planned = platform_queries[:8]  # Limit to 8 queries to avoid API exhaustion
+        for query, results in zip(planned, gather_results(submit_queries(planned, num_results=3), planned)):
 
             if results:
                 for result in results:
-                    text_content = result if isinstance(result, str) else f"{result.get('title', '')} {result.get('snippet', '')}"
+                    text_content = result.text
 
                     # Enhanced review count patterns for cross-platform detection
                     import re
@@ -2950,7 +2937,7 @@ def estimate_review_volume(real_name):
                                     else:
                                         platform_counts[platform] = max(platform_counts[platform], review_count)
 
-                                    print(f"📊 {platform} review volume detected: {review_count} reviews for {real_name}")
+                                    logger.debug("📊 %s review volume detected: %s reviews for %s", platform, review_count, real_name)
 
                             except (ValueError, IndexError):
                                 continue
@@ -2964,19 +2951,19 @@ def estimate_review_volume(real_name):
             # Multi-platform boost: +50% for 2 platforms, +100% for 3+
             if platform_count >= 3:
                 total_review_estimate = int(max_single_platform * 2.0)
-                print(f"🌐 Multi-platform critic detected: {platform_count} platforms, boosted estimate: {total_review_estimate}")
+                logger.info(f"🌐 Multi-platform critic detected: {platform_count} platforms, boosted estimate: {total_review_estimate}")
             elif platform_count == 2:
                 total_review_estimate = int(max_single_platform * 1.5)
-                print(f"🌐 Cross-platform reviewer: {platform_count} platforms, boosted estimate: {total_review_estimate}")
+                logger.info(f"🌐 Cross-platform reviewer: {platform_count} platforms, boosted estimate: {total_review_estimate}")
             else:
                 total_review_estimate = max_single_platform
 
-            print(f"📈 Platform breakdown: {platform_counts}")
+            logger.info(f"📈 Platform breakdown: {platform_counts}")
 
         return total_review_estimate
 
     except Exception as e:
-        print(f"⚠️ Cross-platform review volume estimation error for {real_name}: {e}")
+        logger.warning(f"⚠️ Cross-platform review volume estimation error for {real_name}: {e}")
         return 0
 
 def estimate_review_volume(real_name):
@@ -3007,12 +2994,12 @@ def estimate_review_volume(real_name):
         total_review_estimate = 0
         platform_counts = {}
 
-        for query in platform_queries[:8]:  # Limit to 8 queries to avoid API exhaustion
-            results = query_serper(query, num_results=3)
+        planned = platform_queries[:8]  # Limit to 8 queries to avoid API exhaustion
+        for query, results in zip(planned, gather_results(submit_queries(planned, num_results=3), planned)):
 
             if results:
                 for result in results:
-                    text_content = result if isinstance(result, str) else f"{result.get('title', '')} {result.get('snippet', '')}"
+                    text_content = result.text
 
                     # Enhanced review count patterns for cross-platform detection
                     import re
@@ -3064,7 +3051,7 @@ def estimate_review_volume(real_name):
                                     else:
                                         platform_counts[platform] = max(platform_counts[platform], review_count)
 
-                                    print(f"📊 {platform} review volume detected: {review_count} reviews for {real_name}")
+                                    logger.debug("📊 %s review volume detected: %s reviews for %s", platform, review_count, real_name)
 
                             except (ValueError, IndexError):
                                 continue
@@ -3078,19 +3065,19 @@ def estimate_review_volume(real_name):
             # Multi-platform boost: +50% for 2 platforms, +100% for 3+
             if platform_count >= 3:
                 total_review_estimate = int(max_single_platform * 2.0)
-                print(f"🌐 Multi-platform critic detected: {platform_count} platforms, boosted estimate: {total_review_estimate}")
+                logger.info(f"🌐 Multi-platform critic detected: {platform_count} platforms, boosted estimate: {total_review_estimate}")
             elif platform_count == 2:
                 total_review_estimate = int(max_single_platform * 1.5)
-                print(f"🌐 Cross-platform reviewer: {platform_count} platforms, boosted estimate: {total_review_estimate}")
+                logger.info(f"🌐 Cross-platform reviewer: {platform_count} platforms, boosted estimate: {total_review_estimate}")
             else:
                 total_review_estimate = max_single_platform
 
-            print(f"📈 Platform breakdown: {platform_counts}")
+            logger.info(f"📈 Platform breakdown: {platform_counts}")
 
         return total_review_estimate
 
     except Exception as e:
-        print(f"⚠️ Cross-platform review volume estimation error for {real_name}: {e}")
+        logger.warning(f"⚠️ Cross-platform review volume estimation error for {real_name}: {e}")
         return 0
 
 def estimate_yelp_review_volume(real_name):
@@ -3128,15 +3115,20 @@ def generate_platform_queries(name, location, phrases=[]):
         "site:tripadvisor.com",
         "site:google.com"
     ]
+    platforms = prune_platforms(platforms)
 
     result = [f"{site} {combined}" for site in platforms]
-    print(f"✅ Generated {len(platforms)} platform queries for '{name}' in '{location}'")
+    logger.info(f"✅ Generated {len(platforms)} platform queries for '{name}' in '{location}'")
     return result
 
 def extract_identity_clues(results, handle):
     """Extract potential identity clues from search results"""
     clues = set()
     handle_lower = handle.lower()
+    name_patterns = [
+        re.compile(r'\b' + re.escape(handle_lower) + r'\s+([a-z]+)\b'),
+        re.compile(r'\b([a-z]+)\s+' + re.escape(handle_lower) + r'\b')
+    ]
 
     for result in results:
         if isinstance(result, dict):
@@ -3147,27 +3139,17 @@ def extract_identity_clues(results, handle):
             snippet = str(result).lower()
 
         # Look for full names
-        name_patterns = [
-            r'\b' + re.escape(handle_lower) + r'\s+([a-z]+)\b',
-            r'\b([a-z]+)\s+' + re.escape(handle_lower) + r'\b'
-        ]
-
         for pattern in name_patterns:
-            matches = re.findall(pattern, title + ' ' + snippet)
+            matches = pattern.findall(title + ' ' + snippet)
             for match in matches:
                 if len(match) > 2:
                     clues.add(f"{handle} {match.title()}")
 
         # Look for contact info
-        email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-
-        emails = re.findall(email_pattern, snippet)
-        phones = re.findall(phone_pattern, snippet)
-
-        for email in emails:
+        contacts = extract_contacts(snippet, junk=filter_junk_identity, kinds=("email", "phone"))
+        for email in contacts.emails:
             clues.add(f"email:{email}")
-        for phone in phones:
+        for phone in contacts.phones:
             clues.add(f"phone:{phone}")
 
     return clues
@@ -3181,10 +3163,10 @@ def purge_duplicate_aliases():
         with open("alias_cache.json", "r") as f:
             data = json.load(f)
     except FileNotFoundError:
-        print("No alias cache found to clean.")
+        logger.info("No alias cache found to clean.")
         return
 
-    print(f"🧹 Cleaning alias cache: {len(data)} entries before normalization")
+    logger.info(f"🧹 Cleaning alias cache: {len(data)} entries before normalization")
 
     normalized = {}
     conflicts = []
@@ -3207,11 +3189,11 @@ def purge_duplicate_aliases():
     with open("alias_cache.json", "w") as f:
         json.dump(normalized, f, indent=2)
 
-    print(f"✅ Cache cleaned: {len(normalized)} unique normalized entries")
+    logger.info(f"✅ Cache cleaned: {len(normalized)} unique normalized entries")
     if conflicts:
-        print(f"⚠️ Resolved {len(conflicts)} conflicts:")
+        logger.warning(f"⚠️ Resolved {len(conflicts)} conflicts:")
         for conflict in conflicts[:5]:  # Show first 5 conflicts
-            print(f"   • {conflict}")
+            logger.info(f"   • {conflict}")
 
     return len(data) - len(normalized)  # Return number of duplicates removed
 
@@ -3221,17 +3203,15 @@ def scrape_contact_info(url, verbose=False):
     Returns structured contact information extracted from the page
     """
     try:
-        scraper_url = "https://controll-scraper.onrender.com/scrape"
-        response = requests.post(scraper_url, json={"url": url}, timeout=10)
+        page = scrape(url, backend="scraper")
 
-        if response.status_code == 200:
-            html = response.json().get("html", "")
+        if page.ok:
+            html = page.text
             if verbose:
-                print(f"🧠 Scraped HTML from {url}:\n", html[:1000])
+                logger.info(f"🧠 Scraped HTML from {url}:\n{html[:1000]}")
 
-            # Extract emails and phones
-            emails = re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", html)
-            phones = re.findall(r"\(?\b[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b", html)
+            # Extract emails and phones in one pass
+            contacts = extract_contacts(html, kinds=("email", "phone"))
 
             # Detect review platform URLs
             review_platforms = []
@@ -3253,47 +3233,43 @@ def scrape_contact_info(url, verbose=False):
                 if site in html:
                     social_links.append(site)
 
-            # Clean and filter results
+            # Filter junk results
             clean_emails = []
-            for email in emails:
-                email = email.lower().strip()
-                if "@" in email and "." in email.split("@")[1]:
-                    if not filter_junk_identity(email=email):
-                        clean_emails.append(email)
-                    elif verbose:
-                        print(f"🚫 Filtered junk email: {email}")
+            for email in contacts.emails:
+                if not filter_junk_identity(email=email):
+                    clean_emails.append(email)
+                elif verbose:
+                    logger.debug("🚫 Filtered junk email: %s", email)
 
             clean_phones = []
-            for phone in phones:
-                clean_phone = re.sub(r'[^\d]', '', str(phone))
-                if len(clean_phone) >= 10:
-                    if not filter_junk_identity(phone=clean_phone):
-                        clean_phones.append(clean_phone)
-                    elif verbose:
-                        print(f"🚫 Filtered junk phone: {clean_phone}")
+            for phone in contacts.phones:
+                if not filter_junk_identity(phone=phone):
+                    clean_phones.append(phone)
+                elif verbose:
+                    logger.debug("🚫 Filtered junk phone: %s", phone)
 
             result = {
-                "emails": list(set(clean_emails)),
-                "phones": list(set(clean_phones)),
+                "emails": clean_emails,
+                "phones": clean_phones,
                 "review_platforms": review_platforms,
                 "social_links": social_links,
                 "html_snippet": html[:1000]  # optional for debugging
             }
 
             if verbose:
-                print(f"✅ Contact extraction complete: {len(result['emails'])} emails, {len(result['phones'])} phones")
+                logger.info(f"✅ Contact extraction complete: {len(result['emails'])} emails, {len(result['phones'])} phones")
                 if result["emails"]:
-                    print(f"   📧 Emails: {result['emails']}")
+                    logger.info(f"   📧 Emails: {result['emails']}")
                 if result["phones"]:
-                    print(f"   📞 Phones: {result['phones']}")
+                    logger.info(f"   📞 Phones: {result['phones']}")
                 if review_platforms:
-                    print(f"   📝 Review platforms: {review_platforms}")
+                    logger.info(f"   📝 Review platforms: {review_platforms}")
                 if social_links:
-                    print(f"   📱 Social links: {social_links}")
+                    logger.info(f"   📱 Social links: {social_links}")
 
             return result
         else:
-            return {"error": f"Failed to scrape: {response.status_code}"}
+            return {"error": page.error}
     except Exception as e:
         return {"error": str(e)}
 
@@ -3304,20 +3280,21 @@ def check_phone_penetration(phone_number):
         "nextdoor.com", "trustpilot.com", "blogspot.com", "medium.com", "quora.com"
     ]
     matches = []
-    for site in platforms:
+    futures = [(site, submit_query(f'"{phone_number}" site:{site}')) for site in platforms]
+    for site, future in futures:
         try:
-            results = query_serper(f'"{phone_number}" site:{site}')
+            results = future.result()
             if results and len(results) > 0:
                 matches.append(site)
         except Exception as e:
-            print(f"❌ Error checking {site}: {e}")
+            logger.error(f"❌ Error checking {site}: {e}")
 
     if matches:
         # PATCH 2: Aggressive platform-based risk boost
         risk_boost = boost_risk_by_platform_penetration(matches)
-        print(f"\n📡 Cross-Platform Penetration: {len(matches)} matches (Risk +{risk_boost})")
+        logger.info(f"\n📡 Cross-Platform Penetration: {len(matches)} matches (Risk +{risk_boost})")
         for match in matches:
-            print(f"- Found on {match}")
+            logger.info(f"- Found on {match}")
 
     return matches
 
@@ -3326,25 +3303,66 @@ def check_phone_penetration(phone_number):
 def run_verbose_serper_scan(query: str, max_results: int = 20):
     """
     Runs a verbose SERPER scan and returns detailed results from multiple query variants.
+    Raises the first error if no variant was answered, so a failed query is not mistaken
+    for one that found nothing.
     """
-    print(f"🧠 Running verbose SERPER scan for: {query}")
+    logger.debug("🧠 Running verbose SERPER scan for: %s", query)
     results = []
     query_variants = generate_query_variants(query)
 
+    futures = []
     for variant in query_variants:
-        print(f"🔍 Querying SERPER with: {variant}")
+        logger.debug("🔍 Querying SERPER with: %s", variant)
+        futures.append(submit_query(variant))
+
+    errors = []
+    for variant, future in zip(query_variants, futures):
         try:
-            response = query_serper(variant)
-            if isinstance(response, dict) and response.get("organic"):
-                results.extend(response["organic"])
-            elif isinstance(response, list):
-                results.extend(response)
+            merge_variant_response(results, future.result())
         except Exception as e:
-            print(f"⚠️ SERPER query failed for '{variant}': {e}")
+            logger.warning(f"⚠️ SERPER query failed for '{variant}': {e}")
+            errors.append(e)
+    if errors and len(errors) == len(query_variants):
+        raise errors[0]
 
-    print(f"✅ Found {len(results)} results across {len(query_variants)} query variants.")
+    logger.info(f"✅ Found {len(results)} results across {len(query_variants)} query variants.")
     return results
 
+def merge_variant_response(results, response):
+    """Append one variant's SERPER response to the accumulated scan results"""
+    if isinstance(response, dict) and response.get("organic"):
+        results.extend(response["organic"])
+    elif isinstance(response, list):
+        results.extend(response)
+
+def analyze_serper_results(results, query):
+    """
+    Pull emails, phones and URLs out of a batch of SERPER results for the MRI scanner.
+    Junk identities are dropped; URLs are returned in first-seen order.
+    """
+    clues = {"emails": [], "phones": [], "urls": []}
+    urls = ClueSet()
+
+    for result in results or []:
+        if isinstance(result, SerperResult):
+            # The link is already known; only title and snippet need scanning for contacts
+            text_content = result.text
+            urls.add(result.link)
+        elif isinstance(result, dict):
+            text_content = f"{result.get('link', '')} {result.get('title', '')} {result.get('snippet', '')}"
+        else:
+            text_content = str(result)
+
+        contacts = extract_contacts(text_content, junk=filter_junk_identity, kinds=("email", "phone", "url"))
+        clues["emails"].extend(e for e in contacts.emails if e not in clues["emails"])
+        clues["phones"].extend(p for p in contacts.phones if p not in clues["phones"])
+        urls.extend(contacts.urls)
+
+    clues["urls"] = list(urls)
+    return clues
+
+_QUERY_SYNTAX = re.compile(r'[:"]')
+
 def generate_query_variants(name: str):
     """
     Generates expanded query variations for a name like 'Seth D.'
@@ -3352,7 +3370,9 @@ def generate_query_variants(name: str):
     name = name.strip()
     base_variants = [name]
     
-    if "." in name and " " in name:
+    # Only a bare name is expanded: a search query like 'site:yelp.com "sethd"' would lose
+    # the dot in its domain and fan out into a dozen junk SERPER calls
+    if "." in name and " " in name and not _QUERY_SYNTAX.search(name):
         # Expand from 'Seth D.' to variants
         parts = name.replace(".", "").split()
         if len(parts) == 2:
@@ -0,0 +1,296 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from local_db import get_connection
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+SERPER_CACHE_DB = "serper_cache.db"
+SERPER_CACHE_ENABLED = os.environ.get("SERPER_CACHE_ENABLED", "1") != "0"
+SERPER_CACHE_TTL = int(os.environ.get("SERPER_CACHE_TTL", 6 * 3600))  # seconds
+SERPER_EMPTY_TTL = int(os.environ.get("SERPER_EMPTY_TTL", 3600))  # seconds a "no results" answer is trusted
+SERPER_CACHE_MAX_ENTRIES = int(os.environ.get("SERPER_CACHE_MAX_ENTRIES", 5000))
+SERPER_INFLIGHT_TTL = float(os.environ.get("SERPER_INFLIGHT_TTL", 20))  # max seconds a worker may hold a query lease
+SERPER_INFLIGHT_POLL = 0.2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    num_results INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS empty_responses (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS empty_responses_created_at ON empty_responses (created_at);
+CREATE TABLE IF NOT EXISTS inflight (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_initialized_pid = None
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(SERPER_CACHE_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def _bump(conn, name, amount=1):
+    conn.execute(
+        "INSERT INTO stats (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        (name, amount)
+    )
+
+
+def normalize_query(q):
+    """
+    Canonical form of a search query so equivalent spellings share a cache entry:
+    case and whitespace are folded and site: operators are moved to the end,
+    so 'site:yelp.com "Seth D."' and '"seth d." site:yelp.com' are the same query.
+    """
+    tokens = re.findall(r'"[^"]*"|\S+', (q or "").strip().lower())
+    terms = [" ".join(t.split()) for t in tokens if not t.startswith("site:")]
+    sites = sorted(t for t in tokens if t.startswith("site:"))
+    return " ".join(terms + sites)
+
+
+def cache_key(q, num_results=10):
+    return f"{num_results}|{normalize_query(q)}"
+
+
+def get_cached_response(q, num_results=10):
+    """
+    Return the cached SERPER organic results for a query, or None on a miss.
+    A query SERPER recently answered with no results returns [] ("known empty"),
+    which callers must not confuse with None ("never asked").
+    Expired entries are dropped on read.
+    """
+    if not SERPER_CACHE_ENABLED:
+        return None
+
+    key = cache_key(q, num_results)
+    now = time.time()
+    try:
+        conn = _db()
+        row = conn.execute(
+            "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            empty = conn.execute(
+                "SELECT created_at FROM empty_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if empty is not None and now - empty["created_at"] <= SERPER_EMPTY_TTL:
+                _bump(conn, "empty_hits")
+                return []
+            _bump(conn, "misses")
+            return None
+
+        if now - row["created_at"] > SERPER_CACHE_TTL:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            _bump(conn, "misses")
+            _bump(conn, "expirations")
+            return None
+
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        _bump(conn, "hits")
+        return json.loads(row["payload"])
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning(f"⚠️ SERPER cache read failed: {e}")
+        return None
+
+
+def store_response(q, num_results, organic):
+    """
+    Cache a SERPER organic result list and evict least-recently-used entries over the limit.
+    An empty list is remembered separately, for SERPER_EMPTY_TTL only.
+    """
+    if not SERPER_CACHE_ENABLED:
+        return
+
+    now = time.time()
+    key = cache_key(q, num_results)
+    try:
+        conn = _db()
+        if not organic:
+            conn.execute(
+                "INSERT OR REPLACE INTO empty_responses (key, query, created_at) VALUES (?, ?, ?)",
+                (key, normalize_query(q), now)
+            )
+            conn.execute("DELETE FROM empty_responses WHERE created_at < ?", (now - SERPER_EMPTY_TTL,))
+            return
+
+        conn.execute("DELETE FROM empty_responses WHERE key = ?", (key,))
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, query, num_results, payload, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, normalize_query(q), num_results, json.dumps(organic), now, now)
+        )
+        evicted = conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (SERPER_CACHE_MAX_ENTRIES,)
+        ).rowcount
+        if evicted > 0:
+            _bump(conn, "evictions", evicted)
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ SERPER cache write failed: {e}")
+
+
+def known_empty_queries(queries, num_results=10):
+    """
+    The subset of queries SERPER recently answered with no results,
+    so scan loops can skip them without spending quota or latency.
+    """
+    if not SERPER_CACHE_ENABLED or not queries:
+        return set()
+
+    keys = {cache_key(q, num_results): q for q in queries}
+    try:
+        conn = _db()
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(
+            f"SELECT key FROM empty_responses WHERE created_at >= ? AND key IN ({placeholders})",
+            (time.time() - SERPER_EMPTY_TTL, *keys)
+        ).fetchall()
+        if rows:
+            _bump(conn, "skipped_empty", len(rows))
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ SERPER empty-result lookup failed: {e}")
+        return set()
+    return {keys[row["key"]] for row in rows}
+
+
+def _lease_owner():
+    return f"{os.getpid()}:{threading.get_ident()}"
+
+
+def acquire_inflight_lease(q, num_results=10):
+    """
+    Claim the right to fetch a query from SERPER on behalf of every worker.
+    Returns False if another worker already holds an unexpired lease for it.
+    """
+    if not SERPER_CACHE_ENABLED:
+        return True
+
+    now = time.time()
+    try:
+        conn = _db()
+        claimed = conn.execute(
+            "INSERT INTO inflight (key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE inflight.expires_at < ?",
+            (cache_key(q, num_results), _lease_owner(), now + SERPER_INFLIGHT_TTL, now)
+        ).rowcount
+        return claimed > 0
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ SERPER in-flight lease failed: {e}")
+        return True
+
+
+def release_inflight_lease(q, num_results=10):
+    if not SERPER_CACHE_ENABLED:
+        return
+    try:
+        _db().execute(
+            "DELETE FROM inflight WHERE key = ? AND owner = ?",
+            (cache_key(q, num_results), _lease_owner())
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ SERPER in-flight release failed: {e}")
+
+
+def wait_for_inflight_result(q, num_results=10, timeout=SERPER_INFLIGHT_TTL):
+    """
+    Wait for the worker holding the lease to publish its result to the cache.
+    Returns the cached results ([] if it came back empty), or None if the lease
+    went away without one (failed response) or the wait timed out.
+    """
+    key = cache_key(q, num_results)
+    give_up_at = time.time() + timeout
+    while time.time() < give_up_at:
+        time.sleep(SERPER_INFLIGHT_POLL)
+        try:
+            conn = _db()
+            now = time.time()
+            # Same freshness rules as get_cached_response: an expired entry is not the answer being waited for
+            row = conn.execute("SELECT payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row["created_at"] <= SERPER_CACHE_TTL:
+                _bump(conn, "coalesced")
+                return json.loads(row["payload"])
+            empty = conn.execute("SELECT created_at FROM empty_responses WHERE key = ?", (key,)).fetchone()
+            if empty is not None and now - empty["created_at"] <= SERPER_EMPTY_TTL:
+                _bump(conn, "coalesced")
+                return []
+            lease = conn.execute("SELECT expires_at FROM inflight WHERE key = ?", (key,)).fetchone()
+            if lease is None or lease["expires_at"] < now:
+                return None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"⚠️ SERPER in-flight wait failed: {e}")
+            return None
+    return None
+
+
+def get_cache_stats():
+    """Return hit/miss counters and current size of the shared SERPER cache"""
+    try:
+        conn = _db()
+        counters = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM stats")}
+        entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        empty_entries = conn.execute(
+            "SELECT COUNT(*) FROM empty_responses WHERE created_at >= ?", (time.time() - SERPER_EMPTY_TTL,)
+        ).fetchone()[0]
+    except sqlite3.Error as e:
+        return {"enabled": SERPER_CACHE_ENABLED, "error": str(e)}
+
+    hits = counters.get("hits", 0) + counters.get("empty_hits", 0)
+    misses = counters.get("misses", 0)
+    lookups = hits + misses
+    return {
+        "enabled": SERPER_CACHE_ENABLED,
+        "entries": entries,
+        "max_entries": SERPER_CACHE_MAX_ENTRIES,
+        "ttl_seconds": SERPER_CACHE_TTL,
+        "empty_entries": empty_entries,
+        "empty_ttl_seconds": SERPER_EMPTY_TTL,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "expirations": counters.get("expirations", 0),
+        "evictions": counters.get("evictions", 0),
+        "coalesced": counters.get("coalesced", 0),
+        "empty_hits": counters.get("empty_hits", 0),
+        "skipped_empty": counters.get("skipped_empty", 0)
+    }
+
+
+def clear_cache():
+    try:
+        conn = _db()
+        conn.execute("DELETE FROM responses")
+        conn.execute("DELETE FROM empty_responses")
+        conn.execute("DELETE FROM stats")
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ SERPER cache clear failed: {e}")
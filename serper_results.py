@@ -0,0 +1,57 @@
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+
+class SerperResult(NamedTuple):
+    """
+    One SERPER organic result, kept with its link so consumers never have to
+    regex URLs back out of snippet text. A NamedTuple is immutable and has no
+    per-instance __dict__, so large result batches stay compact.
+    """
+    link: str
+    domain: str
+    title: str
+    snippet: str
+    rank: int
+
+    @property
+    def text(self):
+        """Title and snippet together, for keyword and contact matching"""
+        return f"{self.title} {self.snippet}"
+
+
+def domain_of(url):
+    """Host of a URL without the www. prefix ('' if it has none)"""
+    host = urlsplit(url or "").hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def from_organic(item, rank=0):
+    """Build a SerperResult from one raw SERPER organic dict"""
+    link = item.get("link", "") or ""
+    return SerperResult(
+        link=link,
+        domain=domain_of(link),
+        title=item.get("title", "") or "",
+        snippet=item.get("snippet", "") or "",
+        rank=item.get("position") or rank,
+    )
+
+
+def to_records(organic):
+    """Convert a raw SERPER organic list into SerperResult records, in rank order"""
+    return [from_organic(item, rank=i + 1) for i, item in enumerate(organic or [])]
+
+
+def snippets(records):
+    """Snippet strings of a record list, for the text-only consumers"""
+    return [r.snippet for r in records or []]
+
+
+def to_rows(records):
+    """Plain lists for JSON storage; from_rows() restores the records"""
+    return [list(r) for r in records or []]
+
+
+def from_rows(rows):
+    return [SerperResult(*row) for row in rows or []]
@@ -1,3 +1,7 @@
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
 # ✅ DO NOT DELETE — Risk to star rating logic
 def get_star_rating(score):
     if score >= 90:
@@ -35,38 +39,28 @@ def update_star_rating(name, phone=None, risk_score=50, critic_flag=False, stylo
     calculated_stars = evaluation["stars"]
     reasoning = evaluation["reason"]
 
-    print(f"⭐ Enhanced Star Rating: {calculated_stars} stars (Risk: {final_score})")
-    print(f"📋 Rating Reason: {reasoning}")
+    logger.info(f"⭐ Enhanced Star Rating: {calculated_stars} stars (Risk: {final_score})")
+    logger.info(f"📋 Rating Reason: {reasoning}")
     
     if critic_flag:
-        print(f"🚨 Critic flag detected in evaluation")
+        logger.warning(f"🚨 Critic flag detected in evaluation")
     
     if stylometry_flags:
-        print(f"🧠 Stylometry flags factored into evaluation")
+        logger.info(f"🧠 Stylometry flags factored into evaluation")
 
     # Store rating in guest database if name provided
     if name and name != "Unknown":
         try:
-            import json
-            with open("guest_db.json", "r") as f:
-                guest_db = json.load(f)
-        except:
-            guest_db = {}
-
-        if name not in guest_db:
-            guest_db[name] = {}
-
-        guest_db[name]["star_rating"] = calculated_stars
-        guest_db[name]["final_risk_score"] = final_score
-        guest_db[name]["rating_reason"] = reasoning
-        guest_db[name]["last_rating_update"] = "2025-06-02"
-        guest_db[name]["evaluation_method"] = "enhanced_decision_engine"
-
-        try:
-            with open("guest_db.json", "w") as f:
-                json.dump(guest_db, f, indent=2)
-            print(f"💾 Structured star rating saved: {name} → {calculated_stars} stars")
+            from guest_storage import update_guest_db
+            with update_guest_db() as guest_db:
+                entry = guest_db.setdefault(name, {})
+                entry["star_rating"] = calculated_stars
+                entry["final_risk_score"] = final_score
+                entry["rating_reason"] = reasoning
+                entry["last_rating_update"] = "2025-06-02"
+                entry["evaluation_method"] = "enhanced_decision_engine"
+            logger.info(f"💾 Structured star rating saved: {name} → {calculated_stars} stars")
         except Exception as e:
-            print(f"⚠️ Failed to save star rating: {e}")
+            logger.warning(f"⚠️ Failed to save star rating: {e}")
 
     return calculated_stars
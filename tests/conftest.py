@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+# Every SQLite store (caches, checkpoints, job queue, stats) goes to a throwaway directory,
+# and scans never reach SERPER or the scrapers: tests patch the lowest network layer.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["CONTROLL_DB_DIR"] = tempfile.mkdtemp(prefix="controll-tests-")
+os.environ["SCAN_CHECKPOINT_ENABLED"] = "0"
+# The tests claim and run queued jobs themselves, standing in for an external worker
+os.environ["SCAN_EXTERNAL_WORKERS"] = "1"
+os.environ.pop("CONTROLL_TEST_MODE", None)
+os.environ.pop("CONTROLL_TRAFFIC_MODE", None)
+
+
+class FakeSerper:
+    """Stands in for _fetch_serper: answers from `pages`, a fn(query) -> organic result dicts"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, q, num_results, deadline):
+        with self._lock:
+            self.calls.append(q)
+        return self.pages(q)
+
+
+@pytest.fixture
+def fake_serper(monkeypatch):
+    """Patch SERPER with a fake; set .pages to change what it answers"""
+    import search_utils
+    fake = FakeSerper(lambda q: [])
+    monkeypatch.setattr(search_utils, "_fetch_serper", fake)
+    return fake
+
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    """
+    No outbound traffic: plain HTTP calls fail the test and every scrape backend returns
+    `offline.page`. Runs in a fresh directory, so guest_db.json and other files start empty.
+    """
+    import http_client
+    import query_broker
+    import scraper_client
+
+    def no_network(method, url, *args, **kwargs):
+        raise AssertionError(f"Test tried to reach the network: {method} {url}")
+
+    class Offline:
+        page = "<html></html>"
+
+    monkeypatch.setattr(http_client, "_send", no_network)
+    for name in list(scraper_client._backends):
+        monkeypatch.setitem(scraper_client._backends, name, lambda url, timeout, **options: (200, Offline.page, False))
+    # Each test starts with an empty broker memo
+    monkeypatch.setattr(query_broker, "_broker", None)
+    monkeypatch.chdir(tmp_path)
+    return Offline
+
+
+@pytest.fixture
+def job_queue():
+    """The scan job queue, emptied before the test"""
+    import scan_jobs
+    scan_jobs._db().execute("DELETE FROM jobs")
+    return scan_jobs
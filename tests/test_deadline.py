@@ -0,0 +1,28 @@
+import search_utils
+from deadline import scan_deadline, time_left, current_deadline
+
+
+def test_nested_deadline_never_extends_the_outer_one():
+    with scan_deadline(5) as outer:
+        with scan_deadline(60) as inner:
+            assert inner is outer
+            assert time_left(30) <= 5
+        with scan_deadline(1) as tighter:
+            assert tighter is not outer
+            assert current_deadline() is tighter
+        assert current_deadline() is outer
+    assert current_deadline() is None
+    assert time_left(30) == 30
+
+
+def test_direct_serper_query_is_sized_to_the_scan_deadline(monkeypatch):
+    seen = []
+
+    def fetch(q, num_results, deadline):
+        seen.append(deadline)
+        return []
+
+    monkeypatch.setattr(search_utils, "_fetch_serper", fetch)
+    with scan_deadline(3) as deadline:
+        search_utils.query_serper_records("deadline propagation direct query")
+    assert seen == [deadline]
@@ -0,0 +1,77 @@
+import json
+
+import search_utils
+
+
+def _profile_pages(user_ids):
+    def pages(q):
+        return [
+            {
+                "link": f"https://www.yelp.com/user_details?userid={user_id}",
+                "title": "Jane Doe - Yelp",
+                "snippet": f"Jane Doe wrote: the service was terrible and the staff rude ({q})"
+            }
+            for user_id in user_ids
+        ]
+    return pages
+
+
+def _scan(**kwargs):
+    return search_utils.run_incremental_guest_search(
+        "Jane Doe", email="jane@doe.org", phone="6175551234", deadline=30, **kwargs
+    )
+
+
+def test_full_guest_scan_returns_a_rating(fake_serper, offline):
+    fake_serper.pages = _profile_pages(["a1"])
+    guest = search_utils.run_full_guest_search("Jane Doe", email="jane@doe.org", deadline=30)
+
+    assert guest["star_rating"] in range(1, 6)
+    assert 0 <= guest["risk_score"] <= 100
+    assert guest["partial"] is False
+
+
+def test_incremental_scan_twice_reports_the_diff(fake_serper, offline, monkeypatch):
+    import query_broker
+
+    fake_serper.pages = _profile_pages(["a1", "b2"])
+    first = _scan()
+    assert first["evidence_diff"]["changed"]
+    assert "https://www.yelp.com/user_details?userid=a1" in first["evidence_diff"]["profiles"]["added"]
+    stored = json.load(open("guest_db.json"))["jane_doe"]
+    assert stored["evidence"]["queries"]
+    assert stored["star_rating"] == first["star_rating"]
+
+    # Fresh evidence is reused: nothing is queried again and nothing changed
+    calls = len(fake_serper.calls)
+    second = _scan()
+    assert len(fake_serper.calls) == calls
+    assert second["evidence_diff"]["changed"] is False
+    assert second["evidence_diff"]["previous_scan_at"] is not None
+    assert second["incremental"]["queries_refreshed"] == 0
+
+    # Stale evidence is re-queried and the profile that disappeared is reported
+    monkeypatch.setattr(query_broker, "_broker", None)
+    fake_serper.pages = _profile_pages(["a1", "c3"])
+    third = _scan(freshness=0)
+    diff = third["evidence_diff"]["profiles"]
+    assert "https://www.yelp.com/user_details?userid=c3" in diff["added"]
+    assert "https://www.yelp.com/user_details?userid=b2" in diff["removed"]
+    assert third["incremental"]["queries_refreshed"] > 0
+
+
+def test_each_phase_is_checked_once_near_the_deadline(fake_serper, offline, monkeypatch):
+    checked = []
+    phase_allowed = search_utils._phase_allowed
+
+    def counting(phase, skipped_phases):
+        checked.append(phase)
+        return phase_allowed(phase, skipped_phases)
+
+    monkeypatch.setattr(search_utils, "_phase_allowed", counting)
+    guest = search_utils.run_full_guest_search("Jane Doe", email="jane@doe.org", phone="6175551234", deadline=1)
+
+    assert guest["partial"] is True
+    assert "profile link extraction" in guest["skipped_phases"]
+    assert checked.count("profile link extraction") == 1
+    assert fake_serper.calls == []
@@ -0,0 +1,48 @@
+import threading
+
+from guest_evidence import save_guest_evidence, load_guest_evidence
+from guest_storage import load_guest_db, save_guest_from_review
+
+
+def test_concurrent_guest_db_writers_keep_every_entry(offline):
+    import search_utils
+
+    def write(i):
+        if i % 3 == 0:
+            save_guest_from_review(f"Review Guest {i}", {"risk_score": 10})
+        elif i % 3 == 1:
+            save_guest_evidence(f"Evidence Guest {i}", {"queries": {}})
+        else:
+            search_utils.store_profile_links_in_guest_db(f"links_guest_{i}", [f"https://reddit.com/user/g{i}"])
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(30)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    guest_db = load_guest_db()
+    assert len(guest_db) == 30
+    assert load_guest_evidence("Evidence Guest 1") == {"queries": {}}
+    assert guest_db["links_guest_2"]["profile_links"] == ["https://reddit.com/user/g2"]
+
+
+def _write_from_another_process(n):
+    from guest_storage import update_guest_db
+    for i in range(20):
+        with update_guest_db() as guest_db:
+            guest_db[f"process_{n}_guest_{i}"] = {"n": n}
+
+
+def test_writers_in_separate_processes_keep_every_entry(offline):
+    import multiprocessing
+
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_write_from_another_process, args=(n,)) for n in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(30)
+
+    assert [p.exitcode for p in processes] == [0, 0, 0, 0]
+    assert len(load_guest_db()) == 80
@@ -0,0 +1,55 @@
+import mri_scanner
+from query_scheduler import SharedQueryBudget
+
+
+def test_shared_budget_splits_evenly_and_passes_leftovers_on():
+    budget = SharedQueryBudget(20, scans=4)
+    first = budget.admit(["a1", "a2"])
+    rest = [budget.admit([f"{name}{i}" for i in range(16)]) for name in "bcd"]
+    assert first == ["a1", "a2"]
+    # The 3 queries the first scan left unused go to the scans after it
+    assert [len(r) for r in rest] == [6, 6, 6]
+    assert budget.used == 20
+
+
+def test_shared_budget_does_not_charge_a_query_twice():
+    budget = SharedQueryBudget(4, scans=2)
+    assert budget.admit(["q1", "q2"]) == ["q1", "q2"]
+    assert budget.admit(["q1", "q3", "q4"]) == ["q1", "q3", "q4"]
+    assert budget.deduplicated == 1
+
+
+def test_batch_budget_never_rates_a_starved_handle_clean(fake_serper):
+    targets = [{"handle": f"critic{n}", "location": "Boston"} for n in range(4)]
+    results, stats = mri_scanner.run_batch_mri_scan(targets, deadline=20, query_budget=20)
+
+    assert stats["queries_paid"] == 20
+    assert len(fake_serper.calls) > 0
+    for rated in results:
+        assert rated["partial"]
+        assert mri_scanner.MRI_BUDGET_SKIPPED in rated["skipped_phases"]
+        assert rated["star_rating"] is None
+    assert stats["unrated"] == 4
+
+
+def test_batch_with_enough_budget_rates_every_handle(fake_serper):
+    targets = [{"handle": f"reviewer{n}", "location": "Boston"} for n in range(2)]
+    results, stats = mri_scanner.run_batch_mri_scan(targets, deadline=20)
+
+    assert [r["partial"] for r in results] == [False, False]
+    assert [r["star_rating"] for r in results] == [5, 5]
+    assert stats["unrated"] == 0
+
+
+def test_forty_handle_batch_is_accepted_and_costs_less_than_separate_scans(fake_serper):
+    import web_main
+
+    handles = [f"crowd{n}" for n in range(40)]
+    response = web_main.app.test_client().post("/api/alias_tools/batch", json={"handles": handles, "deadline": 60})
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+
+    assert body.count("event: result") == 40
+    assert len(fake_serper.calls) < 40 * mri_scanner.MRI_QUERY_BUDGET
+    # Each handle got at least its share, so none is left unrated
+    assert '"unrated": 0' in body
@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from deadline import scan_deadline, DeadlineExceeded
+from guest_evidence import incremental_evidence
+from query_broker import QueryBroker
+from serper_cache import cache_key
+
+
+class SlowFetch:
+    """A broker fetch that blocks until `release` is set and counts its calls"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, query, num_results):
+        self.calls += 1
+        self.release.wait(5)
+        return self.answer
+
+
+def test_callers_keep_their_own_deadline_on_a_shared_query():
+    fetch = SlowFetch(["record"])
+    broker = QueryBroker(fetch, max_workers=1)
+
+    with scan_deadline(0.05):
+        hurried = broker.submit("shared deadline query")
+    patient = broker.submit("shared deadline query")
+
+    with pytest.raises(DeadlineExceeded):
+        hurried.result()
+    fetch.release.set()
+    # The first caller giving up neither cancels nor fails the job the second one waits on
+    assert patient.result(timeout=5) == ["record"]
+    assert fetch.calls == 1
+    assert hurried.cancelled()
+
+
+def test_results_are_recorded_for_each_caller_when_it_receives_them():
+    fetch = SlowFetch(["record"])
+    kept = []
+    broker = QueryBroker(fetch, keep=lambda q, n, records: kept.append((q, records)), max_workers=1)
+    fetch.release.set()
+
+    first = broker.submit("recorded query")
+    assert first.result(timeout=5) == ["record"]
+    second = broker.submit("recorded query")  # answered from the broker memo
+    assert second.result(timeout=5) == ["record"]
+
+    assert fetch.calls == 1
+    assert kept == [("recorded query", ["record"]), ("recorded query", ["record"])]
+
+
+def test_each_incremental_scan_sees_a_shared_result_in_its_own_evidence(fake_serper, offline):
+    import query_broker
+
+    fake_serper.pages = lambda q: [{"link": "https://www.reddit.com/user/shared_evidence", "title": "t", "snippet": "s"}]
+    key = cache_key("shared evidence query", 10)
+
+    evidences = []
+    for _ in range(2):
+        with incremental_evidence({}) as evidence:
+            records = query_broker.run_query("shared evidence query")
+        evidences.append(evidence)
+
+    assert [r.link for r in records] == ["https://www.reddit.com/user/shared_evidence"]
+    assert len(fake_serper.calls) == 1
+    assert all(key in e.queries for e in evidences)
+
+
+def test_fresh_evidence_answers_before_anything_is_queued():
+    fetch = SlowFetch(["from serper"])
+    broker = QueryBroker(fetch, recall=lambda q, n: ["from evidence"], max_workers=1)
+
+    assert broker.submit("recalled query").result() == ["from evidence"]
+    assert fetch.calls == 0
+    assert broker.stats()["recalled"] == 1
+
+
+def test_equivalent_queries_share_one_job():
+    fetch = SlowFetch(["record"])
+    broker = QueryBroker(fetch, max_workers=2)
+
+    futures = [broker.submit(q) for q in ("Shared  Job Query", "shared job query", "shared job query")]
+    fetch.release.set()
+
+    assert [f.result(timeout=5) for f in futures] == [["record"]] * 3
+    assert fetch.calls == 1
+    assert broker.stats()["deduplicated"] == 2
+
+
+def test_a_failed_query_fails_every_caller_and_is_not_memoized():
+    def fetch(query, num_results):
+        raise RuntimeError("SERPER down")
+
+    broker = QueryBroker(fetch, max_workers=1)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            broker.submit("failing query").result(timeout=5)
+    assert broker.stats()["failed"] == 2
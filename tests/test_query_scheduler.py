@@ -0,0 +1,73 @@
+import query_scheduler
+from query_scheduler import QueryBudget, StableRating, run_scheduled_queries
+from serper_results import to_records
+
+import search_utils
+
+AGGRESSIVE = "The food was absolutely disgusting and the waiter was rude. Worst service ever, do not recommend."
+TROLL = "Called my lawyer after this absolute nightmare, stay away from this ripoff restaurant and its menu."
+CALM = "We had a lovely dinner here last week. The pasta was fresh and the staff were friendly."
+
+
+def _answer(q):
+    return [{"link": f"https://example.org/{abs(hash(q))}", "title": q, "snippet": CALM}]
+
+
+def test_budget_is_charged_only_for_queries_sent(fake_serper):
+    fake_serper.pages = _answer
+    budget = QueryBudget(100)
+    executed = run_scheduled_queries([f"sched charge {n}" for n in range(7)], budget, batch_size=3, label="Test")
+
+    assert len(executed) == 7
+    assert budget.used == 7
+
+
+def test_budget_caps_queries(fake_serper):
+    fake_serper.pages = _answer
+    budget = QueryBudget(4)
+    executed = run_scheduled_queries([f"sched cap {n}" for n in range(9)], budget, batch_size=3, label="Test")
+
+    assert len(executed) == 4
+    assert budget.remaining == 0
+
+
+def test_stable_rating_stops_early(fake_serper):
+    fake_serper.pages = _answer
+    executed = run_scheduled_queries(
+        [f"sched stable {n}" for n in range(12)], QueryBudget(100), batch_size=3,
+        is_settled=StableRating(lambda executed: 5, patience=2), label="Test"
+    )
+    assert len(executed) == 6
+
+
+def test_changing_rating_keeps_the_scan_going(fake_serper):
+    fake_serper.pages = _answer
+    ratings = iter([5, 4, 3, 2])
+    executed = run_scheduled_queries(
+        [f"sched moving {n}" for n in range(12)], QueryBudget(100), batch_size=3,
+        is_settled=StableRating(lambda executed: next(ratings), patience=2), label="Test"
+    )
+    assert len(executed) == 12
+
+
+def test_writing_rating_reacts_to_the_samples():
+    calm = [("q", to_records([{"link": f"https://example.org/{n}", "snippet": CALM}])) for n in range(12)]
+    aggressive = [("q", to_records([{"link": f"https://example.org/{n}", "snippet": AGGRESSIVE}])) for n in range(12)]
+
+    hostile = aggressive + [("q", to_records([{"link": "https://example.org/troll", "snippet": TROLL}]))]
+
+    assert search_utils._writing_stars(calm) == 5
+    assert search_utils._writing_stars(hostile) < 5
+
+
+def test_writing_search_runs_on_while_new_writing_moves_the_rating(fake_serper):
+    # Each query turns up writing with a new kind of tone, so the rating keeps moving
+    tones = iter([CALM, CALM, CALM, AGGRESSIVE, TROLL, CALM] + [CALM] * 10)
+
+    def pages(q):
+        return [{"link": f"https://example.org/{abs(hash(q))}", "title": q, "snippet": next(tones)}]
+
+    fake_serper.pages = pages
+    budget = QueryBudget(100)
+    search_utils.find_writing_presence(name="Movingtone Reviewer", budget=budget)
+    assert budget.used > 2 * query_scheduler.SCHEDULER_BATCH_SIZE
@@ -0,0 +1,57 @@
+import time
+
+import mri_scanner
+import query_yield
+import search_utils
+from search_utils import SerperUnavailable
+
+
+def _site_attempts(site):
+    return query_yield.get_yield_stats()["site"].get(site, {}).get("attempts", 0)
+
+
+def _record_misses(site, n):
+    for i in range(n):
+        query_yield.record_query_yield(f'"someone {i}" site:{site}', [])
+
+
+def test_dead_platform_is_moved_last_by_default():
+    _record_misses("deadsite-default.test", 25)
+    platforms = ["site:deadsite-default.test", "site:fresh-default.test"]
+    assert query_yield.prune_platforms(platforms, explore_rate=0) == ["site:fresh-default.test", "site:deadsite-default.test"]
+
+
+def test_drop_mode_still_explores_dead_platforms():
+    _record_misses("deadsite-explore.test", 25)
+    platforms = ["site:deadsite-explore.test", "site:fresh-explore.test"]
+    assert query_yield.prune_platforms(platforms, mode="drop", explore_rate=0) == ["site:fresh-explore.test"]
+    assert query_yield.prune_platforms(platforms, mode="drop", explore_rate=1) == platforms
+
+
+def test_old_misses_fade(monkeypatch):
+    weeks_ago = time.time() - 4 * query_yield.QUERY_YIELD_HALF_LIFE
+    with monkeypatch.context() as m:
+        m.setattr(query_yield.time, "time", lambda: weeks_ago)
+        _record_misses("deadsite-faded.test", 25)
+
+    assert _site_attempts("deadsite-faded.test") < query_yield.QUERY_YIELD_MIN_ATTEMPTS
+    assert query_yield.prune_platforms(["site:deadsite-faded.test"], mode="drop", explore_rate=0) == ["site:deadsite-faded.test"]
+
+
+def test_failed_queries_are_not_counted_as_misses(fake_serper, offline, monkeypatch):
+    def unavailable(q):
+        raise SerperUnavailable("SERPER is down")
+
+    monkeypatch.setattr(search_utils, "generate_platform_queries", lambda *a: ['"failing handle" site:failing-yield.test'])
+    fake_serper.pages = unavailable
+    mri_scanner.enhanced_mri_scan("failing handle", location="Boston")
+
+    assert fake_serper.calls
+    assert _site_attempts("failing-yield.test") == 0
+
+
+def test_test_mode_answers_are_not_counted(monkeypatch):
+    monkeypatch.setenv("CONTROLL_TEST_MODE", "1")
+    search_utils.find_writing_presence(name="Testmode Person")
+    query_yield.record_query_yield('"x" site:testmode-yield.test', [])
+    assert _site_attempts("testmode-yield.test") == 0
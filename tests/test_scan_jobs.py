@@ -0,0 +1,98 @@
+import pytest
+
+import scan_jobs
+
+
+def _run_next_job(expected_id):
+    job = scan_jobs.claim_job("test-worker")
+    assert job is not None and job[0] == expected_id
+    scan_jobs._run_job(*job)
+    return scan_jobs.get_job(expected_id)
+
+
+def test_guest_scan_job_finishes_with_a_rating(fake_serper, offline, job_queue):
+    job_id = scan_jobs.enqueue_job("guest_scan", {"name": "Jane Doe", "email": "jane@doe.org", "deadline": 30})
+    job = _run_next_job(job_id)
+
+    assert job["status"] == "done", job["error"]
+    assert job["result"]["star_rating"] in range(1, 6)
+    assert job["timings"]["run_seconds"] is not None
+
+
+def test_guest_scan_endpoint_queues_a_job_that_completes(fake_serper, offline, job_queue):
+    import web_main
+
+    response = web_main.app.test_client().post(
+        "/api/guest_scan", json={"name": "Jane Doe", "incremental": True, "deadline": 30}
+    )
+    assert response.status_code == 202
+    job = _run_next_job(response.get_json()["job_id"])
+
+    assert job["status"] == "done", job["error"]
+    assert "evidence_diff" in job["result"]
+
+
+def test_unknown_job_kind_fails_cleanly(job_queue):
+    job_id = scan_jobs.enqueue_job("no_such_scan", {})
+    job = _run_next_job(job_id)
+    assert job["status"] == "failed"
+    assert "Unknown job kind" in job["error"]
+
+
+def test_claim_takes_the_oldest_queued_job_once(job_queue):
+    first = scan_jobs.enqueue_job("no_such_scan", {"n": 1})
+    second = scan_jobs.enqueue_job("no_such_scan", {"n": 2})
+
+    assert scan_jobs.claim_job("worker-a")[0] == first
+    assert scan_jobs.claim_job("worker-b")[0] == second
+    assert scan_jobs.claim_job("worker-c") is None
+    assert scan_jobs.get_job(first)["status"] == "running"
+
+
+def test_silent_job_is_requeued_then_failed_after_max_attempts(job_queue, monkeypatch):
+    job_id = scan_jobs.enqueue_job("no_such_scan", {})
+    clock = [1000.0]
+    monkeypatch.setattr(scan_jobs.time, "time", lambda: clock[0])
+
+    for attempt in range(scan_jobs.SCAN_JOB_MAX_ATTEMPTS):
+        assert scan_jobs.claim_job(f"worker-{attempt}")[0] == job_id
+        # The worker dies without another heartbeat
+        clock[0] += scan_jobs.SCAN_JOB_STALE_AFTER + 1
+
+    assert scan_jobs.claim_job("worker-last") is None
+    job = scan_jobs.get_job(job_id)
+    assert job["status"] == "failed"
+    assert "attempts exhausted" in job["error"]
+
+
+def test_job_deadline_reaches_every_query_it_submits(fake_serper, offline, job_queue, monkeypatch):
+    import query_broker
+    from deadline import current_deadline
+
+    seen = []
+
+    def recall(query, num_results):
+        seen.append(current_deadline())
+        return None
+
+    monkeypatch.setattr(query_broker, "_recall_for_scan", recall)
+    job_id = scan_jobs.enqueue_job("guest_scan", {"name": "Deadline Propagation", "deadline": 42.0})
+    job = _run_next_job(job_id)
+
+    assert job["status"] == "done", job["error"]
+    assert seen and all(d is not None and d.seconds <= 42.0 for d in seen)
+
+
+def test_web_process_refuses_a_queue_no_worker_reads(monkeypatch):
+    monkeypatch.setattr(scan_jobs, "SCAN_EMBEDDED_WORKERS", 0)
+    monkeypatch.setattr(scan_jobs, "SCAN_EXTERNAL_WORKERS", False)
+    with pytest.raises(RuntimeError, match="No scan workers"):
+        scan_jobs.check_job_workers()
+
+    monkeypatch.setattr(scan_jobs, "SCAN_EXTERNAL_WORKERS", True)
+    monkeypatch.delenv("CONTROLL_DB_DIR")
+    with pytest.raises(RuntimeError, match="CONTROLL_DB_DIR"):
+        scan_jobs.check_job_workers()
+
+    monkeypatch.setattr(scan_jobs, "SCAN_EMBEDDED_WORKERS", 2)
+    scan_jobs.check_job_workers()
@@ -0,0 +1,40 @@
+import logging
+import subprocess
+import sys
+
+from scan_logging import ScanLogger, get_scan_logger, scan_debug
+
+from conftest import ROOT
+
+
+def test_scan_loggers_stay_at_the_configured_level():
+    logger = get_scan_logger("search_utils")
+    assert isinstance(logger, ScanLogger)
+    assert logger.level == logging.INFO
+    assert not logger.isEnabledFor(logging.DEBUG)
+
+
+def test_debug_calls_build_no_record_unless_the_request_is_debugged(monkeypatch):
+    logger = get_scan_logger("tests.scan_logging")
+    made = []
+    make_record = logger.makeRecord
+    monkeypatch.setattr(logger, "makeRecord", lambda *a, **k: made.append(a[1]) or make_record(*a, **k))
+
+    logger.debug("hidden %s", "detail")
+    assert made == []
+
+    with scan_debug():
+        logger.debug("shown %s", "detail")
+    logger.debug("hidden again")
+    assert made == [logging.DEBUG]
+
+
+def test_importing_a_scan_module_leaves_logging_configuration_alone():
+    script = (
+        "import logging\n"
+        "handler = logging.StreamHandler()\n"
+        "logging.getLogger().addHandler(handler)\n"
+        "import search_utils, mri_scanner, scan_jobs\n"
+        "assert logging.getLogger().handlers == [handler], logging.getLogger().handlers\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
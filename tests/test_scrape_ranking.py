@@ -0,0 +1,20 @@
+from scrape_ranking import score_candidate, _handle_terms
+from serper_results import to_records
+
+
+def _score(link, title, snippet, handle="sethd"):
+    record = to_records([{"link": link, "title": title, "snippet": snippet}])[0]
+    return score_candidate(link, record, _handle_terms(handle), rates={})
+
+
+def test_handle_matching_profile_outranks_a_generic_people_search_page():
+    profile = _score("https://www.yelp.com/user_details?userid=abc", "sethd's Profile", "Reviews by sethd in Boston")
+    listing = _score("https://www.whitepages.com/name/Seth-D", "Seth D - Whitepages", "Find people named Seth D")
+    assert profile > listing
+
+
+def test_people_search_page_climbs_when_its_snippet_shows_contact_data():
+    generic = _score("https://www.spokeo.com/Seth-D", "Seth D", "Search records for Seth D")
+    with_phone = _score("https://www.spokeo.com/Seth-D/1", "Seth D", "Seth D, Boston MA (617) 555-0123")
+    other_page = _score("https://blog.example.com/post", "A post", "Nothing about anyone")
+    assert with_phone > generic > other_page
@@ -0,0 +1,47 @@
+import time
+
+import serper_cache
+from serper_cache import cache_key, store_response, wait_for_inflight_result
+
+
+def _lease_held_elsewhere(q, seconds=5):
+    serper_cache._db().execute(
+        "INSERT OR REPLACE INTO inflight (key, owner, expires_at) VALUES (?, 'another-worker', ?)",
+        (cache_key(q, 10), time.time() + seconds)
+    )
+
+
+def _age(table, q, seconds):
+    serper_cache._db().execute(
+        f"UPDATE {table} SET created_at = created_at - ? WHERE key = ?", (seconds, cache_key(q, 10))
+    )
+
+
+def test_waiter_ignores_an_expired_empty_answer(monkeypatch):
+    monkeypatch.setattr(serper_cache, "SERPER_INFLIGHT_POLL", 0.01)
+    q = "inflight expired empty"
+    store_response(q, 10, [])
+    _age("empty_responses", q, serper_cache.SERPER_EMPTY_TTL + 60)
+    _lease_held_elsewhere(q)
+
+    assert wait_for_inflight_result(q, 10, timeout=0.1) is None
+
+
+def test_waiter_returns_a_fresh_empty_answer(monkeypatch):
+    monkeypatch.setattr(serper_cache, "SERPER_INFLIGHT_POLL", 0.01)
+    q = "inflight fresh empty"
+    _lease_held_elsewhere(q)
+    store_response(q, 10, [])
+
+    assert wait_for_inflight_result(q, 10, timeout=1) == []
+
+
+def test_waiter_ignores_an_expired_response(monkeypatch):
+    monkeypatch.setattr(serper_cache, "SERPER_INFLIGHT_POLL", 0.01)
+    q = "inflight expired response"
+    store_response(q, 10, [{"link": "https://example.org/old"}])
+    _age("responses", q, serper_cache.SERPER_CACHE_TTL + 60)
+    _lease_held_elsewhere(q)
+
+    assert wait_for_inflight_result(q, 10, timeout=0.1) is None
+    assert serper_cache.get_cached_response(q, 10) is None
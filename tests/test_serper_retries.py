@@ -0,0 +1,58 @@
+import io
+
+import pytest
+import requests
+
+import http_client
+import rate_limiter
+import search_utils
+from deadline import Deadline
+
+
+@pytest.fixture
+def serper_status(monkeypatch):
+    """Every SERPER request gets the status set in ``sent.status``; ``sent`` records each one"""
+    sent = []
+
+    def send(method, url, timeout, **kwargs):
+        sent.append(url)
+        response = requests.Response()
+        response.status_code = send.status
+        response.raw = io.BytesIO(b'{"organic": []}')
+        return response
+
+    send.status = 200
+    monkeypatch.setattr(http_client, "_send", send)
+    monkeypatch.setattr(rate_limiter, "acquire", lambda upstream, max_wait=None: True)
+    monkeypatch.setattr(rate_limiter, "report", lambda upstream, status, retry_after=None: None)
+    monkeypatch.setattr(search_utils, "backoff_delay", lambda attempt: 0.0)
+    return send, sent
+
+
+def test_rate_limited_query_is_retried_only_by_http_client(serper_status):
+    send, sent = serper_status
+    send.status = 429
+    with pytest.raises(search_utils.SerperUnavailable):
+        search_utils._fetch_serper("retry layering 429", 10, Deadline(10))
+    assert len(sent) == http_client.HTTP_RATE_LIMIT_RETRIES + 1
+
+
+def test_server_errors_are_retried_with_backoff(serper_status):
+    send, sent = serper_status
+    send.status = 502
+    with pytest.raises(search_utils.SerperUnavailable):
+        search_utils._fetch_serper("retry layering 502", 10, Deadline(10))
+    assert len(sent) == search_utils.SERPER_MAX_RETRIES + 1
+
+
+def test_saturated_limiter_is_not_retried(monkeypatch):
+    attempts = []
+
+    def acquire(upstream, max_wait=None):
+        attempts.append(upstream)
+        return False
+
+    monkeypatch.setattr(rate_limiter, "acquire", acquire)
+    with pytest.raises(search_utils.SerperUnavailable):
+        search_utils._fetch_serper("retry layering saturated", 10, Deadline(10))
+    assert attempts == ["serper"]
@@ -0,0 +1,39 @@
+import io
+
+import requests
+
+import http_client
+import scraper_client
+import traffic_replay
+
+
+class _Session:
+    def __init__(self, body):
+        self.body = body
+
+    def request(self, method, url, timeout=None, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self.body)
+        response.url = url
+        return response
+
+
+def test_recorded_scrape_matches_the_capped_live_read(monkeypatch):
+    url = "https://example.com/very-long-page"
+    page = b"x" * 200_000
+    monkeypatch.setattr(http_client, "get_session", lambda: _Session(page))
+    monkeypatch.setattr(traffic_replay, "TRAFFIC_MODE", "record")
+
+    live = scraper_client._read_capped(http_client.request("GET", url, stream=True), limit=50_000)
+
+    monkeypatch.setattr(traffic_replay, "TRAFFIC_MODE", "replay")
+    monkeypatch.setattr(traffic_replay, "TRAFFIC_REPLAY_LATENCY", "0")
+    monkeypatch.setattr(traffic_replay, "TRAFFIC_REPLAY_ERROR_RATE", 0)
+    replayed = scraper_client._read_capped(http_client.request("GET", url, stream=True), limit=50_000)
+
+    assert live == (page[:50_000], True)
+    assert replayed == live
+    recorded = traffic_replay._db().execute("SELECT body FROM exchanges WHERE url = ?", (url,)).fetchone()
+    # Only what the capped reader consumed was kept, not the whole page
+    assert len(traffic_replay.zlib.decompress(recorded["body"])) < len(page)
@@ -0,0 +1,31 @@
+from search_utils import extract_profile_links_from_serper_results
+from serper_results import to_records
+from url_utils import classify_url
+
+
+def test_in_path_marks_profiles_only_on_linkedin():
+    assert classify_url("https://www.linkedin.com/in/jane-doe").is_profile
+    assert classify_url("https://www.linkedin.com/in/jane-doe").profile_id == "jane-doe"
+    # A locale prefix on any other site is not a profile
+    assert not classify_url("https://www.example.com/in/menu").is_profile
+    assert not classify_url("https://shop.example.org/en/in/stock").is_profile
+
+
+def test_profile_links_come_from_the_url_classifier():
+    records = to_records([
+        {"link": "https://www.yelp.com/user_details?userid=abc123", "title": "Jane D.", "snippet": "42 reviews"},
+        {"link": "https://www.example.com/in/menu", "title": "Menu", "snippet": ""},
+        {"link": "https://www.reddit.com/user/jane_d", "title": "u/jane_d", "snippet": ""},
+        {"link": "https://www.reddit.com/user/someone_else", "title": "u/someone_else", "snippet": ""},
+    ])
+    links = extract_profile_links_from_serper_results(records)
+    assert links == {
+        "Yelp": "https://www.yelp.com/user_details?userid=abc123",
+        "Reddit": "https://www.reddit.com/user/jane_d",
+    }
+
+    snippet = "See https://www.linkedin.com/in/jane-doe, and https://maps.google.com/contrib/123456."
+    assert extract_profile_links_from_serper_results([snippet]) == {
+        "LinkedIn": "https://www.linkedin.com/in/jane-doe",
+        "Google": "https://maps.google.com/contrib/123456",
+    }
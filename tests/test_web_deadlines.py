@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+import web_main
+
+
+@pytest.fixture
+def client():
+    return web_main.app.test_client()
+
+
+def _sse_events(response):
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        if block.startswith("event:"):
+            name = block.split("\n")[0].split(":", 1)[1].strip()
+            events.append((name, json.loads(block.split("data: ", 1)[1])))
+    return events
+
+
+@pytest.mark.parametrize("route, body", [
+    ("/api/alias_tools", {"handle": "sethd"}),
+    ("/api/alias_tools/stream", {"handle": "sethd"}),
+    ("/api/alias_tools/batch", {"handles": ["sethd"]}),
+    ("/api/guest_scan", {"name": "Jane Doe"}),
+])
+@pytest.mark.parametrize("deadline", ["soon", -5, 0, [10]])
+def test_malformed_deadline_is_rejected(client, job_queue, route, body, deadline):
+    response = client.post(route, json=dict(body, deadline=deadline))
+    assert response.status_code == 400
+    assert "deadline" in response.get_json()["error"]
+    assert job_queue.get_job_stats() == {}
+
+
+def test_alias_job_gets_a_float_deadline(client, job_queue):
+    response = client.post("/api/alias_tools", json={"handle": "sethd", "deadline": "10", "async": True})
+    assert response.status_code == 202
+    assert job_queue.get_job(response.get_json()["job_id"])["payload"]["deadline"] == 10.0
+
+
+def test_guest_job_gets_a_float_deadline(client, job_queue):
+    response = client.post("/api/guest_scan", json={"name": "Jane Doe", "deadline": "12.5", "incremental": True, "freshness": "60"})
+    payload = job_queue.get_job(response.get_json()["job_id"])["payload"]
+    assert (payload["deadline"], payload["freshness"]) == (12.5, 60.0)
+
+
+def test_json_alias_scan_answers_synchronously_with_the_deadline(client, monkeypatch, job_queue):
+    import mri_scanner
+    seen = {}
+
+    def scan(handle, deadline=None, **kwargs):
+        seen["deadline"] = deadline
+        return {"discovered_data": {}, "skipped_phases": [], "partial": False}
+
+    monkeypatch.setattr(mri_scanner, "run_enhanced_mri_scan", scan)
+    response = client.post("/api/alias_tools", json={"handle": "sethd", "deadline": "7"})
+    assert response.status_code == 200
+    assert response.get_json()["success"] is True
+    assert "results" in response.get_json()
+    assert seen["deadline"] == 7.0
+    assert job_queue.get_job_stats() == {}
+
+
+def test_batch_with_string_deadline_streams_results(client, fake_serper):
+    response = client.post("/api/alias_tools/batch", json={"handles": ["sethd", "frankjc"], "deadline": "10"})
+    names = [name for name, _ in _sse_events(response)]
+    assert "error" not in names
+    assert names.count("result") == 2
+    assert names[-1] == "batch_complete"
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import zlib
+import random
+import hashlib
+import sqlite3
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from local_db import get_connection
+from scan_logging import get_scan_logger
+
+logger = get_scan_logger(__name__)
+
+# Record/replay of outbound traffic for offline load testing.
+# CONTROLL_TRAFFIC_MODE=record captures every request sent through http_client (SERPER,
+# the Render scrapers, Yelp profile fetches) into a compressed SQLite corpus;
+# CONTROLL_TRAFFIC_MODE=replay serves those responses back without touching the network.
+TRAFFIC_MODE = os.environ.get("CONTROLL_TRAFFIC_MODE", "").lower()  # "", "record" or "replay"
+TRAFFIC_CORPUS_DB = os.environ.get("CONTROLL_TRAFFIC_CORPUS", "traffic_corpus.db")
+TRAFFIC_REPLAY_LATENCY = os.environ.get("TRAFFIC_REPLAY_LATENCY", "recorded")  # "recorded" or fixed seconds
+TRAFFIC_REPLAY_JITTER = float(os.environ.get("TRAFFIC_REPLAY_JITTER", 0.0))  # +/- fraction applied to latency
+TRAFFIC_REPLAY_ERROR_RATE = float(os.environ.get("TRAFFIC_REPLAY_ERROR_RATE", 0.0))  # share of calls that fail
+KEPT_HEADERS = ("content-type", "retry-after")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    elapsed REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+"""
+
+_initialized_pid = None
+
+
+class TrafficNotRecorded(requests.ConnectionError):
+    """Raised in replay mode for a request the corpus has no response for"""
+
+
+def _db():
+    global _initialized_pid
+    conn = get_connection(TRAFFIC_CORPUS_DB)
+    if _initialized_pid != os.getpid():
+        conn.executescript(_SCHEMA)
+        _initialized_pid = os.getpid()
+    return conn
+
+
+def exchange_key(method, url, request_kwargs):
+    """Stable identity of a request: method, URL, query params and body"""
+    json_body, data = request_kwargs.get("json"), request_kwargs.get("data")
+    params = request_kwargs.get("params") or {}
+    body = json.dumps(json_body, sort_keys=True) if json_body is not None else (data or "")
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    raw = json.dumps([method.upper(), url, sorted(params.items()), body])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def record(method, url, response, body=None, **kwargs):
+    """
+    Store one live response in the corpus (the last recording of a request wins).
+    body is what the caller read of it; by default the whole response content.
+    """
+    if body is None:
+        body = response.content or b""
+    headers = {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS}
+    try:
+        _db().execute(
+            "INSERT OR REPLACE INTO exchanges (key, method, url, status, headers, body, elapsed, recorded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                exchange_key(method, url, kwargs), method.upper(), url, response.status_code,
+                json.dumps(headers), zlib.compress(body),
+                response.elapsed.total_seconds(), time.time()
+            )
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Traffic recording failed for {url}: {e}")
+
+
+def record_streamed(method, url, response, **kwargs):
+    """
+    Record a streamed response once its reader closes it, with only the bytes it read: a
+    capped scrape is recorded, and so replayed, exactly as the live scrape saw the page.
+    """
+    chunks = []
+    iter_content, close = response.iter_content, response.close
+
+    def reading(*args, **iter_kwargs):
+        for chunk in iter_content(*args, **iter_kwargs):
+            chunks.append(chunk)
+            yield chunk
+
+    def closing():
+        if response.iter_content is reading:
+            response.iter_content = iter_content
+            record(method, url, response, body=b"".join(chunks), **kwargs)
+        close()
+
+    response.iter_content = reading
+    response.close = closing
+    return response
+
+
+def _latency(recorded):
+    if TRAFFIC_REPLAY_LATENCY == "recorded":
+        latency = recorded
+    else:
+        latency = float(TRAFFIC_REPLAY_LATENCY)
+    if TRAFFIC_REPLAY_JITTER:
+        latency *= 1 + random.uniform(-TRAFFIC_REPLAY_JITTER, TRAFFIC_REPLAY_JITTER)
+    return max(0.0, latency)
+
+
+def _synthetic_failure(method, url):
+    """An injected failure: either a timeout or a 503 from the upstream"""
+    if random.random() < 0.5:
+        raise requests.Timeout(f"Synthetic replay timeout for {method} {url}")
+    return _build_response(url, 503, {"Content-Type": "text/plain"}, b"Synthetic replay error", 0.0)
+
+
+def _build_response(url, status, headers, body, elapsed):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = url
+    response.encoding = "utf-8"
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+def replay(method, url, **kwargs):
+    """
+    Serve a recorded response after its (synthetic) latency.
+    TRAFFIC_REPLAY_ERROR_RATE of calls fail instead, to exercise retry and fallback paths.
+    """
+    key = exchange_key(method, url, kwargs)
+    try:
+        row = _db().execute("SELECT * FROM exchanges WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        raise TrafficNotRecorded(f"Traffic corpus unavailable: {e}")
+    if row is None:
+        raise TrafficNotRecorded(f"No recorded response for {method.upper()} {url}")
+
+    latency = _latency(row["elapsed"])
+    time.sleep(latency)
+    if TRAFFIC_REPLAY_ERROR_RATE and random.random() < TRAFFIC_REPLAY_ERROR_RATE:
+        return _synthetic_failure(method, url)
+
+    headers = json.loads(row["headers"])
+    return _build_response(url, row["status"], headers, zlib.decompress(row["body"]), latency)
+
+
+def get_corpus_stats():
+    """Number of recorded exchanges per host, for checking what a recording session captured"""
+    try:
+        rows = _db().execute("SELECT url, status FROM exchanges").fetchall()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    hosts = {}
+    for row in rows:
+        host = requests.utils.urlparse(row["url"]).netloc
+        hosts[host] = hosts.get(host, 0) + 1
+    return {"mode": TRAFFIC_MODE or "off", "exchanges": len(rows), "hosts": hosts}
@@ -0,0 +1,182 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from; they never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src",
+    "ref_url", "referrer", "si", "_ga", "_gl", "yclid"
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking(param):
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    The form used to decide whether two URLs are the same page: https, lower-case host
+    without www. or a default port, no fragment, no tracking parameters, remaining
+    parameters sorted, and no trailing slash. Returns '' for anything that is not a web URL.
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or "").rstrip(".")
+        port = parts.port
+    except ValueError:
+        return ""
+    if parts.scheme.lower() not in DEFAULT_PORTS or not host:
+        return ""
+
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS[parts.scheme.lower()]:
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/") or ""
+    params = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    return urlunsplit(("https", host, path, urlencode(params), ""))
+
+
+class ClueSet:
+    """
+    Ordered collection of URLs with set-speed membership. URLs that canonicalize to the
+    same page are kept once, as first seen, so duplicates never take a scrape slot.
+    """
+
+    def __init__(self, urls=()):
+        self._urls = {}  # canonical form -> URL as first seen, in insertion order
+        self.extend(urls)
+
+    def add(self, url):
+        """Add url unless an equivalent URL is present; True if it was new"""
+        key = canonicalize_url(url)
+        if not key or key in self._urls:
+            return False
+        self._urls[key] = url
+        return True
+
+    def extend(self, urls):
+        for url in urls or ():
+            self.add(url)
+
+    def __contains__(self, url):
+        return canonicalize_url(url) in self._urls
+
+    def __iter__(self):
+        return iter(list(self._urls.values()))
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __bool__(self):
+        return bool(self._urls)
+
+    def __repr__(self):
+        return f"ClueSet({list(self._urls.values())!r})"
+
+
+# Registered domain -> platform. Lookups walk a host's parent domains (maps.google.com,
+# google.com), so classifying a URL costs the same however many domains are listed.
+PLATFORM_DOMAINS = {
+    "yelp.com": "Yelp", "tripadvisor.com": "TripAdvisor", "google.com": "Google",
+    "reddit.com": "Reddit", "linkedin.com": "LinkedIn", "facebook.com": "Facebook",
+    "trustpilot.com": "Trustpilot", "instagram.com": "Instagram", "twitter.com": "Twitter",
+    "x.com": "Twitter", "opentable.com": "OpenTable", "foursquare.com": "Foursquare",
+    "zomato.com": "Zomato", "grubhub.com": "Grubhub", "seamless.com": "Seamless",
+    "doordash.com": "DoorDash", "medium.com": "Medium", "glassdoor.com": "Glassdoor",
+    "nextdoor.com": "Nextdoor",
+    "whitepages.com": "Whitepages", "fastpeoplesearch.com": "FastPeopleSearch", "spokeo.com": "Spokeo",
+    "radaris.com": "Radaris", "truepeoplesearch.com": "TruePeopleSearch",
+}
+PEOPLE_SEARCH_DOMAINS = {"whitepages.com", "fastpeoplesearch.com", "spokeo.com", "radaris.com", "truepeoplesearch.com"}
+# Sites worth an MRI scrape
+MRI_TARGET_DOMAINS = {
+    "yelp.com", "tripadvisor.com", "google.com", "reddit.com", "facebook.com", "instagram.com",
+    "linkedin.com", "twitter.com", "opentable.com", "trustpilot.com", "foursquare.com", "zomato.com",
+    "grubhub.com", "seamless.com", "doordash.com",
+} | PEOPLE_SEARCH_DOMAINS
+# Sites where every page is about one person
+PERSON_PAGE_DOMAINS = {"facebook.com", "instagram.com"} | PEOPLE_SEARCH_DOMAINS
+REVIEW_PLATFORMS = {"Yelp", "TripAdvisor", "Trustpilot", "Google"}
+
+# Path and URL markers of profile and contact pages, matched in one pass
+_PROFILE_PATH = re.compile(r"/(?:user|users|profile|member|members|contrib)/|user_details")
+# Profile markers too generic to trust on other sites (/in/ is also a locale prefix)
+_PLATFORM_PROFILE_PATHS = {
+    "LinkedIn": re.compile(r"/(?:in|pub)/"),
+}
+_CONTACT_WORDS = re.compile(r"phone|email|contact|address|details")
+_PROFILE_IDS = {
+    "Yelp": re.compile(r"user_details\?(?:.*&)?userid=([^&#]+)|/profile/([^/?#]+)"),
+    "TripAdvisor": re.compile(r"/(?:profile|members)/([^/?#]+)", re.IGNORECASE),
+    "Google": re.compile(r"/(?:maps/)?contrib/(\d+)"),
+    "Facebook": re.compile(r"profile\.php\?(?:.*&)?id=(\d+)|/people/([^/?#]+)"),
+    "Reddit": re.compile(r"/(?:user|u)/([^/?#]+)"),
+    "LinkedIn": re.compile(r"/(?:in|pub)/([^/?#]+)"),
+    "Instagram": re.compile(r"^/([^/?#]+)/?$"),
+    "Twitter": re.compile(r"^/([^/?#]+)/?$"),
+    "Medium": re.compile(r"/@([^/?#]+)"),
+    "Trustpilot": re.compile(r"/users/([^/?#]+)"),
+    "Glassdoor": re.compile(r"/member/([^/?#]+)"),
+    "Nextdoor": re.compile(r"/profile/([^/?#]+)"),
+}
+
+
+class UrlClass(NamedTuple):
+    domain: str  # registered domain from PLATFORM_DOMAINS, or the bare host
+    platform: str  # 'Unknown' for sites not in PLATFORM_DOMAINS
+    is_target: bool
+    is_profile: bool
+    is_people_search: bool
+    profile_id: Optional[str]
+
+
+def registered_domain(host):
+    """The PLATFORM_DOMAINS entry a host belongs to, or the host itself"""
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        candidate = ".".join(labels[i:])
+        if candidate in PLATFORM_DOMAINS:
+            return candidate
+    return host
+
+
+@lru_cache(maxsize=8192)
+def classify_url(url):
+    """Parse a URL once and say what it is: platform, MRI target, profile, people-search page, profile id"""
+    try:
+        parts = urlsplit((url or "").strip())
+        host = (parts.hostname or "").rstrip(".")
+    except ValueError:
+        return UrlClass("", "Unknown", False, False, False, None)
+    if host.startswith("www."):
+        host = host[4:]
+    domain = registered_domain(host) if host else ""
+    platform = PLATFORM_DOMAINS.get(domain, "Unknown")
+    lowered = (url or "").lower()
+    path_and_query = parts.path + (f"?{parts.query}" if parts.query else "")
+
+    profile_id = None
+    id_pattern = _PROFILE_IDS.get(platform)
+    if id_pattern:
+        match = id_pattern.search(path_and_query)
+        if match:
+            profile_id = next(g for g in match.groups() if g)
+
+    return UrlClass(
+        domain=domain,
+        platform=platform,
+        is_target=domain in MRI_TARGET_DOMAINS,
+        is_profile=bool(
+            domain in PERSON_PAGE_DOMAINS or _PROFILE_PATH.search(lowered) or _CONTACT_WORDS.search(lowered)
+            or (platform in _PLATFORM_PROFILE_PATHS and _PLATFORM_PROFILE_PATHS[platform].search(parts.path.lower()))
+        ),
+        is_people_search=domain in PEOPLE_SEARCH_DOMAINS,
+        profile_id=profile_id,
+    )
@@ -1,33 +1,55 @@
 
-from flask import Flask, render_template, request, jsonify
-import logging
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context, g
 import traceback
 import json
 import os
-import sys
+from scan_logging import setup_logging, get_scan_logger, set_scan_debug, reset_scan_debug, scan_debug_enabled
 
 app = Flask(__name__)
 
-# Enhanced logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.StreamHandler(sys.stderr)
-    ]
-)
-logger = logging.getLogger(__name__)
+# Leveled logging through a background queue, so request threads never block on stdout
+setup_logging()
+logger = get_scan_logger(__name__)
 
-sys.stdout.flush()
-sys.stderr.flush()
+# Queued scans run on threads in this process unless external workers share the queue;
+# with neither, startup fails instead of accepting jobs that would never run
+from scan_jobs import SCAN_EMBEDDED_WORKERS, check_job_workers, start_workers
+check_job_workers()
+if SCAN_EMBEDDED_WORKERS:
+    start_workers(SCAN_EMBEDDED_WORKERS, prefix="web-scan-worker")
+
+def _scan_debug_requested():
+    """?debug=1 or an X-Scan-Debug: 1 header logs this request's scans at DEBUG detail"""
+    flag = request.args.get('debug') or request.headers.get('X-Scan-Debug') or ''
+    return flag.lower() in ('1', 'true', 'yes')
+
+def _seconds_field(data, field):
+    """A positive number of seconds from the request body, None if absent; ValueError if malformed"""
+    value = data.get(field)
+    if value is None or value == '':
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{field}' must be a number of seconds")
+    if not 0 < seconds < float('inf'):
+        raise ValueError(f"'{field}' must be a positive number of seconds")
+    return seconds
 
 @app.before_request
 def log_request_info():
+    if _scan_debug_requested():
+        g.scan_debug_token = set_scan_debug(True)
     logger.info(f"Request: {request.method} {request.url}")
-    logger.info(f"Headers: {dict(request.headers)}")
+    logger.debug("Headers: %s", dict(request.headers))
     if request.is_json:
-        logger.info(f"JSON Data: {request.get_json(silent=True)}")
+        logger.debug("JSON Data: %s", request.get_json(silent=True))
+
+@app.teardown_request
+def reset_request_debug(_error=None):
+    token = g.pop('scan_debug_token', None)
+    if token is not None:
+        reset_scan_debug(token)
 
 @app.route('/', methods=['GET'])
 def index():
@@ -55,6 +77,31 @@ def status():
         'serper_api': 'Connected'
     })
 
+@app.route('/api/serper_cache/stats')
+def serper_cache_stats():
+    from serper_cache import get_cache_stats
+    return jsonify(get_cache_stats())
+
+@app.route('/api/query_broker')
+def query_broker_stats():
+    from query_broker import get_broker
+    return jsonify(get_broker().stats())
+
+@app.route('/api/query_yield')
+def query_yield_report():
+    from query_yield import get_yield_stats
+    return jsonify(get_yield_stats())
+
+@app.route('/api/scrape_yield')
+def scrape_yield_report():
+    from scrape_ranking import get_scrape_yield_stats
+    return jsonify(get_scrape_yield_stats())
+
+@app.route('/api/rate_limits')
+def rate_limit_state():
+    from rate_limiter import get_limiter_state
+    return jsonify(get_limiter_state())
+
 @app.route('/api/alias_tools', methods=['POST'])
 def handle_alias_investigation():
     try:
@@ -64,8 +111,10 @@ def handle_alias_investigation():
             location = data.get('location', '').strip()
             platform = data.get('platform', '').strip()
             review_text = data.get('review_text', '').strip()
+            queued = data.get('async') is True
             response_type = 'json'
         else:
+            data = request.form
             handle = request.form.get('handle', '').strip()
             location = request.form.get('location', '').strip()
             platform = request.form.get('platform', '').strip()
@@ -74,38 +123,23 @@ def handle_alias_investigation():
 
         if not handle:
             return jsonify({'error': 'Handle is required'}), 400
+        try:
+            deadline = _seconds_field(data, 'deadline')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-        logger.info(f"🔍 Starting enhanced MRI scan for: {handle}")
-
-        from mri_scanner import enhanced_mri_scan
-        mri_results = enhanced_mri_scan(handle, location=location)
-
-        discovered_emails = mri_results.get('discovered_data', {}).get('emails', [])
-        discovered_phones = mri_results.get('discovered_data', {}).get('phones', [])
-        discovered_profiles = mri_results.get('discovered_data', {}).get('profiles', [])
-
-        final_confidence = 30
-        risk_score = 20
-        star_rating = 5
-        rating_reason = "No significant risk indicators found"
-
-        if discovered_emails or discovered_phones:
-            final_confidence = 85
-            risk_score = 70
-            star_rating = 2
-            rating_reason = "Contact information discovered - potential reviewer tracking"
+        if response_type == 'json' and queued:
+            # Opt-in: runs on a scan worker; poll /api/jobs/<id> for progress and the rated results
+            from scan_jobs import enqueue_job
+            job_id = enqueue_job('alias_scan', {
+                'handle': handle, 'location': location, 'deadline': deadline, 'debug': scan_debug_enabled()
+            })
+            return jsonify({'success': True, 'job_id': job_id, 'status_url': f'/api/jobs/{job_id}'}), 202
 
-        if len(discovered_profiles) >= 2:
-            risk_score = 90
-            star_rating = 1
-            rating_reason = "Multiple review profiles found - high risk pattern"
+        logger.info(f"🔍 Starting enhanced MRI scan for: {handle}")
 
-        mri_results.update({
-            'risk_score': risk_score,
-            'star_rating': star_rating,
-            'rating_reason': rating_reason,
-            'confidence_score': final_confidence
-        })
+        from mri_scanner import run_enhanced_mri_scan, rate_mri_results
+        mri_results = rate_mri_results(run_enhanced_mri_scan(handle, location=location, deadline=deadline))
 
         if response_type == 'json':
             return jsonify({'success': True, 'results': mri_results})
@@ -120,6 +154,135 @@ def handle_alias_investigation():
         else:
             return render_template("alias_mri.html", results={'error': str(e)})
 
+@app.route('/api/guest_scan', methods=['POST'])
+def handle_guest_scan():
+    """
+    Queue a full guest scan (name, email and/or phone); poll /api/jobs/<id> for the result.
+    With "incremental" set, a known guest is re-scanned from its stored evidence and only
+    queries older than "freshness" seconds are repeated; the result includes a diff.
+    """
+    data = request.get_json(silent=True) if request.is_json else request.form
+    data = data or {}
+    guest = {field: (data.get(field) or '').strip() or None for field in ('name', 'email', 'phone')}
+    if not any(guest.values()):
+        return jsonify({'error': 'Name, email or phone is required'}), 400
+    if data.get('incremental') and not guest['name']:
+        return jsonify({'error': 'Incremental scans need the guest name'}), 400
+    try:
+        deadline = _seconds_field(data, 'deadline')
+        freshness = _seconds_field(data, 'freshness')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if deadline:
+        guest['deadline'] = deadline
+    if data.get('incremental'):
+        guest['incremental'] = True
+        if freshness:
+            guest['freshness'] = freshness
+
+    guest['debug'] = scan_debug_enabled()
+    from scan_jobs import enqueue_job
+    job_id = enqueue_job('guest_scan', guest)
+    return jsonify({'success': True, 'job_id': job_id, 'status_url': f'/api/jobs/{job_id}'}), 202
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    from scan_jobs import get_job
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs')
+def job_queue_stats():
+    from scan_jobs import get_job_stats
+    return jsonify(get_job_stats())
+
+@app.route('/api/logging')
+def logging_stats():
+    from scan_logging import get_logging_stats
+    return jsonify(get_logging_stats())
+
+SSE_HEARTBEAT_SECONDS = 10
+
+@app.route('/api/alias_tools/stream', methods=['GET', 'POST'])
+def stream_alias_investigation():
+    """
+    Server-sent events version of /api/alias_tools: each scan step is pushed as a typed
+    event (query_started, query_finished, profile_found, email_found, phone_found,
+    scrape_done, rating, complete) instead of returning everything at the end.
+    GET takes handle/location as query parameters so browsers can use EventSource.
+    """
+    data = request.get_json(silent=True) if request.is_json else request.values
+    data = data or {}
+    handle = (data.get('handle') or '').strip()
+    location = (data.get('location') or '').strip()
+
+    if not handle:
+        return jsonify({'error': 'Handle is required'}), 400
+    try:
+        deadline = _seconds_field(data, 'deadline')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    logger.info(f"📡 Streaming enhanced MRI scan for: {handle}")
+    from mri_scanner import stream_enhanced_mri_scan
+
+    return _sse_response(stream_enhanced_mri_scan(
+        handle, heartbeat=SSE_HEARTBEAT_SECONDS, location=location, deadline=deadline
+    ))
+
+def _sse_response(scan_events):
+    def events():
+        for event in scan_events:
+            if event['type'] == 'heartbeat':
+                # SSE comment line: keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/alias_tools/batch', methods=['POST'])
+def batch_alias_investigation():
+    """
+    MRI-scan many handles in one request. Takes {"handles": [handle or {"handle", "location"}],
+    "location": default location, "deadline": seconds}. The scans share queries, scraped pages
+    and one SERPER budget; each handle's rated results are streamed as a "result" event as
+    soon as it finishes, then "batch_complete" carries the batch stats.
+    """
+    data = request.get_json(silent=True) or {}
+    default_location = (data.get('location') or '').strip()
+    from mri_scanner import stream_batch_mri_scan, MRI_BATCH_MAX_HANDLES
+
+    targets = {}
+    for item in data.get('handles') or []:
+        if isinstance(item, dict):
+            handle = (item.get('handle') or '').strip()
+            location = (item.get('location') or default_location).strip()
+        else:
+            handle, location = str(item).strip(), default_location
+        if handle:
+            targets.setdefault((handle.lower(), location.lower()), {'handle': handle, 'location': location})
+
+    if not targets:
+        return jsonify({'error': 'At least one handle is required'}), 400
+    if len(targets) > MRI_BATCH_MAX_HANDLES:
+        return jsonify({'error': f'At most {MRI_BATCH_MAX_HANDLES} handles per batch'}), 400
+    try:
+        deadline = _seconds_field(data, 'deadline')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    logger.info(f"📦 Streaming batch MRI scan for {len(targets)} handles")
+    return _sse_response(stream_batch_mri_scan(
+        list(targets.values()), heartbeat=SSE_HEARTBEAT_SECONDS, deadline=deadline
+    ))
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404